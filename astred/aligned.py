@@ -1,19 +1,23 @@
 from __future__ import annotations
 
 import operator
-from copy import deepcopy
+import warnings
 from dataclasses import dataclass, field
 from itertools import combinations
-from typing import ClassVar, Dict, List, Optional, Set, Tuple, Union
+from typing import Callable, ClassVar, ContextManager, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from .aligner import Aligner
 from .enum import EditOperation, Side, SpanType
+from .matrix import AlignmentMatrix
 from .pairs import IdxPair
+from .profiling import Profiler, get_active_profiler, null_pair, null_stage
+from .record import MetricRecord
 from .sentence import Sentence
 from .span import NullSpan, Span, SpanPair
 from .tree import AstredConfig, Tree
-from .utils import cached_property, pair_combs, rebase_to_idxs, unique_list
-from .word import WordPair, spanpair_to_wordpairs
+from .utils import connected_components, count_inversions, pair_combs, prefix_sums, rebase_to_idxs, unique_list
+from .windows import SequenceWindows
+from .word import ConnectedGroup, WordPair, spanpair_to_wordpairs
 
 
 @dataclass(eq=False)
@@ -28,23 +32,62 @@ class AlignedSentences:
     word_aligns: Union[List[Union[IdxPair, Tuple[int, int]]], str] = field(default=None)
     aligner: Optional[Aligner] = field(default=None, repr=False)
     allow_mwg: bool = field(default=True)
-    make_copies: bool = field(default=False)
+    # Deprecated. By default, clones of the given sentences are aligned (see 'Sentence.clone'), so that the given
+    # sentences are not modified. make_copies=False still aligns the given sentences in place, so that code that reads
+    # the results from them keeps working. make_copies=True has no effect
+    make_copies: Optional[bool] = field(default=None, repr=False)
 
     aligned_words: List[WordPair] = field(default_factory=list, init=False, repr=False)
+    alignment_matrix: Optional[AlignmentMatrix] = field(default=None, init=False, repr=False, compare=False)
     word_cross: int = field(default=0, init=False)
 
+    # The attributes of the stages after word alignment can be computed lazily (see __getattr__), so they cannot have a
+    # class-level default: use default factories instead
     aligned_seq_spans: List[SpanPair] = field(default_factory=list, init=False, repr=False)
     seq_aligns: List[IdxPair] = field(default_factory=list, init=False, repr=False)
-    seq_cross: int = field(default=0, init=False)
+    seq_cross: int = field(default_factory=int, init=False)
 
     aligned_sacr_spans: List[SpanPair] = field(default_factory=list, init=False, repr=False)
     sacr_aligns: List[IdxPair] = field(default_factory=list, init=False, repr=False)
-    sacr_cross: int = field(default=0, init=False)
+    sacr_cross: int = field(default_factory=int, init=False)
 
     ted_config: AstredConfig = field(default=AstredConfig(), repr=False)
-    ted: int = field(default=0, init=False)
+    ted: int = field(default_factory=int, init=False)
     ted_ops: List[Tuple[Tree]] = field(default_factory=list, repr=False, init=False)
 
+    # Measures the time (and memory) that every stage takes. See astred.profiling
+    profiler: Optional[Profiler] = field(default=None, repr=False, compare=False)
+    # Metrics to compute on initialization (None for all of them, unless 'lazy' is True), see 'METRIC_STAGES'. Other
+    # metrics are computed when they are first accessed
+    metrics: Optional[Set[str]] = field(default=None, repr=False)
+    lazy: bool = field(default=False, repr=False)
+    _pending_stages: Set[str] = field(default_factory=set, init=False, repr=False)
+
+    # The stages of the computation, in the order in which they are run
+    STAGES: ClassVar[Tuple[str, ...]] = ("word_aligns", "seq_spans", "sacr_spans", "connected", "ted")
+    STAGE_DEPENDENCIES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "word_aligns": (),
+        "seq_spans": ("word_aligns",),
+        "sacr_spans": ("seq_spans",),
+        "connected": ("word_aligns",),
+        "ted": ("connected",),
+    }
+    # The attributes of this class that are set by every stage. Word alignments are always computed
+    STAGE_ATTRIBUTES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "seq_spans": ("aligned_seq_spans", "seq_aligns", "seq_cross"),
+        "sacr_spans": ("aligned_sacr_spans", "sacr_aligns", "sacr_cross"),
+        "connected": (),
+        "ted": ("ted", "ted_ops"),
+    }
+    # The stage that computes every metric. Stage names can be used as well
+    METRIC_STAGES: ClassVar[Dict[str, str]] = {
+        "word_cross": "word_aligns",
+        "seq_cross": "seq_spans",
+        "sacr_cross": "sacr_spans",
+        "connected": "connected",
+        "ted": "ted",
+    }
+
     # Keep a class variable for the aligner
     _aligner: ClassVar[Aligner] = field(default=None, repr=False)
 
@@ -64,53 +107,256 @@ class AlignedSentences:
         )
 
     def __post_init__(self):
-        if any(w.is_null for w in self.src.words + self.tgt.words):
-            raise ValueError(
-                "Your sentence(s) cannot contain NULL before passing it to an AlignedSentences"
-                " constructor because that means it has already been aligned and metrics have already"
-                " been calculate for all words involved."
-            )
-
-        # Copy input so that the given Sentence is not modified in place
         if self.make_copies:
-            self.src = deepcopy(self.src)
-            self.tgt = deepcopy(self.tgt)
-
-        self.init_word_aligns()
-        self.attach_self_to_sentences()
-        # NULL is added to the front of the sentences here
-        self.attach_sentences()
+            warnings.warn(
+                "'make_copies' is deprecated and has no effect: AlignedSentences aligns copies of the given"
+                " sentences by default, which are available as AlignedSentences.src and AlignedSentences.tgt",
+                DeprecationWarning,
+                stacklevel=3,
+            )
+        elif self.make_copies is not None:
+            warnings.warn(
+                "'make_copies=False' is deprecated: it modifies the given sentences by aligning them in place. Omit"
+                " 'make_copies' and read the results from AlignedSentences.src and AlignedSentences.tgt instead",
+                DeprecationWarning,
+                stacklevel=3,
+            )
 
-        self.aligned_words = [WordPair(self.src[align.src], self.tgt[align.tgt]) for align in self.word_aligns]
-        self.attach_pairs(self.aligned_words)
-        self.set_cross(self.aligned_words, "word_cross")
+        pair, stage = self.get_profiling()
+        with pair():
+            # Align clones of the given sentences, so that the given sentences are not modified and can be used in
+            # any number of pairs. Every pair copies all words and tree nodes; only the token data is shared
+            if self.make_copies is not False:
+                with stage("copy"):
+                    self.src = self.src.clone()
+                    self.tgt = self.tgt.clone()
+
+            if self.metrics is None:
+                stages = {"word_aligns"} if self.lazy else set(self.STAGES)
+            else:
+                stages = self.get_stages(self.metrics)
+
+            # Remove the attributes of the stages that are not computed yet, so that __getattr__ can compute them
+            self._pending_stages = set(self.STAGES) - stages
+            for stage_name in self._pending_stages:
+                for attr in self.STAGE_ATTRIBUTES[stage_name]:
+                    del self.__dict__[attr]
+
+            for stage_name in self.STAGES:
+                if stage_name in stages:
+                    with stage(stage_name):
+                        self._run_stage(stage_name)
+
+    def __getattr__(self, name: str):
+        # Only called when an attribute is not found in the regular way, which is the case for the attributes of
+        # stages that have not been computed yet
+        stage_name = next((stage for stage, attrs in self.STAGE_ATTRIBUTES.items() if name in attrs), None)
+        if stage_name is None or stage_name not in self.__dict__.get("_pending_stages", ()):
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+        self.compute(stage_name)
+        return getattr(self, name)
+
+    @classmethod
+    def get_stages(cls, metrics: Iterable[str]) -> Set[str]:
+        """Get the stages that are needed to compute metrics, including their dependencies.
+        :param metrics: names of metrics (see ``METRIC_STAGES``) or stages (see ``STAGES``)
+        :return: the names of the stages
+        """
+        stages = set()
+        todo = ["word_aligns"]
+        for metric in metrics:
+            if metric in cls.METRIC_STAGES:
+                todo.append(cls.METRIC_STAGES[metric])
+            elif metric in cls.STAGES:
+                todo.append(metric)
+            else:
+                raise ValueError(
+                    f"Unknown metric '{metric}'. Must be one of {', '.join(cls.METRIC_STAGES)} or a stage"
+                    f" ({', '.join(cls.STAGES)})"
+                )
+
+        while todo:
+            stage_name = todo.pop()
+            if stage_name not in stages:
+                stages.add(stage_name)
+                todo.extend(cls.STAGE_DEPENDENCIES[stage_name])
+
+        return stages
+
+    def compute(self, *metrics: str):
+        """Compute metrics (and the stages that they depend on) that were not computed on initialization. This happens
+        automatically when an attribute of this class is accessed, e.g. ``seq_cross``, but attributes of words and
+        sentences, such as ``Word.connected`` or ``Sentence.sacr_spans``, are only set after their stage has been
+        computed.
+        :param metrics: names of metrics (see ``METRIC_STAGES``) or stages (see ``STAGES``). If none are given, all
+        remaining stages are computed
+        """
+        stages = self.get_stages(metrics) if metrics else set(self.STAGES)
+        stages = [stage_name for stage_name in self.pending_stages if stage_name in stages]
+        if not stages:
+            return
+
+        pair, stage = self.get_profiling()
+        with pair(is_new=False):
+            for stage_name in stages:
+                self._pending_stages.discard(stage_name)
+                # Restore the default values of the attributes of this stage before computing it
+                for attr in self.STAGE_ATTRIBUTES[stage_name]:
+                    setattr(self, attr, self.__dataclass_fields__[attr].default_factory())
+                with stage(stage_name):
+                    self._run_stage(stage_name)
+
+    def get_profiling(self) -> Tuple[Callable[..., ContextManager[None]], Callable[[str], ContextManager[None]]]:
+        """Get the context managers that measure a pair and its stages: those of ``profiler`` or of the profiler that
+        is active when the stages run (see :func:`profiling.profile`), or ones that measure nothing.
+        :return: a tuple of (pair, stage) context managers, see :meth:`Profiler.pair` and :meth:`Profiler.stage`
+        """
+        profiler = self.profiler or get_active_profiler()
+        if profiler is None:
+            return null_pair, null_stage
 
-        # SEQUENCES
-        self.create_seq_spans()
-        self.attach_pairs(self.aligned_seq_spans)
-        self.set_cross(self.aligned_seq_spans, "seq_cross")
+        return profiler.pair, profiler.stage
 
-        if self.src.tree and self.tgt.tree:
-            # SACR
+    @property
+    def pending_stages(self) -> List[str]:
+        """The stages that have not been computed yet, in the order in which they would run."""
+        return [stage_name for stage_name in self.STAGES if stage_name in self._pending_stages]
+
+    def _run_stage(self, stage_name: str):
+        if stage_name == "word_aligns":
+            self.init_word_aligns()
+            self.attach_self_to_sentences()
+            # NULL is added to the front of the sentences here
+            self.attach_sentences()
+            self.align_words()
+        elif stage_name == "seq_spans":
+            self.create_seq_spans()
+            self.attach_pairs(self.aligned_seq_spans)
+            self.set_cross(self.aligned_seq_spans, "seq_cross")
+        elif not (self.src.tree and self.tgt.tree):
+            # SACr spans, connected words and TED can only be calculated when both sentences have a tree
+            return
+        elif stage_name == "sacr_spans":
             self.create_sacr_spans()
             self.attach_pairs(self.aligned_sacr_spans)
             self.set_cross(self.aligned_sacr_spans, "sacr_cross")
-
-            # TED
+        elif stage_name == "connected":
             self.set_connected()
+        elif stage_name == "ted":
             self.set_ted()
 
-    @cached_property
-    def giza_word_aligns(self):
-        return " ".join([f"{p.src-1}-{p.tgt-1}" for p in self.word_aligns if p.src and p.tgt])
+    def add_alignment(self, src: int, tgt: int):
+        """Align a source word with a target word and recompute the metrics of the whole pair, see
+        :meth:`set_alignments`.
+        :param src: the zero-based index of the source word
+        :param tgt: the zero-based index of the target word
+        """
+        aligns = self.get_alignments()
+        if (src, tgt) in aligns:
+            raise ValueError(f"Source word {src} and target word {tgt} are already aligned")
 
-    @property
-    def idxs_d(self) -> Dict[str, Set[int]]:
-        """Extracts the unique source and target word indices from the word alignments.
-        :return: a dictionary containg "src" and "tgt" keys with a set of integer values as keys
+        self.set_alignments(aligns + [(src, tgt)])
+
+    def remove_alignment(self, src: int, tgt: int):
+        """Remove the alignment between a source word and a target word and recompute the metrics of the whole pair,
+        see :meth:`set_alignments`.
+        :param src: the zero-based index of the source word
+        :param tgt: the zero-based index of the target word
         """
-        src, tgt = zip(*self.word_aligns)
-        return {"src": src, "tgt": tgt}
+        aligns = self.get_alignments()
+        if (src, tgt) not in aligns:
+            raise ValueError(f"Source word {src} and target word {tgt} are not aligned")
+
+        aligns.remove((src, tgt))
+        self.set_alignments(aligns)
+
+    def get_alignments(self) -> List[Tuple[int, int]]:
+        """Get the word alignments of this pair in the format in which they can be passed to this class.
+        :return: a list of zero-based (src, tgt) tuples, without NULL alignments
+        """
+        return [(pair.src - 1, pair.tgt - 1) for pair in self.word_aligns if pair.src and pair.tgt]
+
+    def set_alignments(self, word_aligns: Union[List[Union[IdxPair, Tuple[int, int]]], str]):
+        """Replace the word alignments of this pair and recompute the metrics that were computed before, e.g. after
+        correcting alignments. This is a convenience to edit a pair in place, not an incremental update: the
+        sentences, their trees and their NULL words are reused, but every stage that was computed before is
+        recomputed for the whole pair, not only for the words that an edit affects. The only stage that can be
+        skipped is TED, when the node representations that it compares (``ted_config.attr``) have not changed, which
+        makes an edit much cheaper than a new pair for TED on e.g. dependency labels. With the default
+        ``connected_repr``, almost every edit changes them, so an edit costs about as much as creating a new pair.
+        Metrics that were not computed yet (see ``lazy``) are still computed on access.
+        :param word_aligns: the new zero-based word alignments, as pairs or a string of src_idx-tgt_idx pairs. Unlike
+        on initialization, empty alignments are not aligned automatically but leave all words unaligned
+        """
+        if isinstance(word_aligns, str):
+            word_aligns = word_aligns.split()
+        word_aligns = self.parse_word_aligns(word_aligns)
+        for pair in word_aligns:
+            if not (0 <= pair.src < len(self.src) - 1 and 0 <= pair.tgt < len(self.tgt) - 1):
+                raise ValueError(f"Alignment {pair.src}-{pair.tgt} is out of range of the source or target sentence")
+
+        computed = [stage_name for stage_name in self.STAGES if stage_name not in self._pending_stages]
+        ted_reprs = self.get_ted_reprs() if "ted" in computed else None
+
+        pair, stage = self.get_profiling()
+        with pair(is_new=False):
+            with stage("word_aligns"):
+                self.reset_alignments()
+                self.word_aligns = word_aligns
+                self.complete_word_aligns()
+                self.align_words()
+
+            for stage_name in computed:
+                if stage_name == "ted":
+                    if self.get_ted_reprs() == ted_reprs:
+                        # The trees compare the same nodes as before, so their distance and operations are still valid
+                        continue
+                    self.ted = 0
+                    self.ted_ops = []
+                    for word in self.src.no_null_words + self.tgt.no_null_words:
+                        if word.tree:
+                            word.tree.astred_op = None
+                    with stage("ted"):
+                        self._run_stage("ted")
+                elif stage_name != "word_aligns":
+                    with stage(stage_name):
+                        self._run_stage(stage_name)
+
+    def reset_alignments(self):
+        """Remove everything that depends on the word alignments, except for TED, from this pair, its sentences and
+        their words. The NULL words of the sentences are kept."""
+        for sentence in (self.src, self.tgt):
+            sentence.seq_spans = []
+            sentence.sacr_spans = []
+            for word in sentence:
+                word.aligned = []
+                word.aligned_cross = {}
+                word.seq_group = word.id_in_seq_group = None
+                word.sacr_group = word.id_in_sacr_group = None
+                word.connected_group = None
+
+        self.aligned_words = []
+        self.word_cross = 0
+        for stage_name in ("seq_spans", "sacr_spans"):
+            if stage_name not in self._pending_stages:
+                for attr in self.STAGE_ATTRIBUTES[stage_name]:
+                    setattr(self, attr, self.__dataclass_fields__[attr].default_factory())
+
+    def get_ted_reprs(self) -> Tuple[List, List]:
+        """Get the representations of the source and target words that TED compares, see ``ted_config``.
+        :return: a tuple of the representations of the source words and those of the target words
+        """
+        attr = self.ted_config.attr
+        return (
+            [getattr(word, attr) for word in self.src.no_null_words],
+            [getattr(word, attr) for word in self.tgt.no_null_words],
+        )
+
+    @property
+    def giza_word_aligns(self):
+        # Not cached because the alignments can change, see set_alignments
+        return " ".join([f"{p.src-1}-{p.tgt-1}" for p in self.word_aligns if p.src and p.tgt])
 
     @property
     def no_null_sacr_pairs(self):
@@ -138,6 +384,23 @@ class AlignedSentences:
         assert num_changes == self.tgt.num_changes(attr)
         return num_changes
 
+    def to_record(self) -> MetricRecord:
+        """Collect the sentence-level metrics of this pair in a compact :class:`MetricRecord`, which (unlike the
+        object graph of this pair) is cheap to keep around for a whole corpus or to send to another process.
+        :return: the metrics of this pair
+        """
+        return MetricRecord(
+            word_cross=self.word_cross,
+            seq_cross=self.seq_cross,
+            sacr_cross=self.sacr_cross,
+            ted=self.ted,
+            dep_changes=self.num_changes("deprel"),
+            pos_changes=self.num_changes("upos"),
+            giza_word_aligns=self.giza_word_aligns,
+            seq_aligns=tuple(self.seq_aligns),
+            sacr_aligns=tuple(self.sacr_aligns),
+        )
+
     @staticmethod
     def attach_pairs(pairs: List[Union[SpanPair, WordPair]]):
         """Attach the "src" and "tgt" items in a list of pairs to each other, effectively adding them to
@@ -149,47 +412,34 @@ class AlignedSentences:
             pair.tgt.add_aligned(pair.src)
 
     @staticmethod
-    def check_mwg_and_external_align(pairs: List[WordPair], src_ids: Set[int], tgt_ids: Set[int]) -> Tuple[bool, bool]:
-        """For a given list of :class:`WordPair`, and a set of its ``src_ids`` and ``tgt_ids``, check whether this
-        group is a multi-word expression (MWG) and whether any of the involved words is aligned with words outside of
-        this group. A multi-word expression here is defined as a group of more than one source and target words, and
-        for which all words in the source group are aligned with all words in the target group, and vice-versa.
-        :param pairs: a list of :class:`WordPair`
-        :param src_ids: a set containing all the source indices (int) in ``pairs``
-        :param tgt_ids:a set containing all the target indices (int) in ``pairs``
-        :return: a tuple of booleans indicating: (i) whether this list of pairs is a MWG; (ii) whether any of
-        the involved words is aligned to words that are not part of any of the involved :class:`WordPair`s.
+    def parse_word_aligns(word_aligns: Union[List[Union[IdxPair, Tuple[int, int], str]], str]) -> List[IdxPair]:
+        """Convert word alignments into a list of :class:`IdxPair`.
+        :param word_aligns: a string of space-separated src_idx-tgt_idx pairs, a list of such pairs as strings or
+        tuples, or an array of shape (n_aligns, 2), e.g. from :func:`io.read_pharaoh`
+        :return: the alignments as a list of :class:`IdxPair`
         """
-        n_src = len(unique_list([p.src for p in pairs]))
-        n_tgt = len(unique_list([p.tgt for p in pairs]))
-
-        # MWG must consist of more than one source and target word
-        # Later we then check whether each word is aligned with all other words in the group
-        is_mwg = n_src > 1 and n_tgt > 1
-
-        has_external_align = False
-        for wordpair in pairs:
-            aligned_to_src = set([w.id for w in wordpair.src.aligned])
-            aligned_to_tgt = set([w.id for w in wordpair.tgt.aligned])
-
-            # Check whetther each source word is attached to all target words
-            # If it is set to False once, don't try to change it.
-            if is_mwg and (aligned_to_src != tgt_ids or aligned_to_tgt != src_ids):
-                is_mwg = False
-
-            # Check whether the aligned indices of all words are a subset of the actual idxs.
-            # If it is not a subset (and it contains more idxs than the actual idxs), then that
-            # means that that word is aligned with a word outside of this pair.
-            if not aligned_to_src.issubset(tgt_ids) or not aligned_to_tgt.issubset(src_ids):
-                has_external_align = True
-
-            # Break because these proeprties cannot change anymore.
-            if not is_mwg and has_external_align:
-                break
-
-        return is_mwg, has_external_align
+        if isinstance(word_aligns, str):
+            word_aligns = word_aligns.split(" ")
+        elif hasattr(word_aligns, "tolist"):
+            # Converting a whole NumPy array at once is much faster than iterating over its rows
+            word_aligns = word_aligns.tolist()
+
+        try:
+            return [
+                IdxPair(*map(int, align.split("-"))) if isinstance(align, str) else IdxPair(*align)
+                for align in word_aligns
+            ]
+        except ValueError as exc:
+            raise ValueError(
+                "The passed alignments could not be parsed successfully. Make sure that they are"
+                " written in the correct format as pairs of src_idx-tgt_idx"
+            ) from exc
 
     def init_word_aligns(self):
+        if hasattr(self.word_aligns, "tolist"):
+            # The truth value of a NumPy array is ambiguous, so convert it before checking whether it is empty
+            self.word_aligns = self.word_aligns.tolist()
+
         if not self.word_aligns:
             if not self.aligner:
                 cls = self.__class__
@@ -198,22 +448,28 @@ class AlignedSentences:
                 self.word_aligns = [IdxPair(*val) for val in cls._aligner.align_from_objs(self.src, self.tgt)]
             else:
                 self.word_aligns = [IdxPair(*val) for val in self.aligner.align_from_objs(self.src, self.tgt)]
-        elif isinstance(self.word_aligns, str):
-            try:
-                self.word_aligns = [IdxPair(*map(int, align.split("-"))) for align in self.word_aligns.split(" ")]
-            except ValueError as exc:
-                raise ValueError(
-                    "The passed alignments could not be parsed successfully. Make sure that they are"
-                    " written in the correct format as pairs of src_idx-tgt_idx"
-                ) from exc
-        elif not isinstance(self.word_aligns, IdxPair):
-            self.word_aligns = [IdxPair(*val) for val in self.word_aligns]
+        else:
+            self.word_aligns = self.parse_word_aligns(self.word_aligns)
 
+        self.complete_word_aligns()
+
+    def complete_word_aligns(self):
+        """Make the word alignments one-based (0 is reserved for NULL), align unaligned words with NULL and sort
+        them."""
         # +1 because 0-index is reserved for NULL
         self.word_aligns = [IdxPair(p.src + 1, p.tgt + 1) for p in self.word_aligns]
         self.add_null_aligns()
         self.word_aligns.sort(key=operator.attrgetter("src", "tgt"))
 
+    def align_words(self):
+        """Create the aligned word pairs and the alignment matrix from the word alignments, attach the words to each
+        other and count word crosses."""
+        # The word alignments are sorted, so positions in the matrix are positions in aligned_words
+        self.alignment_matrix = AlignmentMatrix(self.word_aligns, len(self.src), len(self.tgt))
+        self.aligned_words = [WordPair(self.src[align.src], self.tgt[align.tgt]) for align in self.word_aligns]
+        self.attach_pairs(self.aligned_words)
+        self.set_cross(self.aligned_words, "word_cross")
+
     @staticmethod
     def has_internal_cross(pairs: List):
         for pair1, pair2 in combinations(pairs, 2):
@@ -222,16 +478,15 @@ class AlignedSentences:
 
         return False
 
-    @staticmethod
-    def idxs_are_consecutive(idxs: List[int]):
-        return sorted(idxs) == list(range(min(idxs), max(idxs) + 1))
-
     def add_null_aligns(self):
         # Fill in 0 idx for words that are not aligned
-        # The second list comprehension will already take into account the added idxs of the first one
+        # The target indices are collected after adding the source NULL alignments, which already contain 0-0.
         # That ensures that the NULL words are not added twice.
-        self.word_aligns += [IdxPair(idx, 0) for idx in range(len(self.src) + 1) if idx not in self.idxs_d["src"]]
-        self.word_aligns += [IdxPair(0, idx) for idx in range(len(self.tgt) + 1) if idx not in self.idxs_d["tgt"]]
+        # Count the words without NULL, which has already been added to the sentences when alignments are replaced
+        src_idxs = {pair.src for pair in self.word_aligns}
+        self.word_aligns += [IdxPair(idx, 0) for idx in range(len(self.src.no_null_words) + 1) if idx not in src_idxs]
+        tgt_idxs = {pair.tgt for pair in self.word_aligns}
+        self.word_aligns += [IdxPair(0, idx) for idx in range(len(self.tgt.no_null_words) + 1) if idx not in tgt_idxs]
 
     def attach_sentences(self):
         # This setter adds NULL at the front of the sentence
@@ -249,8 +504,8 @@ class AlignedSentences:
         # - src and tgt idxs are consecutive and the group has no external alignments
         # - if there are internal crosses, only allow this group if it's MWG and MWG is allowed
         # - if no internal cross at this stage, it is a valid group
-        is_mwg, has_external_align = self.check_mwg_and_external_align(pairs, src_ids, tgt_ids)
-        idxs_consec = self.idxs_are_consecutive(src_ids) and self.idxs_are_consecutive(tgt_ids)
+        is_mwg, has_external_align = self.alignment_matrix.check_group(src_ids, tgt_ids)
+        idxs_consec = AlignmentMatrix.is_consecutive(src_ids) and AlignmentMatrix.is_consecutive(tgt_ids)
 
         is_valid = False
         if idxs_consec and not has_external_align:
@@ -266,7 +521,39 @@ class AlignedSentences:
 
         return is_valid, is_mwg
 
-    def create_sacr_spans(self):
+    @staticmethod
+    def is_valid_subtree_range(heads: List[int], n_missing_trees: List[int], first: int, last: int) -> bool:
+        """Check whether the words with ids ``first`` through ``last`` of a sentence form a valid subtree, without
+        building a :class:`Span` for them. This is the case when every word has a tree and when exactly one word has
+        a head outside of the group, i.e. when all other words are its descendants. This is equivalent to
+        :attr:`Span.is_valid_subtree`.
+        :param heads: the heads of all words in the sentence, indexed by word id
+        :param n_missing_trees: prefix sums of the number of words without a tree, indexed by word id
+        :param first: the first word id of the group
+        :param last: the last (inclusive) word id of the group
+        :return: whether the words form a valid subtree
+        """
+        if n_missing_trees[last + 1] != n_missing_trees[first]:
+            return False
+
+        n_external_heads = 0
+        for head in heads[first : last + 1]:
+            if not first <= head <= last:
+                n_external_heads += 1
+                if n_external_heads > 1:
+                    return False
+
+        return n_external_heads == 1
+
+    def create_sacr_spans(self, reference: bool = False):
+        """Find syntactically aware consecutive groups (SACr) and create the SACr spans from them. Sequence groups
+        that do not form a valid subtree are split into smaller groups. Candidate groups are checked on the word
+        level with :class:`SequenceWindows` and :meth:`is_valid_subtree_range`, and spans are only created for accepted
+        groups. With ``reference=True``, the original implementation is used, which creates temporary spans for
+        every candidate group.
+        :param reference: whether to use the (slow) reference implementation
+        """
+
         def is_valid_sacr_pair(pair):
             _is_valid = pair.src.is_valid_subtree and pair.tgt.is_valid_subtree or (self.allow_mwg and spanpair.is_mwg)
             _is_valid = _is_valid or (pair.src.is_null and pair.tgt.is_null)
@@ -277,13 +564,19 @@ class AlignedSentences:
         sacr_spans: List[Tuple[int, int, bool]] = []
         found: Dict[str, Set[int]] = {"src": set(), "tgt": set()}
 
-        def add_found(spair, s_ids, t_ids):
+        def add_found(s_words, t_words, s_ids, t_ids, is_mwg):
             found["src"].update(s_ids)
             found["tgt"].update(t_ids)
-            s_words, t_words = map(list, spair[:-1])  # Exclude mwg
-            src_word_groups.append(s_words)
-            tgt_word_groups.append(t_words)
-            sacr_spans.append((min(s_ids), min(t_ids), spair.is_mwg))
+            src_word_groups.append(list(s_words))
+            tgt_word_groups.append(list(t_words))
+            sacr_spans.append((min(s_ids), min(t_ids), is_mwg))
+
+        # Heads and the number of words without a tree, indexed by word id, to check subtrees without spans
+        src_heads, tgt_heads = [w.head for w in self.src], [w.head for w in self.tgt]
+        src_missing_trees, tgt_missing_trees = (
+            prefix_sums([not w.tree for w in self.src]),
+            prefix_sums([not w.tree for w in self.tgt]),
+        )
 
         # This should probably be written more DRY-y
         for spanpair in self.aligned_seq_spans:
@@ -301,8 +594,8 @@ class AlignedSentences:
                 continue
 
             if is_singles or is_valid_sacr_pair(spanpair):
-                add_found(spanpair, src_ids, tgt_ids)
-            else:
+                add_found(spanpair.src, spanpair.tgt, src_ids, tgt_ids, spanpair.is_mwg)
+            elif reference:
                 wpairs = spanpair_to_wordpairs(spanpair)
                 for pairs in pair_combs(wpairs, min_length=2):
                     src_ids, tgt_ids = map(set, zip(*[(p.src.id, p.tgt.id) for p in pairs]))
@@ -328,34 +621,88 @@ class AlignedSentences:
                     tmp_spanpair = SpanPair(tmp_src, tmp_tgt, is_mwg)
 
                     if tmp_is_singles or is_valid_sacr_pair(tmp_spanpair):
-                        add_found(tmp_spanpair, src_ids, tgt_ids)
+                        add_found(tmp_src, tmp_tgt, src_ids, tgt_ids, is_mwg)
+            else:
+                # A sequence group is never aligned with words outside of the group, so all alignments of its words
+                # are in the rows of its source words and windows can be checked relative to these rows only. Valid
+                # windows always contain consecutive word ids, so they can be checked on the id ranges of the source
+                # and target words
+                windows = SequenceWindows(
+                    self.alignment_matrix.pairs(*self.alignment_matrix.src_range(min(src_ids), max(src_ids))),
+                    allow_mwg=self.allow_mwg,
+                )
+
+                def is_valid_sacr_window(start, end, is_mwg):
+                    (src_first, src_last), (tgt_first, tgt_last) = windows.id_ranges(start, end)
+                    # Like the reference implementation, this relies on the MWG status of the whole sequence group
+                    return (
+                        (src_first == src_last and tgt_first == tgt_last)
+                        or (
+                            self.is_valid_subtree_range(src_heads, src_missing_trees, src_first, src_last)
+                            and self.is_valid_subtree_range(tgt_heads, tgt_missing_trees, tgt_first, tgt_last)
+                        )
+                        or (self.allow_mwg and spanpair.is_mwg)
+                    )
+
+                for start, end, is_mwg in windows.select(accept=is_valid_sacr_window):
+                    (src_first, src_last), (tgt_first, tgt_last) = windows.id_ranges(start, end)
+                    add_found(
+                        self.src[src_first : src_last + 1],
+                        self.tgt[tgt_first : tgt_last + 1],
+                        set(range(src_first, src_last + 1)),
+                        set(range(tgt_first, tgt_last + 1)),
+                        is_mwg,
+                    )
 
         self.create_spans(sacr_spans, src_word_groups, tgt_word_groups, found, span_type=SpanType.SACR)
 
-    def create_seq_spans(self):
+    def create_seq_spans(self, reference: bool = False):
+        """Find sequence groups in the word alignments and create the sequence spans from them. Windows of aligned
+        words are checked in constant time with :class:`SequenceWindows`. With ``reference=True``, the original
+        implementation is used, which builds and checks sets of indices for every window of aligned words.
+        :param reference: whether to use the (slow) reference implementation
+        """
         src_word_groups = []
         tgt_word_groups = []
         seq_spans = []
         found = {"src": set(), "tgt": set()}
 
-        # pair_combs never returns groups that contain any NULL item
-        for pairs in pair_combs(self.aligned_words, min_length=2):
-            src_ids, tgt_ids = map(set, zip(*[(p.src.id, p.tgt.id) for p in pairs]))
-
-            # If any of the src or tgt ids have already been found as a good match, continue
-            # because a word can only ever belong to one group
-            # single pairs should always be accepted
-            if not src_ids.isdisjoint(found["src"]) or not tgt_ids.isdisjoint(found["tgt"]):
-                continue
+        def add_found(src_words, tgt_words, src_ids, tgt_ids, is_mwg):
+            found["src"].update(src_ids)
+            found["tgt"].update(tgt_ids)
+            src_word_groups.append(src_words)
+            tgt_word_groups.append(tgt_words)
+            seq_spans.append((min(src_ids), min(tgt_ids), is_mwg))
+
+        if reference:
+            # pair_combs never returns groups that contain any NULL item
+            for pairs in pair_combs(self.aligned_words, min_length=2):
+                src_ids, tgt_ids = map(set, zip(*[(p.src.id, p.tgt.id) for p in pairs]))
+
+                # If any of the src or tgt ids have already been found as a good match, continue
+                # because a word can only ever belong to one group
+                # single pairs should always be accepted
+                if not src_ids.isdisjoint(found["src"]) or not tgt_ids.isdisjoint(found["tgt"]):
+                    continue
 
-            is_valid, is_mwg = self.is_valid_sequence(pairs, src_ids, tgt_ids)
-            if is_valid:
-                found["src"].update(src_ids)
-                found["tgt"].update(tgt_ids)
-                src_words, tgt_words = map(list, zip(*pairs))
-                src_word_groups.append(src_words)
-                tgt_word_groups.append(tgt_words)
-                seq_spans.append((min(src_ids), min(tgt_ids), is_mwg))
+                is_valid, is_mwg = self.is_valid_sequence(pairs, src_ids, tgt_ids)
+                if is_valid:
+                    src_words, tgt_words = map(list, zip(*pairs))
+                    add_found(src_words, tgt_words, src_ids, tgt_ids, is_mwg)
+        else:
+            # Valid windows never overlap with previously found groups, because they can only contain words that
+            # are not aligned with words outside of the window. Their words are the ranges of consecutive ids, so
+            # dense many-to-many groups do not need to be deduplicated
+            windows = SequenceWindows(self.alignment_matrix.pairs(), allow_mwg=self.allow_mwg)
+            for start, end, is_mwg in windows.select():
+                (src_first, src_last), (tgt_first, tgt_last) = windows.id_ranges(start, end)
+                add_found(
+                    list(self.src[src_first : src_last + 1]),
+                    list(self.tgt[tgt_first : tgt_last + 1]),
+                    range(src_first, src_last + 1),
+                    range(tgt_first, tgt_last + 1),
+                    is_mwg,
+                )
 
         self.create_spans(seq_spans, src_word_groups, tgt_word_groups, found, span_type=SpanType.SEQ)
 
@@ -424,74 +771,72 @@ class AlignedSentences:
         )
 
     def set_connected(self, attr="deprel"):
-        def get_all_connected(start):
-            done = set()
-
-            def recursive_connected(item):
-                item_repr = f"{item.doc.side}-{item.id}"
-                if item_repr in done:
-                    return []
-
-                done.add(item_repr)
-                connects = []
-                for i in item.aligned:
-                    i_connects = recursive_connected(i)
-                    if i_connects:
-                        connects.extend(i_connects)
-                return item.aligned + connects
-
-            return sorted(unique_list(recursive_connected(start)), key=operator.attrgetter("id"))
-
-        def get_connected_repr(group):
-            src_words = [_w for _w in group if _w.side == Side.SRC]
-            return "|".join(
+        """Find the groups of words that are connected with each other through word alignments, directly or
+        indirectly, and let all words of a group refer to one shared :class:`ConnectedGroup`. The groups are the
+        connected components of the alignment matrix, which are found with union-find over word indices. Words in a
+        group are sorted by id, with a source word before the target word with the same id.
+        :param attr: the attribute of the words that is used in the representation of the group
+        """
+        matrix = self.alignment_matrix
+        src_words, tgt_words = self.src.words, self.tgt.words
+        n_src, n_tgt = len(src_words), len(tgt_words)
+        # Source word i is item i and target word j is item n_src + j
+        roots = connected_components(n_src + n_tgt, zip(matrix.row_idx, [n_src + idx for idx in matrix.col_idx]))
+
+        groups: Dict[int, ConnectedGroup] = {}
+        for word_id in range(max(n_src, n_tgt)):
+            sides = ((src_words, matrix.row_ptr, word_id), (tgt_words, matrix.col_ptr, n_src + word_id))
+            for words, ptr, item in sides:
+                # Only words with at least one alignment belong to a group
+                if word_id < len(words) and ptr[word_id] != ptr[word_id + 1]:
+                    group = groups.setdefault(roots[item], ConnectedGroup())
+                    group.words.append(words[word_id])
+                    words[word_id].connected_group = group
+
+        for group in groups.values():
+            group.connected_repr = "|".join(
                 [
                     f"{src.id}.{getattr(src, attr)}:"
                     + ",".join([f"{tgt.id}.{getattr(tgt, attr)}" for tgt in src.aligned if not tgt.is_null])
-                    for src in src_words
-                    if not src.is_null
+                    for src in group.words
+                    if src.doc is self.src and not src.is_null
                 ]
             )
 
-        connected_set = set()
-        # For every source and target word, find all connected words
-        # To be as efficient as possible, we keep track of items that we already found.
-        # This makes sense, because an item can only be found once because _all_ connected items
-        # are taken into account.
-        for word in self.src.words + self.tgt.words:
-            word_repr = f"{word.doc.side}-{word.id}"
-            if word_repr in connected_set:
-                continue
-            connected_group = get_all_connected(word)
-            connected_repr = get_connected_repr(connected_group)
-            # Iterate over all the words that are connected to this word
-            for connected_word in connected_group:
-                c_repr = f"{connected_word.doc.side}-{connected_word.id}"
-                if c_repr in connected_set:
+    def set_cross(self, aligned, attr: str, reference: bool = False):
+        """Given a list of aligned pairs, set a specific cross specified by `attr`. Two pairs cross when the second
+        pair's target comes before the first pair's target. This is counted by means of inversion counting in
+        O(n log n). The original O(n^2) implementation that compares all combinations of pairs is still available
+        with ``reference=True``, e.g. to verify the results of the faster implementation.
+        :param aligned: list of :class:`WordPair`s or :class:`SpanPair`s
+        :param attr: the attribute to store the total number of crosses in, e.g. "word_cross"
+        :param reference: whether to use the (slow) reference implementation
+        """
+        if reference:
+            for pair1, pair2 in combinations(aligned, 2):
+                all_items = [pair1.src, pair1.tgt, pair2.src, pair2.tgt]
+                # NULL alignments cannot cause crosses
+                if any(item.is_null for item in all_items):
                     continue
 
-                connected_word.connected_repr = connected_repr
-                # Set c.connected to all connected words that we found EXCLUDING c itself
-                for w in connected_group:
-                    w_repr = f"{w.doc.side}-{w.id}"
-                    if c_repr != w_repr:
-                        connected_word.connected.append(w)
-                connected_set.add(c_repr)
-
-    def set_cross(self, aligned, attr: str):
-        # Given a set of aligned pairs, set a specific cross specified by `attr`
-        for pair1, pair2 in combinations(aligned, 2):
-            all_items = [pair1.src, pair1.tgt, pair2.src, pair2.tgt]
-            # NULL alignments cannot cause crosses
-            if any(item.is_null for item in all_items):
-                continue
+                if pair2.tgt.id < pair1.tgt.id:
+                    setattr(self, attr, getattr(self, attr) + 1)
+                    pair1.src.aligned_cross[pair1.tgt.id] += 1
+                    pair1.tgt.aligned_cross[pair1.src.id] += 1
+                    pair2.src.aligned_cross[pair2.tgt.id] += 1
+                    pair2.tgt.aligned_cross[pair2.src.id] += 1
+            return
 
-            if pair2.tgt.id < pair1.tgt.id:
-                setattr(self, attr, getattr(self, attr) + 1)
-                pair1.src.aligned_cross[pair1.tgt.id] += 1
-                pair1.tgt.aligned_cross[pair1.src.id] += 1
-                pair2.src.aligned_cross[pair2.tgt.id] += 1
-                pair2.tgt.aligned_cross[pair2.src.id] += 1
+        # NULL alignments cannot cause crosses
+        pairs = [pair for pair in aligned if not (pair.src.is_null or pair.tgt.is_null)]
+        total, per_pair = count_inversions([pair.tgt.id for pair in pairs])
+
+        for pair, n_cross in zip(pairs, per_pair):
+            if n_cross:
+                pair.src.aligned_cross[pair.tgt.id] += n_cross
+                pair.tgt.aligned_cross[pair.src.id] += n_cross
+
+        setattr(self, attr, getattr(self, attr) + total)
 
     def set_ted(self):
         # Also sets edit operation for a tree's node. This edit operation is the edit operation that is necessary
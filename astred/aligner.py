@@ -1,18 +1,22 @@
+from __future__ import annotations
+
 import itertools
 import operator
 from dataclasses import dataclass, field
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+from .cache import AlignmentCache
+
 
+if TYPE_CHECKING:
+    from .sentence import Sentence
 
-# no need to have these in utils as only the Aligner class uses them
-try:
-    import torch
-    from awesome_align.configuration_bert import BertConfig
-    from awesome_align.modeling import BertForMaskedLM
-    from awesome_align.tokenization_bert import BertTokenizer
 
-    awesome_align_available = True
-except (ImportError, AttributeError):
-    awesome_align_available = False
+# no need to have these in utils as only the Aligner class uses them. torch and awesome_align are only imported
+# when an Aligner is created, because importing them is slow
+awesome_align_available = find_spec("torch") is not None and find_spec("awesome_align") is not None
 
 
 @dataclass
@@ -21,11 +25,21 @@ class Aligner:
     extraction: str = field(default="softmax")
     no_cuda: bool = False
     softmax_threshold: float = field(default=0.001)
+    cache: Optional[Union[AlignmentCache, str, Path]] = field(default=None, repr=False)
 
     def __post_init__(self):
+        # A path can be given instead of an AlignmentCache
+        if self.cache is not None and not isinstance(self.cache, AlignmentCache):
+            self.cache = AlignmentCache(self.cache)
+
         if not awesome_align_available:
             raise ImportError("To use the automatic aligner, awesone_align and torch must be installed.")
 
+        import torch
+        from awesome_align.configuration_bert import BertConfig
+        from awesome_align.modeling import BertForMaskedLM
+        from awesome_align.tokenization_bert import BertTokenizer
+
         self.tokenizer = BertTokenizer.from_pretrained(self.model_name_or_path)
         self.config = BertConfig.from_pretrained(self.model_name_or_path)
         self.model = BertForMaskedLM.from_pretrained(
@@ -60,26 +74,140 @@ class Aligner:
         )
 
     def align(self, src_sentence, tgt_sentence):
-        ids_src, ids_tgt, bpe2word_map_src, bpe2word_map_tgt = self.preprocess(src_sentence, tgt_sentence)
-        # Make it work for batch of one
-        inputs = [ids_src.unsqueeze(0), ids_tgt.unsqueeze(0), (bpe2word_map_src,), (bpe2word_map_tgt,)]
-        word_aligns = self.model.get_aligned_word(
-            *inputs,
-            self.device,
-            0,
-            0,
-            align_layer=8,
-            extraction=self.extraction,
-            softmax_threshold=self.softmax_threshold,
-            test=True,
-        )
-        aligns = list(word_aligns[0])
-        aligns.sort(key=operator.itemgetter(0, 1))
+        return self.align_batch([src_sentence], [tgt_sentence])[0]
+
+    @staticmethod
+    def make_batches(
+        lengths: Sequence[int], batch_size: int = 32, max_tokens: Optional[int] = None
+    ) -> List[List[int]]:
+        """Group items into batches of similar length, so that little padding is needed. Items are sorted by length
+        (longest first) and a batch is closed when it contains ``batch_size`` items or when adding another item would
+        make the padded batch (number of items times the length of the longest item) larger than ``max_tokens``.
+        :param lengths: the length of every item
+        :param batch_size: the maximal number of items in a batch
+        :param max_tokens: the maximal number of (padded) tokens in a batch. An item that is longer than this is put
+        in a batch on its own
+        :return: a list of batches, which each contain the indices of their items
+        """
+        if batch_size < 1:
+            raise ValueError(f"'batch_size' must be a positive integer ({batch_size} given)")
+
+        order = sorted(range(len(lengths)), key=lambda idx: lengths[idx], reverse=True)
+        batches = []
+        batch = []
+        for idx in order:
+            # The first item in a batch is the longest, so it determines the padded length
+            if batch and (
+                len(batch) == batch_size
+                or (max_tokens is not None and (len(batch) + 1) * lengths[batch[0]] > max_tokens)
+            ):
+                batches.append(batch)
+                batch = []
+            batch.append(idx)
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def align_batch(
+        self,
+        src_sentences: Sequence[str],
+        tgt_sentences: Sequence[str],
+        batch_size: int = 32,
+        max_tokens: Optional[int] = None,
+    ) -> List[List[Tuple[int, int]]]:
+        """Align multiple sentence pairs. Pairs are sorted by their number of subword tokens and padded per batch, so
+        that the model is run once per batch rather than once per sentence pair. If this aligner has a ``cache``,
+        only pairs that are not in the cache are aligned, and their alignments are added to the cache.
+        :param src_sentences: source sentences, which are split on whitespace
+        :param tgt_sentences: target sentences, which are split on whitespace
+        :param batch_size: the maximal number of sentence pairs in a batch
+        :param max_tokens: the maximal number of padded subword tokens in a batch, i.e. the number of pairs times the
+        length of the longest source or target sentence in that batch
+        :return: for every sentence pair, in the order of the input, a sorted list of (src, tgt) word alignments
+        """
+        if len(src_sentences) != len(tgt_sentences):
+            raise ValueError(
+                f"The number of source ({len(src_sentences)}) and target ({len(tgt_sentences)}) sentences must be"
+                f" the same"
+            )
+
+        if self.cache is None:
+            return self._align_batch(src_sentences, tgt_sentences, batch_size=batch_size, max_tokens=max_tokens)
+
+        keys = [
+            AlignmentCache.make_aligns_key(src, tgt, self.model_name_or_path, self.extraction, self.softmax_threshold)
+            for src, tgt in zip(src_sentences, tgt_sentences)
+        ]
+        aligns = self.cache.get_aligns(keys)
+        missing = [idx for idx, pair_aligns in enumerate(aligns) if pair_aligns is None]
+
+        if missing:
+            missing_aligns = self._align_batch(
+                [src_sentences[idx] for idx in missing],
+                [tgt_sentences[idx] for idx in missing],
+                batch_size=batch_size,
+                max_tokens=max_tokens,
+            )
+            for idx, pair_aligns in zip(missing, missing_aligns):
+                aligns[idx] = pair_aligns
+            self.cache.set_aligns((keys[idx], aligns[idx]) for idx in missing)
+
+        return aligns
+
+    def _align_batch(
+        self,
+        src_sentences: Sequence[str],
+        tgt_sentences: Sequence[str],
+        batch_size: int = 32,
+        max_tokens: Optional[int] = None,
+    ) -> List[List[Tuple[int, int]]]:
+        import torch
+        from torch.nn.utils.rnn import pad_sequence
+
+        examples = [self.preprocess(src, tgt) for src, tgt in zip(src_sentences, tgt_sentences)]
+        lengths = [max(len(ids_src), len(ids_tgt)) for ids_src, ids_tgt, _, _ in examples]
+
+        aligns = [None] * len(examples)
+        for batch in self.make_batches(lengths, batch_size=batch_size, max_tokens=max_tokens):
+            ids_src, ids_tgt, bpe2word_map_src, bpe2word_map_tgt = zip(*[examples[idx] for idx in batch])
+            ids_src = pad_sequence(ids_src, batch_first=True, padding_value=self.tokenizer.pad_token_id)
+            ids_tgt = pad_sequence(ids_tgt, batch_first=True, padding_value=self.tokenizer.pad_token_id)
+
+            with torch.no_grad():
+                word_aligns = self.model.get_aligned_word(
+                    ids_src,
+                    ids_tgt,
+                    bpe2word_map_src,
+                    bpe2word_map_tgt,
+                    self.device,
+                    0,
+                    0,
+                    align_layer=8,
+                    extraction=self.extraction,
+                    softmax_threshold=self.softmax_threshold,
+                    test=True,
+                )
+
+            for idx, pair_aligns in zip(batch, word_aligns):
+                aligns[idx] = sorted(pair_aligns, key=operator.itemgetter(0, 1))
 
         return aligns
 
     def align_from_objs(self, src_sentence, tgt_sentence):
-        src_sentence = " ".join([w.text for w in src_sentence.no_null_words])
-        tgt_sentence = " ".join([w.text for w in tgt_sentence.no_null_words])
+        return self.align_batch_from_objs([src_sentence], [tgt_sentence])[0]
+
+    def align_batch_from_objs(
+        self, src_sentences: Sequence[Sentence], tgt_sentences: Sequence[Sentence], **kwargs
+    ) -> List[List[Tuple[int, int]]]:
+        """Align multiple pairs of :class:`Sentence` objects. See :meth:`align_batch`.
+        :param src_sentences: source sentences
+        :param tgt_sentences: target sentences
+        :param kwargs: keyword arguments that are passed to :meth:`align_batch`, e.g. ``batch_size``
+        :return: for every sentence pair, in the order of the input, a sorted list of (src, tgt) word alignments
+        """
+        src_texts = [" ".join([w.text for w in sentence.no_null_words]) for sentence in src_sentences]
+        tgt_texts = [" ".join([w.text for w in sentence.no_null_words]) for sentence in tgt_sentences]
 
-        return self.align(src_sentence, tgt_sentence)
+        return self.align_batch(src_texts, tgt_texts, **kwargs)
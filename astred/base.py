@@ -6,6 +6,7 @@ from statistics import mean
 from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
 
 from .enum import Direction, Side
+from .utils import add_slots
 
 
 if TYPE_CHECKING:
@@ -13,13 +14,13 @@ if TYPE_CHECKING:
     from .word import Word
 
 
+@add_slots
 @dataclass(eq=False)
 class Crossable:
     id: int
     doc: Sentence = field(default=None, repr=False)
 
     aligned: List[Crossable] = field(default_factory=list, init=False, repr=False)
-    aligned_directions: Dict[int, Direction] = field(default_factory=dict, init=False, repr=False)
     aligned_cross: Dict[int, int] = field(default_factory=dict, init=False, repr=False)
 
     is_null: bool = field(default=False)
@@ -40,6 +41,22 @@ class Crossable:
     def side(self) -> Side:
         return self.doc.side if self.doc else None
 
+    @property
+    def aligned_directions(self) -> Dict[int, Direction]:
+        # Derived from the aligned items rather than stored, to save a dictionary per item
+        if self.is_null:
+            return {}
+
+        return {
+            item.id: Direction.NEUTRAL
+            if item.id == self.id
+            else Direction.FORWARD
+            if item.id > self.id
+            else Direction.BACKWARD
+            for item in self.aligned
+            if not item.is_null
+        }
+
     @property
     def avg_cross(self) -> float:
         return mean(self.aligned_cross.values()) if self.aligned_cross else None
@@ -56,13 +73,6 @@ class Crossable:
         self.aligned.append(item)
 
         if not (item.is_null or self.is_null):
-            self.aligned_directions[item.id] = (
-                Direction.NEUTRAL
-                if item.id == self.id
-                else Direction.FORWARD
-                if item.id > self.id
-                else Direction.BACKWARD
-            )
             self.aligned_cross[item.id] = 0
 
     def get_direction_to_item(self, item) -> Direction:
@@ -71,6 +81,8 @@ class Crossable:
 
 
 class SpanMixin(ABC):
+    __slots__ = ()
+
     @property
     def text(self) -> str:
         return " ".join([w.text for w in self.no_null_words])
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .aligned import AlignedSentences
+from .record import MetricRecord
+from .sentence import pack_sentence, unpack_sentence
+
+
+def _split_pair(pair: Sequence) -> Tuple[Any, Any, Any]:
+    if len(pair) == 2:
+        return pair[0], pair[1], None
+    elif len(pair) == 3:
+        return pair[0], pair[1], pair[2]
+    else:
+        raise ValueError(
+            f"Every item in 'pairs' must be a tuple of (src, tgt) or (src, tgt, word_aligns) ({len(pair)} items given)"
+        )
+
+
+def _align_packed_chunk(chunk: List[Tuple], kwargs: Dict[str, Any]) -> List[MetricRecord]:
+    return [
+        AlignedSentences(unpack_sentence(src), unpack_sentence(tgt), word_aligns, **kwargs).to_record()
+        for src, tgt, word_aligns in chunk
+    ]
+
+
+def _iter_chunks(pairs: Iterable[Sequence], chunksize: int) -> Iterator[List[Tuple]]:
+    pairs = iter(pairs)
+    while True:
+        chunk = [_split_pair(pair) for pair in islice(pairs, chunksize)]
+        if not chunk:
+            return
+        yield [(pack_sentence(src), pack_sentence(tgt), word_aligns) for src, tgt, word_aligns in chunk]
+
+
+def align_corpus(
+    pairs: Iterable[Sequence],
+    jobs: Optional[int] = 1,
+    chunksize: int = 64,
+    max_pending: Optional[int] = None,
+    **kwargs,
+) -> Iterator[MetricRecord]:
+    """Calculate the metrics of :class:`AlignedSentences` for a whole corpus, optionally spread over multiple worker
+    processes. Results are yielded lazily and in the same order as the given ``pairs``. Rather than the full object
+    graph of an :class:`AlignedSentences`, a compact :class:`MetricRecord` is returned for every pair so that sending
+    results between processes stays cheap.
+
+    If a pair does not contain word alignments, every worker process will load its own automatic :class:`Aligner`
+    and align pairs one by one. For large corpora, it is faster to align them in batches beforehand with
+    :meth:`Aligner.align_batch_from_objs`.
+    :param pairs: an iterable of tuples (src, tgt) or (src, tgt, word_aligns), where src and tgt are
+    :class:`Sentence` objects and word_aligns is in any of the formats that :class:`AlignedSentences` accepts
+    :param jobs: number of worker processes to use. 1 processes all pairs in the current process, None uses all
+    available CPUs
+    :param chunksize: number of pairs that are sent to a worker process at once
+    :param max_pending: maximal number of chunks that are submitted but not yet consumed. This bounds memory usage
+    when the consumer is slower than the workers. Defaults to twice the number of jobs
+    :param kwargs: keyword arguments that are passed to every :class:`AlignedSentences`, e.g. ``allow_mwg``
+    :return: a generator of :class:`MetricRecord`, one per pair
+    """
+    if chunksize < 1:
+        raise ValueError(f"'chunksize' must be a positive integer ({chunksize} given)")
+
+    jobs = os.cpu_count() if jobs is None else jobs
+    if jobs < 1:
+        raise ValueError(f"'jobs' must be a positive integer or None ({jobs} given)")
+
+    if jobs == 1:
+        for pair in pairs:
+            src, tgt, word_aligns = _split_pair(pair)
+            yield AlignedSentences(src, tgt, word_aligns, **kwargs).to_record()
+        return
+
+    max_pending = 2 * jobs if max_pending is None else max_pending
+    if max_pending < 1:
+        raise ValueError(f"'max_pending' must be a positive integer ({max_pending} given)")
+
+    with Pool(jobs) as pool:
+        pending = deque()
+        for chunk in _iter_chunks(pairs, chunksize):
+            pending.append(pool.apply_async(_align_packed_chunk, (chunk, kwargs)))
+
+            # Only submit new work when the oldest chunk has been consumed so that memory usage remains bounded
+            if len(pending) >= max_pending:
+                yield from pending.popleft().get()
+
+        while pending:
+            yield from pending.popleft().get()
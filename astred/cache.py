@@ -0,0 +1,243 @@
+"""Persistent on-disk caches, backed by SQLite. Entries are evicted in least-recently-used order when a cache grows
+larger than its maximal number of entries, and every cache keeps track of its hits and misses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .sentence import Sentence, pack_sentence, unpack_sentence
+
+
+@dataclass
+class SqliteCache:
+    """Key-value store in a SQLite database, with a size cap and least-recently-used eviction. Keys are hashes of
+    the (JSON-serializable) parts that identify an entry, values are strings. This class is not meant to be used
+    directly, but to be subclassed by caches for specific types of values.
+
+    Multiple processes or connections can share a cache file: the number of entries and the logical clock that orders
+    entries by their last use are always read from the database, within the (locking) write transaction that uses them.
+    """
+
+    path: Union[str, Path] = field(default=":memory:")
+    max_entries: Optional[int] = field(default=100_000)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+
+    _conn: sqlite3.Connection = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_entries is not None and self.max_entries < 1:
+            raise ValueError(f"'max_entries' must be a positive integer or None ({self.max_entries} given)")
+
+        self._conn = sqlite3.connect(str(self.path))
+        if str(self.path) != ":memory:":
+            # Write-ahead logging makes the frequent, small writes of the cache a lot cheaper
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, last_used INTEGER)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")
+        self._conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM cache WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Create a key from JSON-serializable parts that identify an entry.
+        :param parts: the parts that identify an entry
+        :return: a hexadecimal SHA-256 hash of the parts
+        """
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _begin_write(self) -> int:
+        """Start a write transaction, which locks the database for other writers until it is committed, and read the
+        logical clock that keeps track of the order in which entries were last used.
+        :return: the current value of the clock, i.e. the last time that any entry was used
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM cache").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Retrieve the value of an entry and mark the entry as recently used.
+        :param key: the key of the entry
+        :return: the value of the entry, or None if it is not in the cache
+        """
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Retrieve the values of multiple entries and mark these entries as recently used.
+        :param keys: the keys of the entries
+        :return: a list with the value of every entry, or None for entries that are not in the cache
+        """
+        values = []
+        for key in keys:
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            values.append(None if row is None else row[0])
+
+        hit_keys = [key for key, value in zip(keys, values) if value is not None]
+        self.hits += len(hit_keys)
+        self.misses += len(keys) - len(hit_keys)
+        if hit_keys:
+            clock = self._begin_write()
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE cache SET last_used = ? WHERE key = ?",
+                    [(clock + idx, key) for idx, key in enumerate(hit_keys, 1)],
+                )
+
+        return values
+
+    def set(self, key: str, value: str):
+        """Add an entry (or overwrite an existing one) and evict the least recently used entries if the cache is
+        full.
+        :param key: the key of the entry
+        :param value: the value of the entry
+        """
+        self.set_many([(key, value)])
+
+    def set_many(self, items: Iterable[Tuple[str, str]]):
+        """Add multiple entries (or overwrite existing ones) and evict the least recently used entries if the cache
+        is full.
+        :param items: (key, value) tuples
+        """
+        clock = self._begin_write()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, last_used) VALUES (?, ?, ?)",
+                [(key, value, clock + idx) for idx, (key, value) in enumerate(items, 1)],
+            )
+
+            if self.max_entries is not None:
+                # Other connections may have added entries as well, so count them within this transaction
+                n_evict = len(self) - self.max_entries
+                if n_evict > 0:
+                    self._conn.execute(
+                        "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY last_used LIMIT ?)", (n_evict,)
+                    )
+                    self.evictions += n_evict
+
+    def clear(self):
+        """Remove all entries from the cache and reset its statistics."""
+        self._conn.execute("DELETE FROM cache")
+        self._conn.commit()
+        self.hits = self.misses = self.evictions = 0
+
+    def close(self):
+        """Close the connection to the database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Statistics of this cache: the number of hits, misses and evictions, the hit rate, and the number of
+        entries that are currently in the cache."""
+        n_lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / n_lookups if n_lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self),
+        }
+
+
+@dataclass
+class AlignmentCache(SqliteCache):
+    """Cache for automatic word alignments. Entries are identified by the tokenized source and target text, and by
+    the settings of the :class:`Aligner` that influence the alignments: the model, ``extraction`` and
+    ``softmax_threshold``. Alignments are stored in the Pharaoh format ("0-0 1-2 ...").
+    """
+
+    @classmethod
+    def make_aligns_key(
+        cls, src_text: str, tgt_text: str, model_name_or_path: str, extraction: str, softmax_threshold: float
+    ) -> str:
+        """Create the key of a sentence pair for a given aligner configuration.
+        :param src_text: the source text, which is split on whitespace
+        :param tgt_text: the target text, which is split on whitespace
+        :param model_name_or_path: the model that is used for alignment
+        :param extraction: the extraction method that is used for alignment
+        :param softmax_threshold: the softmax threshold that is used for alignment
+        :return: the key of this sentence pair
+        """
+        return cls.make_key(src_text.split(), tgt_text.split(), model_name_or_path, extraction, softmax_threshold)
+
+    def get_aligns(self, keys: List[str]) -> List[Optional[List[Tuple[int, int]]]]:
+        """Retrieve the word alignments of multiple sentence pairs.
+        :param keys: the keys of the sentence pairs, see :meth:`make_aligns_key`
+        :return: a list with the sorted (src, tgt) alignments of every pair, or None for pairs that are not cached
+        """
+        return [
+            None if value is None else [tuple(map(int, pair.split("-"))) for pair in value.split()]
+            for value in self.get_many(keys)
+        ]
+
+    def set_aligns(self, items: Iterable[Tuple[str, List[Tuple[int, int]]]]):
+        """Store the word alignments of multiple sentence pairs.
+        :param items: (key, alignments) tuples, where the alignments are (src, tgt) tuples
+        """
+        self.set_many((key, " ".join(f"{src}-{tgt}" for src, tgt in aligns)) for key, aligns in items)
+
+
+@dataclass
+class ParseCache(SqliteCache):
+    """Cache for parsed sentences, so that texts that have been parsed before can be turned into a
+    :class:`Sentence` without loading the parser. Entries are identified by the text and by the settings that
+    influence the parse: the parser type, the model, ``include_subtypes``, ``is_tokenized`` and the other arguments
+    that the parser is loaded with. Only the token attributes in ``TOKEN_FIELDS`` are stored, as compact JSON arrays.
+    """
+
+    @classmethod
+    def make_parse_key(
+        cls,
+        text: str,
+        parser: Optional[str],
+        model_or_lang: str,
+        include_subtypes: bool = False,
+        is_tokenized: bool = True,
+        **kwargs,
+    ) -> str:
+        """Create the key of a text for a given parser configuration.
+        :param text: the text to parse
+        :param parser: the type of parser, "stanza" or "spacy"
+        :param model_or_lang: the model name or language of the parser
+        :param include_subtypes: whether subtypes of dependency labels are included
+        :param is_tokenized: whether the text is pretokenized
+        :param kwargs: other keyword arguments that the parser is loaded with. Values are represented by their repr
+        :return: the key of this text
+        """
+        kwargs_key = sorted((name, repr(value)) for name, value in kwargs.items())
+        return cls.make_key(text, parser, model_or_lang, include_subtypes, is_tokenized, kwargs_key)
+
+    def get_sentences(self, keys: List[str]) -> List[Optional[Sentence]]:
+        """Retrieve the parses of multiple texts. Every call returns new :class:`Sentence` objects.
+        :param keys: the keys of the texts, see :meth:`make_parse_key`
+        :return: a list with a sentence for every text, or None for texts that are not cached
+        """
+        return [None if value is None else unpack_sentence(json.loads(value)) for value in self.get_many(keys)]
+
+    def set_sentences(self, items: Iterable[Tuple[str, Sentence]]):
+        """Store the parses of multiple texts.
+        :param items: (key, sentence) tuples
+        """
+        self.set_many(
+            (key, json.dumps(pack_sentence(sentence), ensure_ascii=False, separators=(",", ":")))
+            for key, sentence in items
+        )
@@ -0,0 +1,408 @@
+"""Readers that stream objects from (optionally gzipped) files, and writers that store results in batches, so that
+corpora of any size can be processed in constant memory.
+"""
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .record import MetricRecord
+from .sentence import Sentence
+from .utils import _is_installed
+from .word import Word
+
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# The first bytes of every gzip file
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def open_text(path: Union[str, Path], encoding: str = "utf-8") -> IO[str]:
+    """Open a text file for reading, decompressing it on the fly if it is gzipped. Compression is detected by the
+    contents of the file, not by its extension.
+    :param path: the file to open
+    :param encoding: the encoding of the (decompressed) file
+    :return: a text stream
+    """
+    with open(path, "rb") as fhin:
+        is_gzip = fhin.read(2) == GZIP_MAGIC
+
+    if is_gzip:
+        return gzip.open(path, "rt", encoding=encoding)
+    else:
+        return open(path, encoding=encoding)
+
+
+def read_conllu(path: Union[str, Path], include_subtypes: bool = False, encoding: str = "utf-8") -> Iterator[Sentence]:
+    """Read the sentences in a CoNLL-U file one by one. Only the basic dependency tree is used: multiword-token lines
+    (IDs like "1-2") are skipped because their syntactic words follow on separate lines, and empty nodes (IDs like
+    "8.1") are skipped because they are only part of the enhanced dependency graph. Comment lines are ignored. Fields
+    are read as-is, so an unspecified value is "_".
+
+    Every sentence is a full :class:`Sentence` whose dependency tree is built eagerly, in a single bottom-up pass.
+    Words are created without per-word validation, because their IDs are already checked here.
+    :param path: the CoNLL-U file, optionally gzipped
+    :param include_subtypes: whether to include subtypes of dependency labels, e.g. "nmod:poss" instead of "nmod"
+    :param encoding: the encoding of the (decompressed) file
+    :return: a generator that yields a Sentence for every sentence in the file
+    """
+    with open_text(path, encoding=encoding) as fhin:
+        words: List[Word] = []
+        for line_no, line in enumerate(fhin, 1):
+            line = line.rstrip("\r\n")
+            if not line:
+                if words:
+                    yield Sentence(words)
+                    words = []
+                continue
+            elif line[0] == "#":
+                continue
+
+            cols = line.split("\t")
+            if len(cols) != 10:
+                raise ValueError(f"{path}, line {line_no}: expected 10 tab-separated columns ({len(cols)} given)")
+
+            if not cols[0].isdigit():
+                # Multiword-token range or empty node
+                continue
+
+            word_id = int(cols[0])
+            if not word_id:
+                raise ValueError(f"{path}, line {line_no}: word IDs must be positive integers (0 given)")
+
+            try:
+                head = int(cols[6])
+            except ValueError:
+                raise ValueError(f"{path}, line {line_no}: head must be an integer ({cols[6]} given)") from None
+
+            # The ID is known to be positive, so the word does not need to be validated
+            deprel = cols[7] if include_subtypes else cols[7].partition(":")[0]
+            words.append(Word._from_valid_fields(word_id, cols[1], cols[2], head, deprel, cols[3], cols[4], cols[5]))
+
+        # The last sentence of a file is not necessarily followed by a blank line
+        if words:
+            yield Sentence(words)
+
+
+def read_pharaoh(
+    path: Union[str, Path], encoding: str = "utf-8", as_arrays: bool = False, block_size: int = 1 << 20
+) -> Iterator[Union[List[Tuple[int, int]], np.ndarray]]:
+    """Read word alignments in the Pharaoh format ("0-0 1-2 ..."), one sentence pair per line.
+    :param path: the alignment file, optionally gzipped
+    :param encoding: the encoding of the (decompressed) file. With ``as_arrays=True``, the file is parsed as bytes,
+    which works for all ASCII-compatible encodings
+    :param as_arrays: whether to yield NumPy arrays instead of lists (requires NumPy), which :class:`AlignedSentences`
+    also accepts. Files are then memory-mapped (unless they are gzipped) and parsed block by block with vectorized
+    operations, which is much faster for large files
+    :param block_size: the approximate number of bytes that are parsed at once with ``as_arrays=True``. Blocks always
+    end at the end of a line
+    :return: a generator that yields the zero-based (src, tgt) alignments of every line, as a list of tuples or as an
+    int32 array of shape (n_aligns, 2). Empty lines yield no alignments
+    """
+    # Not a generator itself, so that a missing dependency is reported when it is called rather than when the first
+    # alignments are read
+    if as_arrays:
+        if not _is_installed("numpy"):
+            raise ImportError("To read alignments as arrays, NumPy must be installed: pip install astred[numpy]")
+        return _read_pharaoh_arrays(path, block_size)
+
+    return _read_pharaoh_lists(path, encoding)
+
+
+def _read_pharaoh_lists(path: Union[str, Path], encoding: str) -> Iterator[List[Tuple[int, int]]]:
+    with open_text(path, encoding=encoding) as fhin:
+        for line_no, line in enumerate(fhin, 1):
+            try:
+                aligns = [(int(src), int(tgt)) for src, tgt in (pair.split("-") for pair in line.split())]
+            except ValueError:
+                raise ValueError(
+                    f"{path}, line {line_no}: alignments must be written as space-separated src_idx-tgt_idx pairs"
+                ) from None
+
+            yield aligns
+
+
+def _iter_line_blocks(path: Union[str, Path], block_size: int) -> Iterator[bytes]:
+    """Read a file in blocks of bytes that end at the end of a line (except for the last one). Regular files are
+    memory-mapped, gzipped files are decompressed on the fly.
+    """
+    with open(path, "rb") as fhin:
+        is_gzip = fhin.read(2) == GZIP_MAGIC
+        size = os.fstat(fhin.fileno()).st_size
+        if not is_gzip:
+            if not size:
+                # Empty files cannot be memory-mapped
+                return
+
+            with mmap.mmap(fhin.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start = 0
+                while start < size:
+                    end = mapped.find(b"\n", min(start + block_size, size) - 1)
+                    end = size if end == -1 else end + 1
+                    # Slicing copies the block, so that no references to the map remain when it is closed
+                    yield mapped[start:end]
+                    start = end
+            return
+
+    with gzip.open(path, "rb") as fhin:
+        rest = b""
+        while True:
+            chunk = fhin.read(block_size)
+            if not chunk:
+                break
+            data = rest + chunk
+            cut = data.rfind(b"\n") + 1
+            if cut:
+                yield data[:cut]
+            rest = data[cut:]
+
+        if rest:
+            yield rest
+
+
+def _read_pharaoh_arrays(path: Union[str, Path], block_size: int) -> Iterator[np.ndarray]:
+    import numpy as np
+
+    line_no = 1
+    for block in _iter_line_blocks(path, block_size):
+        aligns = _parse_pharaoh_block(np.frombuffer(block, dtype=np.uint8), path, line_no)
+        line_no += len(aligns)
+        yield from aligns
+
+
+def _parse_pharaoh_block(buffer: np.ndarray, path: Union[str, Path], line_no: int) -> List[np.ndarray]:
+    """Parse the bytes of complete lines in the Pharaoh format with vectorized operations.
+    :param buffer: the bytes as an uint8 array
+    :param path: the file that the bytes come from, for error messages
+    :param line_no: the line number of the first line in the buffer, for error messages
+    :return: an int32 array of shape (n_aligns, 2) for every line
+    """
+    import numpy as np
+
+    newline = buffer == ord("\n")
+    is_space = newline | (buffer == ord(" ")) | (buffer == ord("\t")) | (buffer == ord("\r"))
+    is_digit = (buffer >= ord("0")) & (buffer <= ord("9"))
+    is_dash = buffer == ord("-")
+    prev_digit = np.concatenate(([False], is_digit[:-1]))
+    next_digit = np.concatenate((is_digit[1:], [False]))
+
+    # Every pair is a token that consists of digits, a dash and digits. So besides whitespace there may only be digits
+    # and dashes, every dash must be surrounded by digits and every token must contain exactly one dash
+    invalid = ~(is_space | is_digit | is_dash) | (is_dash & ~(prev_digit & next_digit))
+    token_starts = np.flatnonzero(~is_space & np.concatenate(([True], is_space[:-1])))
+    dash_tokens = np.searchsorted(token_starts, np.flatnonzero(is_dash), side="right") - 1
+    invalid[token_starts[np.bincount(dash_tokens, minlength=len(token_starts)) != 1]] = True
+
+    # Numbers are runs of digits, which must fit in an int32
+    number_starts = np.flatnonzero(is_digit & ~prev_digit)
+    number_ends = np.flatnonzero(is_digit & ~next_digit)
+    number_lengths = number_ends - number_starts + 1
+    invalid[number_starts[number_lengths > 9]] = True
+
+    # The (zero-based) line of a position is the number of newlines before it
+    newlines = np.flatnonzero(newline)
+    if invalid.any():
+        line_idx = int(np.searchsorted(newlines, invalid.argmax()))
+        raise ValueError(
+            f"{path}, line {line_no + line_idx}: alignments must be written as space-separated src_idx-tgt_idx pairs"
+        )
+
+    # The value of every digit, given its position in its number, summed per number
+    digit_idxs = np.flatnonzero(is_digit)
+    exponents = np.repeat(number_ends, number_lengths) - digit_idxs
+    values = (buffer[digit_idxs] - ord("0")).astype(np.int64) * 10**exponents
+    numbers = np.add.reduceat(values, np.cumsum(number_lengths) - number_lengths) if len(values) else values
+    aligns = numbers.astype(np.int32).reshape(-1, 2)
+
+    n_lines = len(newlines) + int(not newline[-1])
+    aligns_per_line = np.bincount(np.searchsorted(newlines, number_starts[::2]), minlength=n_lines)
+    ends = np.cumsum(aligns_per_line).tolist()
+    return [aligns[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+
+@dataclass
+class MetricsWriter:
+    """Write :class:`MetricRecord` objects to a columnar file. Records are collected in batches of ``batch_size`` rows,
+    which are converted into typed columns at once:
+
+    - "parquet" and "arrow" (requires pyarrow): every batch is written as a row group (Parquet) or record batch (Arrow
+      IPC). Alignments are lists of (src, tgt) structs and missing numbers of changes are nulls;
+    - "npz" (requires NumPy): the typed columns of all batches are written to a single ``.npz`` archive when the writer
+      is closed. Every alignment column is stored as an (n_aligns, 2) array together with an ``_offsets`` array: the
+      alignments of row ``i`` are ``aligns[offsets[i]:offsets[i + 1]]``. Missing numbers of changes are -1. An npz
+      archive cannot be appended to, so the columns of all rows are kept in memory (as compact arrays rather than
+      records) until the writer is closed. This does not stream: use "parquet" or "arrow" for corpora whose columns
+      do not fit in memory.
+
+    Use the writer as a context manager, or call :meth:`close` to write the remaining records. Closing the writer
+    more than once has no effect, and records cannot be written after it has been closed.
+    """
+
+    path: Union[str, Path]
+    file_format: Optional[str] = field(default=None)
+    batch_size: int = field(default=10_000)
+    n_rows: int = field(default=0, init=False)
+
+    _batch: List[MetricRecord] = field(default_factory=list, init=False, repr=False)
+    _writer: Any = field(default=None, init=False, repr=False)
+    _npz_columns: Dict[str, List[Any]] = field(default_factory=dict, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    INT_COLUMNS = ("word_cross", "seq_cross", "sacr_cross", "ted")
+    NULLABLE_INT_COLUMNS = ("dep_changes", "pos_changes")
+    ALIGNS_COLUMNS = ("seq_aligns", "sacr_aligns")
+
+    def __post_init__(self):
+        if self.batch_size < 1:
+            raise ValueError(f"'batch_size' must be a positive integer ({self.batch_size} given)")
+
+        if self.file_format is None:
+            # Prefer Parquet, but fall back to NumPy when pyarrow is not installed
+            if _is_installed("pyarrow"):
+                self.file_format = "parquet"
+            elif _is_installed("numpy"):
+                self.file_format = "npz"
+            else:
+                raise ImportError(
+                    "To write metrics, pyarrow (for parquet and arrow) or NumPy (for npz) must be installed:"
+                    " pip install astred[parquet] or pip install astred[numpy]"
+                )
+        elif self.file_format not in ("parquet", "arrow", "npz"):
+            raise ValueError(f"'file_format' must be one of parquet, arrow, npz ({self.file_format} given)")
+        elif self.file_format == "npz" and not _is_installed("numpy"):
+            raise ImportError("To write metrics to npz, NumPy must be installed: pip install astred[numpy]")
+        elif self.file_format != "npz" and not _is_installed("pyarrow"):
+            raise ImportError(
+                f"To write metrics to {self.file_format}, pyarrow must be installed: pip install astred[parquet]"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record: MetricRecord):
+        """Add a record, and write the current batch if it is full.
+        :param record: the record to add, e.g. the output of :meth:`AlignedSentences.to_record`
+        """
+        if self._closed:
+            raise ValueError(f"Cannot write to {self.path}, because the writer has been closed")
+
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[MetricRecord]):
+        """Add multiple records, and write batches as they fill up.
+        :param records: the records to add, e.g. the output of :func:`pipeline.stream_metrics`
+        """
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Convert the current batch into typed columns and write it (or, for npz, keep its columns until the writer
+        is closed)."""
+        if not self._batch:
+            return
+
+        if self.file_format == "npz":
+            self._add_npz_columns(self._batch)
+        else:
+            self._write_arrow_table(self._batch)
+
+        self.n_rows += len(self._batch)
+        self._batch = []
+
+    def close(self):
+        """Write the remaining records and close the file. Closing a writer that has already been closed does nothing,
+        so that the file is not written again, e.g. by ``__exit__`` after an explicit call to :meth:`close`."""
+        if self._closed:
+            return
+
+        self.flush()
+        if self.file_format == "npz":
+            self._write_npz()
+        else:
+            if self._writer is None and self.n_rows == 0:
+                # Still create a file (with the schema) when no records were written
+                self._write_arrow_table([])
+            self._writer.close()
+            self._writer = None
+        self._closed = True
+
+    @classmethod
+    def _arrow_schema(cls):
+        import pyarrow as pa
+
+        aligns_type = pa.list_(pa.struct([("src", pa.int32()), ("tgt", pa.int32())]))
+        return pa.schema(
+            [(name, pa.int64()) for name in cls.INT_COLUMNS + cls.NULLABLE_INT_COLUMNS]
+            + [("giza_word_aligns", pa.string())]
+            + [(name, aligns_type) for name in cls.ALIGNS_COLUMNS]
+        )
+
+    def _write_arrow_table(self, records: List[MetricRecord]):
+        import pyarrow as pa
+
+        schema = self._arrow_schema()
+        columns = {name: [getattr(record, name) for record in records] for name in schema.names}
+        for name in self.ALIGNS_COLUMNS:
+            columns[name] = [[pair._asdict() for pair in aligns] for aligns in columns[name]]
+        table = pa.Table.from_pydict(columns, schema=schema)
+
+        if self._writer is None:
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(str(self.path), schema)
+            else:
+                self._writer = pa.ipc.new_file(str(self.path), schema)
+
+        if self.file_format == "parquet":
+            # One row group per batch
+            self._writer.write_table(table, row_group_size=max(len(records), 1))
+        else:
+            self._writer.write_table(table)
+
+    def _add_npz_columns(self, records: List[MetricRecord]):
+        import numpy as np
+
+        columns = self._npz_columns
+        for name in self.INT_COLUMNS:
+            columns.setdefault(name, []).append(np.array([getattr(r, name) for r in records], dtype=np.int64))
+        for name in self.NULLABLE_INT_COLUMNS:
+            values = [getattr(r, name) for r in records]
+            columns.setdefault(name, []).append(np.array([-1 if v is None else v for v in values], dtype=np.int64))
+        columns.setdefault("giza_word_aligns", []).append(np.array([r.giza_word_aligns for r in records], dtype=str))
+        for name in self.ALIGNS_COLUMNS:
+            aligns = [getattr(r, name) for r in records]
+            columns.setdefault(name, []).append(
+                np.array([tuple(pair) for pairs in aligns for pair in pairs], dtype=np.int32).reshape(-1, 2)
+            )
+            columns.setdefault(f"{name}_lengths", []).append(
+                np.array([len(pairs) for pairs in aligns], dtype=np.int64)
+            )
+
+    def _write_npz(self):
+        import numpy as np
+
+        if not self._npz_columns:
+            # Make sure that all columns exist, even when no records were written
+            self._add_npz_columns([])
+
+        arrays = {name: np.concatenate(parts) for name, parts in self._npz_columns.items()}
+        for name in self.ALIGNS_COLUMNS:
+            lengths = arrays.pop(f"{name}_lengths")
+            arrays[f"{name}_offsets"] = np.concatenate([np.zeros(1, dtype=np.int64), np.cumsum(lengths)])
+
+        # Pass a file object so that NumPy does not add the .npz extension itself
+        with open(self.path, "wb") as fhout:
+            np.savez(fhout, **arrays)
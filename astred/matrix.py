@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Set, Tuple
+
+from .pairs import IdxPair
+
+
+class AlignmentMatrix:
+    """The word alignments of a sentence pair as a sparse boolean matrix with a row for every source word and a column
+    for every target word (index 0 is NULL). The matrix is stored in compressed sparse row (CSR) and column (CSC)
+    format, so that all alignments of a word are a contiguous slice of an index array and can be retrieved without
+    building any sets of pairs. Alignments are kept in (src, tgt) order, including duplicates, so that position k of
+    the CSR arrays is the k-th alignment in that order, e.g. ``AlignedSentences.aligned_words[k]``.
+
+    Only plain lists are used, so that NumPy is not required.
+    """
+
+    def __init__(self, idx_pairs: Iterable[Tuple[int, int]], n_src: int, n_tgt: int):
+        """
+        :param idx_pairs: (src_id, tgt_id) alignments, in any order
+        :param n_src: number of rows, i.e. the number of source words including NULL
+        :param n_tgt: number of columns, i.e. the number of target words including NULL
+        """
+        pairs = sorted(idx_pairs)
+        self.n_src = n_src
+        self.n_tgt = n_tgt
+        self.n_aligns = n_aligns = len(pairs)
+        for src_id, tgt_id in pairs:
+            if not (0 <= src_id < n_src and 0 <= tgt_id < n_tgt):
+                raise ValueError(f"Alignment {src_id}-{tgt_id} is out of range of a {n_src}x{n_tgt} matrix")
+
+        # CSR: the alignments of source word s are col_idx[row_ptr[s]:row_ptr[s + 1]]
+        self.row_idx = [pair[0] for pair in pairs]
+        self.col_idx = [pair[1] for pair in pairs]
+        self.row_ptr = self._index_pointers(self.row_idx, n_src)
+
+        # CSC: the alignments of target word t are csc_row_idx[col_ptr[t]:col_ptr[t + 1]]. A stable counting sort on
+        # the target index keeps the source indices of every column sorted. csc_pos maps CSC positions to CSR positions
+        self.col_ptr = self._index_pointers(self.col_idx, n_tgt)
+        next_pos = self.col_ptr[:-1]
+        self.csc_pos = [0] * n_aligns
+        for pos, tgt_id in enumerate(self.col_idx):
+            self.csc_pos[next_pos[tgt_id]] = pos
+            next_pos[tgt_id] += 1
+        self.csc_row_idx = [self.row_idx[pos] for pos in self.csc_pos]
+
+    @staticmethod
+    def _index_pointers(idxs: List[int], size: int) -> List[int]:
+        """Count the occurrences of every index and return the prefix sums of these counts, so that the entries of
+        index i are at positions ptr[i] through ptr[i + 1] (exclusive) when ``idxs`` is sorted.
+        """
+        ptr = [0] * (size + 1)
+        for idx in idxs:
+            ptr[idx + 1] += 1
+        for idx in range(size):
+            ptr[idx + 1] += ptr[idx]
+
+        return ptr
+
+    def __len__(self):
+        return self.n_aligns
+
+    def src_aligned(self, src_id: int) -> List[int]:
+        """Get the target indices that a source word is aligned with, sorted and including duplicates.
+        :param src_id: the index of the source word
+        :return: the aligned target indices
+        """
+        return self.col_idx[self.row_ptr[src_id] : self.row_ptr[src_id + 1]]
+
+    def tgt_aligned(self, tgt_id: int) -> List[int]:
+        """Get the source indices that a target word is aligned with, sorted and including duplicates.
+        :param tgt_id: the index of the target word
+        :return: the aligned source indices
+        """
+        return self.csc_row_idx[self.col_ptr[tgt_id] : self.col_ptr[tgt_id + 1]]
+
+    def src_unaligned(self) -> List[int]:
+        """Get the indices of all source words (including NULL) that are not aligned.
+        :return: the indices of empty rows
+        """
+        row_ptr = self.row_ptr
+        return [idx for idx in range(self.n_src) if row_ptr[idx] == row_ptr[idx + 1]]
+
+    def tgt_unaligned(self) -> List[int]:
+        """Get the indices of all target words (including NULL) that are not aligned.
+        :return: the indices of empty columns
+        """
+        col_ptr = self.col_ptr
+        return [idx for idx in range(self.n_tgt) if col_ptr[idx] == col_ptr[idx + 1]]
+
+    def src_range(self, first: int, last: int) -> Tuple[int, int]:
+        """Get the CSR positions of the alignments of a range of source words.
+        :param first: the first source index
+        :param last: the last (inclusive) source index
+        :return: the start and (exclusive) end position
+        """
+        return self.row_ptr[first], self.row_ptr[last + 1]
+
+    def pairs(self, start: int = 0, end: int = None) -> List[IdxPair]:
+        """Get the alignments between two CSR positions, e.g. from :meth:`src_range`, in (src, tgt) order.
+        :param start: the first position
+        :param end: the (exclusive) end position, by default all remaining alignments
+        :return: the alignments as a list of :class:`IdxPair`
+        """
+        end = self.n_aligns if end is None else end
+        return list(map(IdxPair, self.row_idx[start:end], self.col_idx[start:end]))
+
+    def check_group(self, src_ids: Set[int], tgt_ids: Set[int]) -> Tuple[bool, bool]:
+        """Check whether a group of source and target words is a multi-word group (MWG) and whether any of its words
+        is aligned with words outside of the group, by only looking at the rows and columns of the group.
+        :param src_ids: the source indices of the group
+        :param tgt_ids: the target indices of the group
+        :return: a tuple of booleans indicating: (i) whether the group is a MWG, i.e. whether it consists of more
+        than one source and target word and all of its source words are aligned with all of its target words;
+        (ii) whether any of its words is aligned with words outside of the group
+        """
+        n_src, n_tgt = len(src_ids), len(tgt_ids)
+        is_mwg = n_src > 1 and n_tgt > 1
+        has_external_align = False
+        for idxs, other_ids, n_other in (
+            ([self.src_aligned(src_id) for src_id in src_ids], tgt_ids, n_tgt),
+            ([self.tgt_aligned(tgt_id) for tgt_id in tgt_ids], src_ids, n_src),
+        ):
+            for aligned in idxs:
+                # Rows and columns are sorted, so all indices of a word that is aligned with all n_other other words
+                # of the group (and nothing else) contain exactly n_other distinct values
+                is_external = not other_ids.issuperset(aligned)
+                has_external_align = has_external_align or is_external
+                if is_mwg and (is_external or self.count_distinct(aligned) != n_other):
+                    is_mwg = False
+
+                if not is_mwg and has_external_align:
+                    return False, True
+
+        return is_mwg, has_external_align
+
+    @staticmethod
+    def count_distinct(sorted_idxs: List[int]) -> int:
+        """Count the distinct values in a sorted list of indices.
+        :param sorted_idxs: sorted indices
+        :return: the number of distinct indices
+        """
+        return sum(1 for pos, idx in enumerate(sorted_idxs) if pos == 0 or idx != sorted_idxs[pos - 1])
+
+    @staticmethod
+    def is_consecutive(idxs: Set[int]) -> bool:
+        """Check whether a set of indices forms a range without gaps.
+        :param idxs: a non-empty set of indices
+        :return: whether the indices are consecutive
+        """
+        return max(idxs) - min(idxs) + 1 == len(idxs)
@@ -0,0 +1,151 @@
+"""Process-wide registry of loaded parsers, so that a stanza or spaCy pipeline is only loaded once and reused for all
+sentences that are parsed with it. The number of resident parsers is capped: when a new parser is loaded and the
+registry is full, the least recently used parser is released.
+"""
+from __future__ import annotations
+
+import gc
+import logging
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from .utils import load_parser, resolve_parser_name
+
+
+logger = logging.getLogger("astred")
+
+
+@dataclass
+class ParserRegistry:
+    """Registry of loaded parsers, keyed by the arguments that were used to load them: (model_or_lang, parser,
+    is_tokenized, kwargs).
+    """
+
+    max_models: Optional[int] = field(default=2)
+    loader: Callable[..., Any] = field(default=load_parser, repr=False)
+    _parsers: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: RLock = field(default_factory=RLock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_models is not None and self.max_models < 1:
+            raise ValueError(f"'max_models' must be a positive integer or None ({self.max_models} given)")
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._parsers
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+    @staticmethod
+    def make_key(model_or_lang: str, parser: Optional[str] = None, is_tokenized: bool = True, **kwargs) -> Tuple:
+        """Create the key under which a parser is stored.
+        :param model_or_lang: the model name or language of the parser
+        :param parser: "stanza", "spacy" or None. None is resolved to the parser that would be loaded (see
+        :func:`utils.resolve_parser_name`), so that it shares its key with an explicitly given parser
+        :param is_tokenized: whether the parser expects pretokenized text
+        :param kwargs: other keyword arguments that are used to load the parser. Values that are not hashable are
+        represented by their repr
+        :return: the key of the parser
+        """
+
+        def hashable(value: Any) -> Hashable:
+            try:
+                hash(value)
+                return value
+            except TypeError:
+                return repr(value)
+
+        kwargs_key = tuple(sorted((name, hashable(value)) for name, value in kwargs.items()))
+        return model_or_lang, resolve_parser_name(parser), is_tokenized, kwargs_key
+
+    @property
+    def keys(self) -> List[Tuple]:
+        """Keys of the loaded parsers, from least to most recently used."""
+        return list(self._parsers.keys())
+
+    def get(self, model_or_lang: str, parser: Optional[str] = None, *, is_tokenized: bool = True, **kwargs):
+        """Get a parser from the registry, or load it (see :func:`utils.load_parser`) if it has not been loaded
+        yet. If the registry is full, the least recently used parser is released.
+        :param model_or_lang: the model name or language of the parser
+        :param parser: "stanza", "spacy" or None to use whichever is available
+        :param is_tokenized: whether the parser expects pretokenized text
+        :param kwargs: other keyword arguments to load the parser with
+        :return: the loaded parser
+        """
+        key = self.make_key(model_or_lang, parser, is_tokenized, **kwargs)
+        with self._lock:
+            if key in self._parsers:
+                self._parsers.move_to_end(key)
+                return self._parsers[key]
+
+            nlp = self.loader(model_or_lang, parser, is_tokenized=is_tokenized, **kwargs)
+            self._parsers[key] = nlp
+
+            if self.max_models is not None:
+                while len(self._parsers) > self.max_models:
+                    evicted_key, _ = self._parsers.popitem(last=False)
+                    logger.info(f"Parser registry is full. Released the least recently used parser {evicted_key}")
+                    self._free_memory()
+
+            return nlp
+
+    def warmup(self, *models_or_langs: str, parser: Optional[str] = None, is_tokenized: bool = True, **kwargs):
+        """Load parsers in advance so that the first sentences do not have to wait for them.
+        :param models_or_langs: the model names or languages of the parsers to load
+        :param parser: "stanza", "spacy" or None to use whichever is available
+        :param is_tokenized: whether the parsers expect pretokenized text
+        :param kwargs: other keyword arguments to load the parsers with
+        """
+        for model_or_lang in models_or_langs:
+            self.get(model_or_lang, parser, is_tokenized=is_tokenized, **kwargs)
+
+    def release(self, model_or_lang: Optional[str] = None, parser: Optional[str] = None) -> int:
+        """Release loaded parsers so that their memory can be freed.
+        :param model_or_lang: only release parsers for this model or language. If not given, all parsers (of the
+        given parser type) are released
+        :param parser: only release parsers of this type ("stanza" or "spacy")
+        :return: the number of released parsers
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._parsers
+                if (model_or_lang is None or key[0] == model_or_lang) and (parser is None or key[1] == parser)
+            ]
+            for key in keys:
+                del self._parsers[key]
+
+            if keys:
+                self._free_memory()
+
+            return len(keys)
+
+    @staticmethod
+    def _free_memory():
+        gc.collect()
+        # Only free GPU memory if torch is in use anyway (e.g. by stanza), never import it here
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+# Default registry that is used by Sentence.from_text
+parser_registry = ParserRegistry()
+
+
+def get_parser(model_or_lang: str, parser: Optional[str] = None, *, is_tokenized: bool = True, **kwargs):
+    """Get a parser from the default :class:`ParserRegistry`. See :meth:`ParserRegistry.get`."""
+    return parser_registry.get(model_or_lang, parser, is_tokenized=is_tokenized, **kwargs)
+
+
+def warmup(*models_or_langs: str, parser: Optional[str] = None, is_tokenized: bool = True, **kwargs):
+    """Load parsers in advance in the default :class:`ParserRegistry`. See :meth:`ParserRegistry.warmup`."""
+    parser_registry.warmup(*models_or_langs, parser=parser, is_tokenized=is_tokenized, **kwargs)
+
+
+def release(model_or_lang: Optional[str] = None, parser: Optional[str] = None) -> int:
+    """Release parsers from the default :class:`ParserRegistry`. See :meth:`ParserRegistry.release`."""
+    return parser_registry.release(model_or_lang, parser)
@@ -0,0 +1,70 @@
+"""Streaming pipelines that calculate metrics for corpora that are too large to keep in memory. Inputs are read lazily
+and only a compact record is kept for every sentence pair, so memory usage does not grow with the size of the corpus.
+"""
+from __future__ import annotations
+
+from itertools import zip_longest
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from .batch import align_corpus
+from .io import read_conllu, read_pharaoh
+from .record import MetricRecord
+from .utils import _is_installed
+
+
+def iter_parallel(**named_iterables: Iterable) -> Iterator[Tuple]:
+    """Iterate over multiple iterables in lockstep, like ``zip``, but raise an error when they do not have the same
+    length instead of silently stopping at the shortest one.
+    :param named_iterables: the iterables to iterate over, by name. The names are used in the error message
+    :return: a generator of tuples with one item of every iterable
+    """
+    sentinel = object()
+    names = list(named_iterables.keys())
+    for idx, items in enumerate(zip_longest(*named_iterables.values(), fillvalue=sentinel)):
+        if any(item is sentinel for item in items):
+            ended = [name for name, item in zip(names, items) if item is sentinel]
+            raise ValueError(
+                f"The inputs do not have the same length: {', '.join(ended)} ended after {idx} items while"
+                f" {', '.join(name for name in names if name not in ended)} did not"
+            )
+        yield items
+
+
+def stream_metrics(
+    src_conllu: Union[str, Path],
+    tgt_conllu: Union[str, Path],
+    aligns_file: Optional[Union[str, Path]] = None,
+    jobs: Optional[int] = 1,
+    chunksize: int = 64,
+    max_pending: Optional[int] = None,
+    include_subtypes: bool = False,
+    encoding: str = "utf-8",
+    **kwargs,
+) -> Iterator[MetricRecord]:
+    """Calculate the metrics of every sentence pair in parallel CoNLL-U files. The source, target and alignment files
+    are read in lockstep, an :class:`AlignedSentences` is created for every pair and only its :class:`MetricRecord` is
+    yielded, so the object graph of a pair can be freed right after. See :func:`batch.align_corpus`.
+    :param src_conllu: the CoNLL-U file with source sentences, optionally gzipped
+    :param tgt_conllu: the CoNLL-U file with target sentences, optionally gzipped
+    :param aligns_file: the file with word alignments in the Pharaoh format, one line per sentence pair and optionally
+    gzipped. If not given, or for empty lines, the pairs are aligned automatically (like :class:`AlignedSentences`)
+    :param jobs: number of worker processes to use. 1 processes all pairs in the current process, None uses all
+    available CPUs
+    :param chunksize: number of pairs that are sent to a worker process at once
+    :param max_pending: maximal number of chunks that are submitted but not yet consumed, which caps the number of
+    queued pairs at max_pending * chunksize. Defaults to twice the number of jobs
+    :param include_subtypes: whether to include subtypes of dependency labels
+    :param encoding: the encoding of the (decompressed) files
+    :param kwargs: keyword arguments that are passed to every :class:`AlignedSentences`, e.g. ``allow_mwg``
+    :return: a generator of :class:`MetricRecord`, one per sentence pair
+    """
+    inputs = {
+        "src_conllu": read_conllu(src_conllu, include_subtypes=include_subtypes, encoding=encoding),
+        "tgt_conllu": read_conllu(tgt_conllu, include_subtypes=include_subtypes, encoding=encoding),
+    }
+    if aligns_file is not None:
+        # Arrays are parsed faster and are cheaper to send to worker processes
+        inputs["aligns_file"] = read_pharaoh(aligns_file, encoding=encoding, as_arrays=_is_installed("numpy"))
+
+    yield from align_corpus(iter_parallel(**inputs), jobs=jobs, chunksize=chunksize, max_pending=max_pending, **kwargs)
@@ -0,0 +1,238 @@
+"""Lightweight profiling of the stages that :class:`AlignedSentences` goes through (word alignments, sequence spans,
+SACr spans, connected words and TED). A :class:`Profiler` records the wall time and, optionally, the memory
+allocations of every stage for every pair and aggregates them across a run. It can be passed to an
+:class:`AlignedSentences` directly, or activated for all pairs that are created in a block of code with
+:func:`profile`. When no profiler is given or active, the only cost is a single lookup per pair.
+"""
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, ContextManager, Dict, Iterator, NamedTuple, Optional
+
+
+StageRecord = NamedTuple(
+    "StageRecord",
+    [
+        ("seconds", float),
+        # Net number of bytes that were allocated during the stage, and the peak of allocated bytes (relative to the
+        # start of the stage). None if memory is not tracked
+        ("allocated", Optional[int]),
+        ("peak", Optional[int]),
+    ],
+)
+
+
+@dataclass
+class StageStats:
+    """Aggregated measurements of one stage across all profiled pairs."""
+
+    calls: int = field(default=0)
+    seconds: float = field(default=0.0)
+    max_seconds: float = field(default=0.0)
+    allocated: Optional[int] = field(default=None)
+    max_peak: Optional[int] = field(default=None)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+    def add(self, record: StageRecord):
+        self.calls += 1
+        self.seconds += record.seconds
+        self.max_seconds = max(self.max_seconds, record.seconds)
+        if record.allocated is not None:
+            self.allocated = (self.allocated or 0) + record.allocated
+        if record.peak is not None:
+            self.max_peak = max(self.max_peak or 0, record.peak)
+
+
+@dataclass
+class Profiler:
+    """Records the wall time and (optionally) the memory allocations of every stage of :class:`AlignedSentences`.
+
+    A profiler can be used as a context manager. Inside the block, tracemalloc keeps tracing across pairs and is
+    stopped at the end of the block. Outside of a block, a profiler that had to start tracemalloc stops it again
+    after every pair, so that tracing never outlives the profiled code.
+
+    :param track_memory: whether to track memory allocations with tracemalloc. This makes the profiled code
+    considerably slower. Peaks are only available from Python 3.9 onwards. To attribute peaks to stages, the peak of
+    tracemalloc is reset at the start of every stage, which also resets it for any other user of tracemalloc in the
+    process
+    :param callback: function that is called with the measurements of every pair (a dictionary of stage names to
+    :class:`StageRecord`), e.g. to log slow pairs. Stages of a pair that are computed later, lazily or after changing
+    its alignments, are passed in a separate call
+    """
+
+    track_memory: bool = field(default=False)
+    callback: Optional[Callable[[Dict[str, StageRecord]], None]] = field(default=None, repr=False)
+    n_pairs: int = field(default=0, init=False)
+    stats: Dict[str, StageStats] = field(default_factory=dict, init=False, repr=False)
+    last_pair: Dict[str, StageRecord] = field(default_factory=dict, init=False, repr=False)
+
+    _current: Dict[str, StageRecord] = field(default_factory=dict, init=False, repr=False)
+    _started_tracing: bool = field(default=False, init=False, repr=False)
+    _in_block: bool = field(default=False, init=False, repr=False)
+
+    def __enter__(self) -> Profiler:
+        self._in_block = True
+        self._start_tracing()
+        return self
+
+    def __exit__(self, *exc):
+        self._in_block = False
+        self.close()
+
+    def _start_tracing(self):
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def start_pair(self):
+        """Start the measurements of a new pair."""
+        self._current = {}
+        self._start_tracing()
+
+    def end_pair(self, is_new: bool = True):
+        """Finish the measurements of the current pair and pass them to the callback.
+        :param is_new: whether to count the pair in ``n_pairs``, see :meth:`pair`
+        """
+        if is_new:
+            self.n_pairs += 1
+        self.last_pair = self._current
+        if not self._in_block:
+            # Without a block, nothing else would stop the tracing that this profiler started
+            self.close()
+        if self.callback is not None:
+            self.callback(self._current)
+
+    @contextmanager
+    def pair(self, is_new: bool = True) -> Iterator[None]:
+        """Measure the stages of a pair that run in this block. The measurements are finished even if a stage raises
+        an exception, so that tracing is stopped.
+        :param is_new: whether these are the first stages of a new pair, rather than stages of a pair that was
+        measured before, e.g. stages that are computed lazily. Only new pairs are counted in ``n_pairs``
+        """
+        self.start_pair()
+        try:
+            yield
+        finally:
+            self.end_pair(is_new)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure a stage of the current pair.
+        :param name: the name of the stage
+        """
+        if self.track_memory:
+            mem_start, _ = tracemalloc.get_traced_memory()
+            # Only Python 3.9+ can reset the peak, so that it can be attributed to this stage
+            track_peak = hasattr(tracemalloc, "reset_peak")
+            if track_peak:
+                tracemalloc.reset_peak()
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            seconds = perf_counter() - start
+            allocated = peak = None
+            if self.track_memory:
+                mem_end, mem_peak = tracemalloc.get_traced_memory()
+                allocated = mem_end - mem_start
+                peak = mem_peak - mem_start if track_peak else None
+
+            record = StageRecord(seconds, allocated, peak)
+            self._current[name] = record
+            self.stats.setdefault(name, StageStats()).add(record)
+
+    def close(self):
+        """Stop tracing memory allocations if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        """Remove all measurements."""
+        self.n_pairs = 0
+        self.stats = {}
+        self.last_pair = {}
+
+    def summary(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Aggregated measurements of every stage.
+        :return: a dictionary of stage names to the number of calls, the total, mean and maximal time in seconds, the
+        net allocated bytes and the maximal peak of allocated bytes
+        """
+        return {
+            name: {
+                "calls": stats.calls,
+                "seconds": stats.seconds,
+                "mean_seconds": stats.mean_seconds,
+                "max_seconds": stats.max_seconds,
+                "allocated": stats.allocated,
+                "max_peak": stats.max_peak,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def report(self) -> str:
+        """Format the aggregated measurements as a table, with stages sorted by their total time.
+        :return: the table
+        """
+        total = sum(stats.seconds for stats in self.stats.values()) or 1.0
+        lines = [
+            f"{self.n_pairs} pairs",
+            f"{'stage':<12} {'total (s)':>10} {'share':>6} {'mean (ms)':>10} {'max (ms)':>10}",
+        ]
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True):
+            line = (
+                f"{name:<12} {stats.seconds:10.3f} {stats.seconds / total:6.1%} {stats.mean_seconds * 1000:10.3f}"
+                f" {stats.max_seconds * 1000:10.3f}"
+            )
+            if stats.max_peak is not None:
+                line += f" peak {stats.max_peak / 1024:.1f} KiB"
+            lines.append(line)
+
+        return "\n".join(lines)
+
+
+# A nullcontext can be reused, so there is no need to create a new one for every stage
+_NULL_CONTEXT = nullcontext()
+
+
+def null_pair(is_new: bool = True) -> ContextManager[None]:
+    """Pair that measures nothing, which is used when profiling is disabled."""
+    return _NULL_CONTEXT
+
+
+def null_stage(name: str) -> ContextManager[None]:
+    """Stage that measures nothing, which is used when profiling is disabled."""
+    return _NULL_CONTEXT
+
+
+_active_profiler: ContextVar[Optional[Profiler]] = ContextVar("astred_profiler", default=None)
+
+
+def get_active_profiler() -> Optional[Profiler]:
+    """Get the profiler that is activated with :func:`profile`, if any."""
+    return _active_profiler.get()
+
+
+@contextmanager
+def profile(
+    track_memory: bool = False, callback: Optional[Callable[[Dict[str, StageRecord]], None]] = None
+) -> Iterator[Profiler]:
+    """Profile all :class:`AlignedSentences` that are created in this block (in the current thread or task).
+    :param track_memory: whether to track memory allocations, see :class:`Profiler`
+    :param callback: function that is called with the measurements of every pair, see :class:`Profiler`
+    :return: the active profiler, which contains the measurements after the block
+    """
+    with Profiler(track_memory=track_memory, callback=callback) as profiler:
+        token = _active_profiler.set(profiler)
+        try:
+            yield profiler
+        finally:
+            _active_profiler.reset(token)
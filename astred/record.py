@@ -0,0 +1,19 @@
+from typing import NamedTuple, Optional, Tuple
+
+from .pairs import IdxPair
+
+
+MetricRecord = NamedTuple(
+    "MetricRecord",
+    [
+        ("word_cross", int),
+        ("seq_cross", int),
+        ("sacr_cross", int),
+        ("ted", int),
+        ("dep_changes", Optional[int]),
+        ("pos_changes", Optional[int]),
+        ("giza_word_aligns", str),
+        ("seq_aligns", Tuple[IdxPair, ...]),
+        ("sacr_aligns", Tuple[IdxPair, ...]),
+    ],
+)
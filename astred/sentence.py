@@ -1,33 +1,32 @@
 from __future__ import annotations
 
 import logging
+from copy import copy
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List, Optional, Union
-
-from .utils import SPACY_AVAILABLE, STANZA_AVAILABLE, load_parser
-
-
-if SPACY_AVAILABLE:
-    from spacy.language import Language as SpacyLanguage
-    from spacy.tokens.doc import Doc as SpacyDoc
-    from spacy.tokens.span import Span as SpacySpan
-
-if STANZA_AVAILABLE:
-    from stanza.models.common.doc import Document as StanzaDoc
-    from stanza.models.common.doc import Sentence as StanzaSentence
-    from stanza.pipeline.core import Pipeline as StanzaPipeline
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from .base import SpanMixin
 from .enum import Side
+from .parsers import get_parser
 from .span import Span
 from .tree import Tree
+from .utils import is_instance_of, resolve_parser_name
 from .word import Null, Word
 
 
 logger = logging.getLogger("astred")
 
 if TYPE_CHECKING:
+    from spacy.language import Language as SpacyLanguage
+    from spacy.tokens.doc import Doc as SpacyDoc
+    from spacy.tokens.span import Span as SpacySpan
+    from stanza.models.common.doc import Document as StanzaDoc
+    from stanza.models.common.doc import Sentence as StanzaSentence
+    from stanza.pipeline.core import Pipeline as StanzaPipeline
+
     from .aligned import AlignedSentences
+    from .cache import ParseCache
 
 
 @dataclass(eq=False)
@@ -53,22 +52,30 @@ class Sentence(SpanMixin):
         )
 
     def __post_init__(self):
-        self.attach_self_to_words()
-        roots = [w for w in self if w.is_root]
+        # Attach the words and validate them for a tree in a single pass. Root words have a head (0) too, so all words
+        # need a head
+        roots = []
+        has_all_heads = True
+        for word in self.words:
+            word.doc = self
+            if word.is_root:
+                roots.append(word)
+            elif word.head is None:
+                has_all_heads = False
 
         if len(roots) != 1:
             logger.warning(
                 "Can only create a tree for a sentence if it has one (and only one) root (Word.is_root)."
                 " A tree for this sentence was not created."
             )
-        elif not all(w.head is not None for w in self if not w.is_root or w.is_null):
+        elif not has_all_heads:
             logger.warning(
                 "Can only create a tree for a sentence if all of its words (except potential Null and the root of the"
                 " sentence) have a 'head' attribute set. A tree for this sentence was not created."
             )
         else:
-            self.tree = Tree.from_sentence(self)
             self.root = roots[0]
+            self.tree = Tree._from_root(self.words, self.root, self)
 
     @property
     def aligned_sentence(self) -> Sentence:
@@ -100,6 +107,30 @@ class Sentence(SpanMixin):
     def no_null_sacr_spans(self) -> List[Span]:
         return [s for s in self.sacr_spans if not s.is_null]
 
+    def clone(self) -> Sentence:
+        """Create a copy of this sentence that can be aligned independently of it. Only the words and the tree, which
+        hold the alignments, groups and edit operations of a pair, are copied. The token data and the parser objects
+        (``_sentence`` and ``Word._word``) are shared rather than copied. NULL words are left out, so a sentence that
+        has been aligned can be cloned to align it again.
+        :return: the copy
+        """
+        # A shallow copy does not call __post_init__, so the tree is not validated and built again
+        sentence = copy(self)
+        sentence.words = [word.clone() for word in self.no_null_words]
+        sentence.side = None
+        sentence._aligned_sentence = None
+        sentence.aligned_sentences = None
+        sentence.merged_tree = None
+        sentence.seq_spans = []
+        sentence.sacr_spans = []
+        sentence.attach_self_to_words()
+
+        if self.tree is not None:
+            sentence.tree = self.tree.clone(sentence)
+            sentence.root = sentence.tree.node
+
+        return sentence
+
     def attach_self_to_words(self):
         for word in self.words:
             word.doc = self
@@ -144,19 +175,20 @@ class Sentence(SpanMixin):
         on_multiple: str = "raise",
     ) -> Optional[Sentence]:
         # If the given element is a full parsed doc, we need to check how many sentences it has (we only want one)
-        if STANZA_AVAILABLE and isinstance(doc, StanzaDoc):
+        # Parsers are imported lazily, so only check for their classes if they have been imported
+        if is_instance_of(doc, "stanza.models.common.doc", "Document"):
             sentence = cls._on_multiple_error_handling(doc.sentences, on_multiple=on_multiple)
-        elif SPACY_AVAILABLE and isinstance(doc, SpacyDoc):
+        elif is_instance_of(doc, "spacy.tokens.doc", "Doc"):
             sentence = cls._on_multiple_error_handling(list(doc.sents), on_multiple=on_multiple)
         else:
             # If it is a StanzaSentence or SpacySpan, we can just continue with that
             sentence = doc
 
-        if STANZA_AVAILABLE and isinstance(sentence, StanzaSentence):
+        if is_instance_of(sentence, "stanza.models.common.doc", "Sentence"):
             return cls(
                 [Word.from_stanza(w, include_subtypes=include_subtypes) for w in sentence.words], _sentence=sentence
             )
-        elif SPACY_AVAILABLE and isinstance(sentence, SpacySpan):
+        elif is_instance_of(sentence, "spacy.tokens.span", "Span"):
             return cls([Word.from_spacy(w, include_subtypes=include_subtypes) for w in sentence], _sentence=sentence)
         else:
             return None
@@ -170,17 +202,204 @@ class Sentence(SpanMixin):
         is_tokenized: bool = True,
         include_subtypes: bool = False,
         on_multiple: str = "raise",
+        cache: Optional[ParseCache] = None,
         **kwargs,
     ) -> Sentence:
-        if (STANZA_AVAILABLE and isinstance(nlp_or_model, StanzaPipeline)) or (
-            SPACY_AVAILABLE and isinstance(nlp_or_model, SpacyLanguage)
+        if cache is not None:
+            return next(
+                cls.from_texts(
+                    [text],
+                    nlp_or_model,
+                    parser=parser,
+                    is_tokenized=is_tokenized,
+                    include_subtypes=include_subtypes,
+                    on_multiple=on_multiple,
+                    batch_size=1,
+                    cache=cache,
+                    **kwargs,
+                )
+            )
+        elif is_instance_of(nlp_or_model, "stanza.pipeline.core", "Pipeline") or is_instance_of(
+            nlp_or_model, "spacy.language", "Language"
         ):
             return cls.from_parser(nlp_or_model(text), include_subtypes=include_subtypes, on_multiple=on_multiple)
         else:
-            nlp = load_parser(nlp_or_model, parser, is_tokenized=is_tokenized, **kwargs)
+            # Parsers are loaded once and then reused from the registry
+            nlp = get_parser(nlp_or_model, parser, is_tokenized=is_tokenized, **kwargs)
             return cls.from_text(
                 text,
                 nlp,
                 include_subtypes=include_subtypes,
                 on_multiple=on_multiple,
             )
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: Iterable[str],
+        nlp_or_model: Union[StanzaPipeline, SpacyLanguage, str],
+        parser: str = None,
+        is_tokenized: bool = True,
+        include_subtypes: bool = False,
+        on_multiple: str = "raise",
+        batch_size: int = 32,
+        n_process: int = 1,
+        cache: Optional[ParseCache] = None,
+        **kwargs,
+    ) -> Iterator[Optional[Sentence]]:
+        """Parse multiple texts in batches, which is a lot faster than calling :meth:`from_text` for every text. For
+        spaCy, the texts are processed with ``nlp.pipe``, for stanza ``batch_size`` texts are processed at once as
+        separate documents. Sentences are created lazily, so ``texts`` can be a (large) generator.
+        :param texts: the texts to parse, each of which should contain one sentence
+        :param nlp_or_model: a stanza Pipeline or spaCy Language, or the model name or language of a parser to load
+        :param parser: "stanza", "spacy" or None to use whichever is available when a parser has to be loaded
+        :param is_tokenized: whether the texts are pretokenized (only used when a parser has to be loaded)
+        :param include_subtypes: whether to include subtypes of dependency labels
+        :param on_multiple: what to do when a text contains more than one sentence, see :meth:`from_parser`. This is
+        applied to every text separately
+        :param batch_size: the number of texts that are parsed at once
+        :param n_process: the number of processes that spaCy uses. Ignored for stanza
+        :param cache: a :class:`ParseCache` to look up texts that have been parsed before. The parser is only loaded
+        when a text is not in the cache. Only supported when ``nlp_or_model`` is the name of a model, because the
+        cache needs to know which parser is used
+        :param kwargs: other keyword arguments to load the parser with
+        :return: a generator that yields a Sentence (or None, see ``on_multiple``) for every text
+        """
+        if cache is not None:
+            yield from cls._from_texts_cached(
+                texts,
+                nlp_or_model,
+                parser,
+                is_tokenized,
+                include_subtypes,
+                on_multiple,
+                batch_size,
+                n_process,
+                cache,
+                **kwargs,
+            )
+            return
+
+        nlp = cls._get_nlp(nlp_or_model, parser, is_tokenized, **kwargs)
+        for doc in cls._parse_texts(texts, nlp, batch_size, n_process):
+            yield cls.from_parser(doc, include_subtypes=include_subtypes, on_multiple=on_multiple)
+
+    @classmethod
+    def _from_texts_cached(
+        cls,
+        texts: Iterable[str],
+        model_or_lang: str,
+        parser: Optional[str],
+        is_tokenized: bool,
+        include_subtypes: bool,
+        on_multiple: str,
+        batch_size: int,
+        n_process: int,
+        cache: ParseCache,
+        **kwargs,
+    ) -> Iterator[Optional[Sentence]]:
+        if not isinstance(model_or_lang, str):
+            raise ValueError(
+                f"A parse cache can only be used when 'nlp_or_model' is the name of a model"
+                f" ({type(model_or_lang).__name__} given)"
+            )
+
+        parser = resolve_parser_name(parser)
+        texts = iter(texts)
+        while True:
+            batch = list(islice(texts, batch_size))
+            if not batch:
+                return
+
+            keys = [
+                cache.make_parse_key(text, parser, model_or_lang, include_subtypes, is_tokenized, **kwargs)
+                for text in batch
+            ]
+            sentences = cache.get_sentences(keys)
+            missing = [idx for idx, sentence in enumerate(sentences) if sentence is None]
+
+            if missing:
+                # Only load the parser when it is actually needed
+                nlp = cls._get_nlp(model_or_lang, parser, is_tokenized, **kwargs)
+                docs = cls._parse_texts([batch[idx] for idx in missing], nlp, batch_size, n_process)
+                parsed = []
+                for idx, doc in zip(missing, docs):
+                    sentences[idx] = cls.from_parser(doc, include_subtypes=include_subtypes, on_multiple=on_multiple)
+                    # Texts with multiple sentences are not cached, so that on_multiple is applied again next time
+                    if sentences[idx] is not None and cls._num_sentences(doc) == 1:
+                        parsed.append((keys[idx], sentences[idx]))
+                cache.set_sentences(parsed)
+
+            yield from sentences
+
+    @staticmethod
+    def _get_nlp(
+        nlp_or_model: Union[StanzaPipeline, SpacyLanguage, str], parser: Optional[str], is_tokenized: bool, **kwargs
+    ) -> Union[StanzaPipeline, SpacyLanguage]:
+        if is_instance_of(nlp_or_model, "stanza.pipeline.core", "Pipeline") or is_instance_of(
+            nlp_or_model, "spacy.language", "Language"
+        ):
+            return nlp_or_model
+        elif isinstance(nlp_or_model, str):
+            # Parsers are loaded once and then reused from the registry
+            return get_parser(nlp_or_model, parser, is_tokenized=is_tokenized, **kwargs)
+        else:
+            raise ValueError(
+                f"'nlp_or_model' must be a stanza Pipeline, a spaCy Language or the name of a model"
+                f" ({type(nlp_or_model).__name__} given)"
+            )
+
+    @staticmethod
+    def _parse_texts(
+        texts: Iterable[str], nlp: Union[StanzaPipeline, SpacyLanguage], batch_size: int, n_process: int
+    ) -> Iterator[Union[StanzaDoc, SpacyDoc]]:
+        if is_instance_of(nlp, "spacy.language", "Language"):
+            yield from nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        else:
+            from stanza import Document
+
+            texts = iter(texts)
+            while True:
+                batch = [Document([], text=text) for text in islice(texts, batch_size)]
+                if not batch:
+                    return
+                # Passing a list of documents makes stanza process them in bulk
+                yield from nlp(batch)
+
+    @staticmethod
+    def _num_sentences(doc: Union[StanzaDoc, SpacyDoc]) -> int:
+        if is_instance_of(doc, "stanza.models.common.doc", "Document"):
+            return len(doc.sentences)
+        elif is_instance_of(doc, "spacy.tokens.doc", "Doc"):
+            return sum(1 for _ in doc.sents)
+        else:
+            return 1
+
+
+# The token attributes that are needed to rebuild a Word in another process or from a cache. Parser objects
+# (Word._word, Sentence._sentence) are deliberately not included because they are expensive to pickle.
+TOKEN_FIELDS = ("id", "text", "lemma", "head", "deprel", "upos", "xpos", "feats")
+
+
+def pack_sentence(sentence: Sentence) -> Tuple[Tuple, ...]:
+    """Convert a :class:`Sentence` into nested tuples that only contain the token attributes in ``TOKEN_FIELDS``.
+    Such tuples are much cheaper to send to another process than the (cyclic) object graph of a sentence.
+    :param sentence: the sentence to pack
+    :return: a tuple of word tuples
+    """
+    packed = []
+    for word in sentence.no_null_words:
+        values = [getattr(word, attr) for attr in TOKEN_FIELDS]
+        # spaCy's features are a MorphAnalysis object, so make sure that we only store strings
+        values[-1] = str(values[-1]) if values[-1] is not None else None
+        packed.append(tuple(values))
+
+    return tuple(packed)
+
+
+def unpack_sentence(packed: Sequence[Tuple]) -> Sentence:
+    """Rebuild a :class:`Sentence` from the output of :func:`pack_sentence`.
+    :param packed: a sequence of word tuples
+    :return: the rebuilt sentence
+    """
+    return Sentence([Word(**dict(zip(TOKEN_FIELDS, values))) for values in packed])
@@ -6,10 +6,11 @@ from typing import Dict, List, NamedTuple, Optional
 from .base import Crossable, SpanMixin
 from .enum import SpanType
 from .tree import Tree
-from .utils import cached_property
+from .utils import add_slots
 from .word import Null, Word
 
 
+@add_slots
 @dataclass
 class Span(Crossable, SpanMixin):
     words: List[Word] = field(default_factory=list, repr=False)
@@ -18,6 +19,12 @@ class Span(Crossable, SpanMixin):
     tree: Tree = field(default=None, init=False, repr=False)
     is_mwg: bool = field(default=False)
 
+    # Structural properties of the span, which are computed once at initialisation
+    items_per_level: Optional[Dict[int, List[Word]]] = field(default=None, init=False, repr=False, compare=False)
+    root_level: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    root: Optional[Word] = field(default=None, init=False, repr=False, compare=False)
+    is_valid_subtree: Optional[bool] = field(default=None, init=False, repr=False, compare=False)
+
     def __repr__(self):
         return f"{self.__class__.__name__}(id={self.id}, span_type={self.span_type}, text={self.text})"
 
@@ -37,6 +44,11 @@ class Span(Crossable, SpanMixin):
         if self.span_type is None or not isinstance(self.span_type, SpanType):
             raise ValueError(f"'span_type' must be one of {SpanType._member_names_} from {SpanType.__name__} enum")
 
+        self.items_per_level = self._get_items_per_level()
+        self.root_level = min(self.items_per_level.keys()) if self.items_per_level else None
+        self.root = self.items_per_level[self.root_level][0] if self.root_level is not None else None
+        self.is_valid_subtree = self._get_is_valid_subtree()
+
         if self.is_valid_subtree:
             self.tree = Tree.from_span(self, self.root, self.doc)
 
@@ -56,32 +68,18 @@ class Span(Crossable, SpanMixin):
             setattr(word, attr, self)
             setattr(word, f"id_in_{attr}", word_idx)
 
-    @cached_property
-    def items_per_level(self) -> Optional[Dict[int, List[Word]]]:
+    def _get_items_per_level(self) -> Optional[Dict[int, List[Word]]]:
         # When some word in this span does not have its tree set, this should fail
+        words_per_level = {}
         try:
-            levels = set([word.tree.level for word in self])
+            for word in self:
+                words_per_level.setdefault(word.tree.level, []).append(word)
         except AttributeError:
             return None
 
-        return {level: [word for word in self if word.tree.level == level] for level in sorted(levels, reverse=True)}
-
-    @cached_property
-    def root(self) -> Optional[Word]:
-        if self.root_level is not None:
-            return self.items_per_level[self.root_level][0]
-        else:
-            return None
+        return {level: words_per_level[level] for level in sorted(words_per_level, reverse=True)}
 
-    @cached_property
-    def root_level(self) -> Optional[int]:
-        if self.items_per_level:
-            return min(self.items_per_level.keys())
-        else:
-            return None
-
-    @cached_property
-    def is_valid_subtree(self) -> Optional[bool]:
+    def _get_is_valid_subtree(self) -> Optional[bool]:
         """valid subtrees need to all be connected. That means that
         for all nodes, their parents' idx (head) must be present except for the topmost level
         and that the topmost level can only contain one node (as the main ancestor)"""
@@ -98,7 +96,8 @@ class Span(Crossable, SpanMixin):
         if len(self.items_per_level[self.root_level]) > 1:
             return False
 
-        return not any(w.head not in self.word_idxs for w in self if w.tree.level != self.root_level)
+        word_idxs = set(self.word_idxs)
+        return not any(w.head not in word_idxs for w in self if w.tree.level != self.root_level)
 
     @classmethod
     def sacr_from_seq(cls, span: Span, idx: int) -> Span:
@@ -106,6 +105,8 @@ class Span(Crossable, SpanMixin):
 
 
 class NullSpan(Span):
+    __slots__ = ()
+
     def __init__(self, null_word: Null, span_type: SpanType = None):
         if not null_word.is_null:
             raise ValueError("words inside a NullSpan need to be Null words and can only be one single word.")
@@ -0,0 +1,202 @@
+"""Tree edit distance on flat postorder arrays.
+
+This is an implementation of the algorithm by Zhang and Shasha (1989). Rather than traversing :class:`Tree` objects,
+trees are first converted into a number of flat lists (postorder nodes, integer-interned labels, leftmost leaf
+descendants, and key roots) so that the inner loops of the algorithm only deal with integers. The edit mapping is
+retrieved in the same way as in the ``apted`` package, so that both return the same distance and the same mapping.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .enum import EditOperation
+
+
+if TYPE_CHECKING:
+    from .tree import AstredConfig, Tree
+
+
+# Flat representation of a tree. All lists are 1-indexed (index 0 is a placeholder) and ordered in postorder. "lld"
+# contains for every node the postorder index of its leftmost leaf descendant minus one, i.e. the index where the
+# forest of the node's subtree starts.
+TreeArrays = NamedTuple(
+    "TreeArrays", [("nodes", List["Tree"]), ("labels", List[int]), ("lld", List[int]), ("keyroots", List[int])]
+)
+
+
+def tree_to_arrays(tree: Tree, attr: str, label_ids: Dict[Any, int]) -> TreeArrays:
+    """Convert a tree into its flat :class:`TreeArrays` representation.
+    :param tree: the root of the tree to convert
+    :param attr: the attribute of a tree's node (word) that is used as its label
+    :param label_ids: a dictionary that maps labels to integers. It is updated in-place with unseen labels so that
+    it can be shared between the two trees that are compared
+    :return: the flat representation of the tree
+    """
+    nodes = [None]
+    labels = [0]
+    lld = [0]
+    # Iterative postorder traversal: (tree, whether its children have been visited already)
+    stack = [(tree, False)]
+    # For every visited node, the postorder index of its first (leftmost) leaf
+    first_leaf = {}
+    while stack:
+        current, visited = stack.pop()
+        if visited or not current.children:
+            idx = len(nodes)
+            nodes.append(current)
+            label = getattr(current.node, attr)
+            labels.append(label_ids.setdefault(label, len(label_ids)))
+            leaf = first_leaf[id(current.children[0])] if current.children else idx
+            first_leaf[id(current)] = leaf
+            lld.append(leaf - 1)
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(current.children))
+
+    # Key roots are the root and all nodes that have a left sibling, i.e. the highest node for each leftmost leaf
+    highest = {}
+    for idx in range(1, len(nodes)):
+        highest[lld[idx]] = idx
+    keyroots = sorted(highest.values())
+
+    return TreeArrays(nodes, labels, lld, keyroots)
+
+
+def _tree_distances(
+    arrays1: TreeArrays, arrays2: TreeArrays, del_cost: int, ins_cost: int, ren_cost: int
+) -> List[List[int]]:
+    """Compute the distance between all pairs of subtrees with the Zhang-Shasha algorithm.
+    :return: a (1-indexed) matrix with the tree edit distances between every pair of subtrees
+    """
+    labels1, lld1 = arrays1.labels, arrays1.lld
+    labels2, lld2 = arrays2.labels, arrays2.lld
+    size1, size2 = len(labels1) - 1, len(labels2) - 1
+
+    treedist = [[0] * (size2 + 1) for _ in range(size1 + 1)]
+    forestdist = [[0] * (size2 + 1) for _ in range(size1 + 1)]
+
+    for i in arrays1.keyroots:
+        first1 = lld1[i]
+        for j in arrays2.keyroots:
+            first2 = lld2[j]
+            forestdist[first1][first2] = 0
+            row = forestdist[first1]
+            for dj in range(first2 + 1, j + 1):
+                row[dj] = row[dj - 1] + ins_cost
+
+            for di in range(first1 + 1, i + 1):
+                prev_row = forestdist[di - 1]
+                row = forestdist[di]
+                row[first2] = prev_row[first2] + del_cost
+                label1 = labels1[di]
+                lld_di = lld1[di]
+                treedist_row = treedist[di]
+
+                if lld_di == first1:
+                    for dj in range(first2 + 1, j + 1):
+                        rename = prev_row[dj - 1] + (ren_cost if label1 != labels2[dj] else 0)
+                        delete = prev_row[dj] + del_cost
+                        insert = row[dj - 1] + ins_cost
+                        if lld2[dj] == first2:
+                            row[dj] = treedist_row[dj] = min(delete, insert, rename)
+                        else:
+                            row[dj] = min(delete, insert, forestdist[lld_di][lld2[dj]] + treedist_row[dj])
+                else:
+                    forest_row = forestdist[lld_di]
+                    for dj in range(first2 + 1, j + 1):
+                        row[dj] = min(
+                            prev_row[dj] + del_cost,
+                            row[dj - 1] + ins_cost,
+                            forest_row[lld2[dj]] + treedist_row[dj],
+                        )
+
+    return treedist
+
+
+def _edit_mapping(
+    arrays1: TreeArrays,
+    arrays2: TreeArrays,
+    treedist: List[List[int]],
+    del_cost: int,
+    ins_cost: int,
+    ren_cost: int,
+) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Backtrack through the forest distances to retrieve the edit mapping. This follows the same procedure (and
+    therefore makes the same choices when multiple mappings are optimal) as ``apted.Config.compute_edit_mapping``.
+    :return: a list of tuples of postorder indices. Deleted or inserted nodes are mapped to None
+    """
+    labels1, lld1 = arrays1.labels, arrays1.lld
+    labels2, lld2 = arrays2.labels, arrays2.lld
+    size1, size2 = len(labels1) - 1, len(labels2) - 1
+
+    forestdist = [[0] * (size2 + 1) for _ in range(size1 + 1)]
+
+    def forest_dist(i: int, j: int):
+        first1, first2 = lld1[i], lld2[j]
+        forestdist[first1][first2] = 0
+        for dj in range(first2 + 1, j + 1):
+            forestdist[first1][dj] = forestdist[first1][dj - 1] + ins_cost
+
+        for di in range(first1 + 1, i + 1):
+            forestdist[di][first2] = forestdist[di - 1][first2] + del_cost
+            for dj in range(first2 + 1, j + 1):
+                cost_ren = ren_cost if labels1[di] != labels2[dj] else 0
+                if lld1[di] == first1 and lld2[dj] == first2:
+                    replace = forestdist[di - 1][dj - 1] + cost_ren
+                else:
+                    replace = forestdist[lld1[di]][lld2[dj]] + treedist[di][dj]
+                forestdist[di][dj] = min(forestdist[di - 1][dj] + del_cost, forestdist[di][dj - 1] + ins_cost, replace)
+
+    mapping = []
+    tree_pairs = [(size1, size2)]
+    while tree_pairs:
+        id1, id2 = tree_pairs.pop()
+        forest_dist(id1, id2)
+
+        first1, first2 = lld1[id1], lld2[id2]
+        while id1 > first1 or id2 > first2:
+            dist = forestdist[id1][id2]
+            if id1 > first1 and forestdist[id1 - 1][id2] + del_cost == dist:
+                mapping.append((id1, None))
+                id1 -= 1
+            elif id2 > first2 and forestdist[id1][id2 - 1] + ins_cost == dist:
+                mapping.append((None, id2))
+                id2 -= 1
+            elif lld1[id1] == first1 and lld2[id2] == first2:
+                mapping.append((id1, id2))
+                id1, id2 = id1 - 1, id2 - 1
+            else:
+                tree_pairs.append((id1, id2))
+                id1, id2 = lld1[id1], lld2[id2]
+
+    return mapping
+
+
+def tree_edit_distance(
+    tree1: Tree, tree2: Tree, config: AstredConfig
+) -> Tuple[int, List[Tuple[Optional[Tree], Optional[Tree]]]]:
+    """Calculate the tree edit distance and the edit mapping between two trees. Nodes are compared by the
+    attribute ``config.attr`` of their words, and the costs of the operations are taken from ``config.costs``.
+    :param tree1: the source tree
+    :param tree2: the target tree
+    :param config: the configuration that contains the attribute to compare and the costs of the edit operations
+    :return: the tree edit distance and the edit mapping as a list of tuples of (source, target) nodes. Nodes that
+    are deleted or inserted are mapped to None
+    """
+    label_ids = {}
+    arrays1 = tree_to_arrays(tree1, config.attr, label_ids)
+    arrays2 = tree_to_arrays(tree2, config.attr, label_ids)
+
+    del_cost = config.costs[EditOperation.DELETION]
+    ins_cost = config.costs[EditOperation.INSERTION]
+    ren_cost = config.costs[EditOperation.RENAME]
+
+    treedist = _tree_distances(arrays1, arrays2, del_cost, ins_cost, ren_cost)
+    dist = treedist[-1][-1]
+    mapping = _edit_mapping(arrays1, arrays2, treedist, del_cost, ins_cost, ren_cost)
+
+    nodes1, nodes2 = arrays1.nodes, arrays2.nodes
+    return dist, [
+        (nodes1[idx1] if idx1 is not None else None, nodes2[idx2] if idx2 is not None else None)
+        for idx1, idx2 in mapping
+    ]
@@ -6,10 +6,10 @@ from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 
 from apted import APTED
 from apted import Config as AptedConfig
-from nltk.draw.tree import draw_trees
-from nltk.tree import ParentedTree as NltkTree
 
 from .enum import EditOperation
+from .ted import tree_edit_distance
+from .utils import add_slots
 
 
 if TYPE_CHECKING:
@@ -51,6 +51,7 @@ class AstredConfig(AptedConfig):
         return self.costs[EditOperation.INSERTION]
 
 
+@add_slots
 @dataclass
 class Tree:
     node: Word
@@ -60,6 +61,8 @@ class Tree:
     root: Tree = field(default=None, repr=False, init=False)
     doc: Sentence = field(default=None, repr=False)
     astred_op: EditOperation = field(default=None, init=False)
+    depth: int = field(default=1, init=False, repr=False, compare=False)
+    size: int = field(default=1, init=False, repr=False, compare=False)
 
     def __repr__(self):
         return (
@@ -75,27 +78,72 @@ class Tree:
     def astred_cost(self) -> int:
         return self.ted_config.costs[self.astred_op] if self.astred_op else None
 
-    @property
-    def depth(self) -> int:
-        def max_depth(node: Tree):
-            if not node.children:
-                return 1
-
-            depths = [max_depth(n) for n in node.children]
-
-            return max(depths) + 1
-
-        return max_depth(self)
-
     def __post_init__(self):
-        if any(not isinstance(child, self.__class__) for child in self.children):
-            raise ValueError("A tree's children must have the same class as its parent.")
+        # Children are always created before their parent, so depth and size can be derived from them (in the same
+        # pass that validates them)
+        depth = size = 0
+        for child in self.children:
+            if not isinstance(child, self.__class__):
+                raise ValueError("A tree's children must have the same class as its parent.")
+            if child.depth > depth:
+                depth = child.depth
+            size += child.size
+        self.depth = depth + 1
+        self.size = size + 1
         self.attach_self_to_children()
         if self.node.is_root:
             self.attach_self_to_subtrees()
 
         self.attach_self_to_node()
 
+    @classmethod
+    def _from_preorder(cls, nodes: List[Tuple[Word, int, Optional[List[Word]]]], doc: Optional[Sentence]) -> Tree:
+        """Create the trees of many nodes like ``__init__`` does, but without validating them, for trees that are
+        built in bulk (see :meth:`from_span` and :meth:`clone`). This skips the overhead of the generated
+        ``__init__``, which dominates the time to build the trees of many sentences, e.g. when reading a corpus. All
+        fields must be set here, because the instances are created without ``__init__``.
+        :param nodes: (node, level, children) for every node of the tree in preorder, starting with the root. The
+        children are words in ``nodes`` (or None for a leaf), and every word must have a unique ID
+        :param doc: the sentence that the tree belongs to
+        :return: the tree of the first node
+        """
+        new = cls.__new__
+        trees = {}
+        # Children must exist before their parent, so create the trees in reversed preorder
+        for node, level, children in reversed(nodes):
+            tree = new(cls)
+            tree.node = node
+            tree.level = level
+            tree.parent = None
+            tree.root = None
+            tree.doc = doc
+            tree.astred_op = None
+
+            depth = size = 0
+            if children:
+                tree.children = [trees[child.id] for child in children]
+                for child in tree.children:
+                    child.parent = tree
+                    if child.depth > depth:
+                        depth = child.depth
+                    size += child.size
+            else:
+                tree.children = []
+            tree.depth = depth + 1
+            tree.size = size + 1
+
+            if node.tree is None:
+                node.tree = tree
+            trees[node.id] = tree
+
+        # Like attach_self_to_subtrees, but without traversing the finished tree again
+        root = trees.pop(nodes[0][0].id)
+        if root.node.is_root:
+            for tree in trees.values():
+                tree.root = root
+
+        return root
+
     def as_embedded_tuples(self) -> Tuple[Word, List]:
         """Create embedded/recursive tuples in the form of (ROOT, [(child1, [subchildren...]), (child2, [subchildren2...]), ...])
         Returns
@@ -103,10 +151,16 @@ class Tree:
 
         """
 
-        def children(root):
-            return root.node, [children(word) for word in root.children]
+        embedded = (self.node, [])
+        stack = [(self, embedded[1])]
+        while stack:
+            tree, embedded_children = stack.pop()
+            for child in tree.children:
+                embedded_child = (child.node, [])
+                embedded_children.append(embedded_child)
+                stack.append((child, embedded_child[1]))
 
-        return children(self)
+        return embedded
 
     def subtrees(self, include_self: bool = True) -> List[Tree]:
         """Return a flat list of the unique, full subtrees (so no combinations or subparts of subtrees)
@@ -119,21 +173,29 @@ class Tree:
 
         """
 
-        def _recursive_children(node: Tree, _descendants: Optional[List[Tree]] = None):
-            if _descendants is None:
-                _descendants = []
-            else:
-                _descendants.append(node)
-
-            for c in node.children:
-                _recursive_children(c, _descendants)
-
-            return _descendants
+        descendants = []
+        # Iterative preorder traversal, so push children in reverse order
+        stack = list(reversed(self.children))
+        while stack:
+            tree = stack.pop()
+            descendants.append(tree)
+            stack.extend(reversed(tree.children))
+
+        return [self] + descendants if include_self else descendants
+
+    def clone(self, doc: Sentence) -> Tree:
+        """Copy the structure of this tree onto the words of another sentence with the same word ids, e.g. a clone of
+        the sentence of this tree. The copy does not contain edit operations.
+        :param doc: the sentence whose words become the nodes of the copy
+        :return: the copied tree
+        """
+        words = {word.id: word for word in doc}
+        nodes = [
+            (words[tree.node.id], tree.level, [words[child.node.id] for child in tree.children])
+            for tree in self.subtrees()
+        ]
 
-        if include_self:
-            return [self] + _recursive_children(self)
-        else:
-            return _recursive_children(self)
+        return self._from_preorder(nodes, doc)
 
     def attach_self_to_children(self):
         for subtree in self.children:
@@ -179,37 +241,60 @@ class Tree:
 
         wrappers = wrappers if wrappers else [None] * len(attrs)
 
-        def build_str(tree: Tree, is_last_child: bool = True):
-            s = start_parens
-            s += (
-                tree.node
-                if isinstance(tree.node, str)
-                else attrs_sep.join(
-                    [
-                        f"{w[0]}{getattr(tree.node, a)}{w[1]}" if w else str(getattr(tree.node, a))
-                        for a, w in zip(attrs, wrappers)
-                    ]
-                )
+        def node_str(tree: Tree) -> str:
+            if isinstance(tree.node, str):
+                return tree.node
+
+            return attrs_sep.join(
+                [
+                    f"{w[0]}{getattr(tree.node, a)}{w[1]}" if w else str(getattr(tree.node, a))
+                    for a, w in zip(attrs, wrappers)
+                ]
             )
-            s += " "
-            n_children = len(tree.children)
 
-            for child_idx, child in enumerate(tree.children, 1):
-                s += f"\n{indent * child.level}" if pretty else ""
-                s += build_str(child, is_last_child=child_idx == n_children)
+        # Iterative traversal: the stack contains either (tree, is_last_child) tuples that still need to be
+        # processed, or strings (whitespace and closing parentheses) that can be added as-is
+        parts = []
+        stack = [(self, True)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
 
-            s += f"\n{indent * tree.level}" if pretty and end_on_newline and tree.children else ""
-            s += end_parens
-            s += node_sep if not is_last_child else ""
-            return s
+            tree, is_last_child = item
+            parts.append(f"{start_parens}{node_str(tree)} ")
 
-        return build_str(self)
+            closing = f"\n{indent * tree.level}" if pretty and end_on_newline and tree.children else ""
+            closing += end_parens
+            closing += node_sep if not is_last_child else ""
+            stack.append(closing)
 
-    def get_distance(self, tgt_tree: Tree, config: Optional[AstredConfig] = None) -> Tuple[int, List[Tuple[Tree]]]:
-        """Calculate the distance between self and target tree.
+            n_children = len(tree.children)
+            for child_idx in range(n_children, 0, -1):
+                child = tree.children[child_idx - 1]
+                stack.append((child, child_idx == n_children))
+                if pretty:
+                    stack.append(f"\n{indent * child.level}")
+
+        return "".join(parts)
+
+    def get_distance(
+        self, tgt_tree: Tree, config: Optional[AstredConfig] = None, reference: bool = False
+    ) -> Tuple[int, List[Tuple[Tree]]]:
+        """Calculate the distance between self and target tree. By default, the built-in tree edit distance engine
+        (see :mod:`astred.ted`) is used, which works on flat arrays with integer labels. With ``reference=True``, the
+        ``apted`` package is used instead. Both return the same distance and edit mapping.
+        :param tgt_tree: the tree to compare with
+        :param config: the configuration that contains the attribute to compare and the costs of the operations
+        :param reference: whether to use the (slower) ``apted`` package
         :return: the tree edit distance for the given trees and the required operations
         """
         config = AstredConfig() if config is None else config
+
+        if not reference:
+            return tree_edit_distance(self, tgt_tree, config)
+
         apted = APTED(self, tgt_tree, config)
         dist = apted.compute_edit_distance()
         opts = apted.compute_edit_mapping()
@@ -226,27 +311,58 @@ class Tree:
                 f"A sentence must have exactly only root word to create a {cls.__name__}."
                 f" Currently {n_roots} are given."
             )
-        sent_root = sent_root[0]
-        return cls.from_span(sentence, sent_root, sentence)
+        # The root is taken from the sentence, so it does not need to be validated as an element of it
+        return cls._from_root(sentence.words, sent_root[0], sentence)
 
     @classmethod
     def from_span(cls, span: SpanMixin, span_root: Word, doc: Optional[Sentence] = None):
-        if span_root not in span:
+        # Compare by identity, because comparing words for equality compares all of their fields
+        if not any(word is span_root for word in span):
             raise ValueError("'span_root' must be an element of 'span'")
 
-        def get_children(head_idx: int):
-            return sorted([word for word in span if word.head == head_idx], key=attrgetter("id"))
-
-        def parse(root: Word, level: int = -1):
-            children = get_children(root.id)
-            level += 1
-            child_trees = [parse(n, level=level) for n in children] if children else []
-            return cls(root, children=child_trees, level=level, doc=doc)
+        return cls._from_root(span.words, span_root, doc)
 
-        return parse(span_root)
+    @classmethod
+    def _from_root(cls, words: List[Word], span_root: Word, doc: Optional[Sentence]) -> Tree:
+        """Build the tree of ``span_root`` from the heads of ``words``, which must contain ``span_root``. Each tree
+        is created once, and the root of all subtrees is set while building them.
+        """
+        # Index the children of every head in a single pass over the span. Spans are usually ordered by ID already,
+        # in which case the children are sorted too
+        children_by_head = {}
+        is_sorted = True
+        prev_id = 0
+        for word in words:
+            if word.id < prev_id:
+                is_sorted = False
+            prev_id = word.id
+            if word.head in children_by_head:
+                children_by_head[word.head].append(word)
+            else:
+                children_by_head[word.head] = [word]
+        if not is_sorted:
+            for children in children_by_head.values():
+                children.sort(key=attrgetter("id"))
+
+        # Collect all nodes in preorder together with their level, so that the trees can be built bottom-up
+        # (children must exist before their parent) without recursion
+        nodes = []
+        stack = [(span_root, 0)]
+        while stack:
+            word, level = stack.pop()
+            children = children_by_head.get(word.id)
+            nodes.append((word, level, children))
+            if children:
+                stack.extend([(child, level + 1) for child in children])
+
+        return cls._from_preorder(nodes, doc)
 
     @classmethod
     def draw_trees(cls, *trees, **to_string_kwargs):
+        # nltk's drawing module loads tkinter, so only import it when it is needed
+        from nltk.draw.tree import draw_trees
+        from nltk.tree import ParentedTree as NltkTree
+
         strings = [tree.to_string(**to_string_kwargs) for tree in trees]
         nltk_trees = [NltkTree.fromstring(s) for s in strings]
 
@@ -1,69 +1,125 @@
+from __future__ import annotations
+
 import logging
-from typing import Generator, List, Optional, Union
+import sys
+from dataclasses import MISSING, fields
+from functools import update_wrapper
+from importlib.util import find_spec
+from itertools import combinations
+from typing import TYPE_CHECKING, Any, Generator, Iterable, List, Optional, Tuple, Union
 
 from packaging import version
 
 
+if TYPE_CHECKING:
+    from spacy.tokens import Doc as SpacyDoc
+    from spacy.vocab import Vocab as SpacyVocab
+
+
 logger = logging.getLogger("astred")
 
 
-try:
-    import stanza
-    from stanza import Pipeline as StanzaPipeline
+def _is_installed(module_name: str) -> bool:
+    """Check whether a module can be imported, without actually importing it (which can be slow for large packages)."""
+    try:
+        return find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
 
-    STANZA_AVAILABLE = True
-except (ImportError, AttributeError):
-    STANZA_AVAILABLE = False
 
-try:
-    import spacy
+def _spacy_version_ok() -> bool:
+    try:
+        from importlib.metadata import PackageNotFoundError
+        from importlib.metadata import version as get_version
+    except ImportError:
+        # Python 3.7: the version is verified when spaCy is imported in load_parser
+        return True
 
-    if version.parse(spacy.__version__) >= version.parse("3.0"):
-        from spacy.language import Language as SpacyLanguage
+    try:
+        spacy_version = get_version("spacy")
+    except PackageNotFoundError:
+        return True
+
+    if version.parse(spacy_version) < version.parse("3.0"):
+        logger.warning(f"spaCy {spacy_version} is installed but at least version 3.0 is required")
+        return False
+
+    return True
+
+
+# The parsers are only imported when they are used, so these only check whether they are installed
+STANZA_AVAILABLE = _is_installed("stanza")
+SPACY_AVAILABLE = _is_installed("spacy") and _spacy_version_ok()
+
+
+def resolve_parser_name(parser: Optional[str] = None) -> Optional[str]:
+    """Get the type of parser that :func:`load_parser` uses: the given one, or stanza or spaCy (in that order of
+    preference) if none is given.
+    :param parser: "stanza", "spacy" or None
+    :return: "stanza", "spacy" or None if no parser is given and neither is installed
+    """
+    if parser is not None:
+        return parser
+    elif STANZA_AVAILABLE:
+        return "stanza"
+    elif SPACY_AVAILABLE:
+        return "spacy"
+    else:
+        return None
+
+
+def is_instance_of(obj: Any, module_name: str, class_name: str) -> bool:
+    """Check whether an object is an instance of a class from an optional dependency without importing that
+    dependency. If the module has not been imported (yet), the object cannot be an instance of one of its classes.
+    :param obj: the object to check
+    :param module_name: the full name of the module that contains the class, e.g. "spacy.tokens.doc"
+    :param class_name: the name of the class, e.g. "Doc"
+    :return: whether the object is an instance of the given class
+    """
+    module = sys.modules.get(module_name)
+    return module is not None and isinstance(obj, getattr(module, class_name))
+
+
+class SpacyPretokenizedTokenizer:
+    """Custom tokenizer to be used in spaCy when the text is already pretokenized."""
+
+    def __init__(self, vocab: SpacyVocab):
+        """Initialize tokenizer with a given vocab
+        :param vocab: an existing vocabulary (see https://spacy.io/api/vocab)
+        """
+        self.vocab = vocab
+
+    def __call__(self, inp: Union[List[str], str]) -> SpacyDoc:
+        """Call the tokenizer on input `inp`.
+        :param inp: either a string to be split on whitespace, or a list of tokens
+        :return: the created Doc object
+        """
         from spacy.tokens import Doc as SpacyDoc
-        from spacy.util import get_installed_models
-        from spacy.vocab import Vocab as SpacyVocab
 
-        SPACY_AVAILABLE = True
-    else:
-        logger.warning(f"spaCy {spacy.__version__} is installed but at least version 3.0 is required")
-        raise ImportError
-except ImportError:
-    SPACY_AVAILABLE = False
-
-if SPACY_AVAILABLE:
-
-    class SpacyPretokenizedTokenizer:
-        """Custom tokenizer to be used in spaCy when the text is already pretokenized."""
-
-        def __init__(self, vocab: SpacyVocab):
-            """Initialize tokenizer with a given vocab
-            :param vocab: an existing vocabulary (see https://spacy.io/api/vocab)
-            """
-            self.vocab = vocab
-
-        def __call__(self, inp: Union[List[str], str]) -> SpacyDoc:
-            """Call the tokenizer on input `inp`.
-            :param inp: either a string to be split on whitespace, or a list of tokens
-            :return: the created Doc object
-            """
-            if isinstance(inp, str):
-                words = inp.split()
-                spaces = [True] * (len(words) - 1) + ([True] if inp[-1].isspace() else [False])
-                return SpacyDoc(self.vocab, words=words, spaces=spaces)
-            elif isinstance(inp, list):
-                return SpacyDoc(self.vocab, words=inp)
-            else:
-                raise ValueError(
-                    "Unexpected input format. Expected string to be split on whitespace, or list of tokens."
-                )
+        if isinstance(inp, str):
+            words = inp.split()
+            spaces = [True] * (len(words) - 1) + ([True] if inp[-1].isspace() else [False])
+            return SpacyDoc(self.vocab, words=words, spaces=spaces)
+        elif isinstance(inp, list):
+            return SpacyDoc(self.vocab, words=inp)
+        else:
+            raise ValueError("Unexpected input format. Expected string to be split on whitespace, or list of tokens.")
+
+
+def spacy_prevent_sbd(doc: SpacyDoc):
+    """Disables spaCy's sentence boundary detection."""
+    for token in doc:
+        token.is_sent_start = False
+    return doc
 
-    @SpacyLanguage.component("prevent_sbd")
-    def spacy_prevent_sbd(doc: SpacyDoc):
-        """Disables spaCy's sentence boundary detection."""
-        for token in doc:
-            token.is_sent_start = False
-        return doc
+
+def register_spacy_components():
+    """Register the custom spaCy components of this library. This is done when a spaCy parser is loaded rather than
+    on import, so that spaCy does not need to be imported when it is not used."""
+    from spacy.language import Language as SpacyLanguage
+
+    if not SpacyLanguage.has_factory("prevent_sbd"):
+        SpacyLanguage.component("prevent_sbd", func=spacy_prevent_sbd)
 
 
 def unique_list(groups: List):
@@ -99,6 +155,107 @@ def rebase_to_idxs(idxs: List[int]):
     return [l_sort.index(x) for x in idxs]
 
 
+def count_inversions(values: List[int]) -> Tuple[int, List[int]]:
+    """Count the inversions in a list of values, i.e. the pairs of positions i < j for which values[j] < values[i].
+    Uses two passes over a Fenwick tree (binary indexed tree) so that this runs in O(n log n).
+    :param values: a list of (comparable) values, e.g. the target indices of alignments sorted by source index
+    :return: a tuple of (i) the total number of inversions; (ii) a list that contains for every position the number
+    of inversions that the item on that position is involved in
+    """
+    n_values = len(values)
+    ranks = {value: rank for rank, value in enumerate(sorted(set(values)), 1)}
+    n_ranks = len(ranks)
+    per_item = [0] * n_values
+    total = 0
+
+    def update(tree: List[int], rank: int):
+        while rank <= n_ranks:
+            tree[rank] += 1
+            rank += rank & -rank
+
+    def query(tree: List[int], rank: int) -> int:
+        # Number of values seen so far that have a rank <= the given rank
+        count = 0
+        while rank > 0:
+            count += tree[rank]
+            rank -= rank & -rank
+        return count
+
+    # Left to right: how many of the preceding values are larger than the current one
+    tree = [0] * (n_ranks + 1)
+    for idx, value in enumerate(values):
+        rank = ranks[value]
+        n_larger = idx - query(tree, rank)
+        per_item[idx] += n_larger
+        total += n_larger
+        update(tree, rank)
+
+    # Right to left: how many of the following values are smaller than the current one
+    tree = [0] * (n_ranks + 1)
+    for idx in range(n_values - 1, -1, -1):
+        rank = ranks[values[idx]]
+        per_item[idx] += query(tree, rank - 1)
+        update(tree, rank)
+
+    return total, per_item
+
+
+def count_inversions_naive(values: List[int]) -> Tuple[int, List[int]]:
+    """Reference implementation of :func:`count_inversions` that compares all combinations of positions in O(n^2).
+    :param values: a list of (comparable) values
+    :return: a tuple of the total number of inversions and the number of inversions per position
+    """
+    per_item = [0] * len(values)
+    total = 0
+    for idx1, idx2 in combinations(range(len(values)), 2):
+        if values[idx2] < values[idx1]:
+            total += 1
+            per_item[idx1] += 1
+            per_item[idx2] += 1
+
+    return total, per_item
+
+
+def prefix_sums(values: List[int]) -> List[int]:
+    """Cumulative sums of a list of values (or booleans), starting with 0, so that the sum of values[i:j] is
+    sums[j] - sums[i].
+    :param values: a list of numbers or booleans
+    :return: a list of the cumulative sums, which is one item longer than the given values
+    """
+    sums = [0]
+    for value in values:
+        sums.append(sums[-1] + value)
+    return sums
+
+
+def connected_components(n_items: int, edges: Iterable[Tuple[int, int]]) -> List[int]:
+    """Find the connected components of a graph with union-find (disjoint sets with union by size and path halving),
+    which runs in near-linear time and, unlike a recursive search, does not depend on the size of the components.
+    :param n_items: the number of items (nodes), which are identified by their index
+    :param edges: pairs of item indices that are connected
+    :return: for every item, the index of the representative item of its component
+    """
+    parent = list(range(n_items))
+    size = [1] * n_items
+
+    def find(item: int) -> int:
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    for item1, item2 in edges:
+        root1, root2 = find(item1), find(item2)
+        if root1 == root2:
+            continue
+        if size[root1] < size[root2]:
+            root1, root2 = root2, root1
+        parent[root2] = root1
+        size[root1] += size[root2]
+
+    return [find(item) for item in range(n_items)]
+
+
 def pair_combs(all_pairs: List, min_length: int = 2) -> Generator[List, None, None]:
     n_pairs = len(all_pairs)
     for i in range(n_pairs, min_length - 1, -1):
@@ -120,6 +277,14 @@ def load_parser(
 ):
     try:
         if parser == "spacy":
+            import spacy
+            from spacy.util import get_installed_models
+
+            if version.parse(spacy.__version__) < version.parse("3.0"):
+                raise ImportError(f"spaCy {spacy.__version__} is installed but at least version 3.0 is required")
+
+            register_spacy_components()
+
             if use_gpu:
                 spacy.prefer_gpu()  # Only use GPU if it is available
             else:
@@ -149,6 +314,9 @@ def load_parser(
                 # It is still possible that the dependency parser leads to segmentation, disable
                 nlp.add_pipe("prevent_sbd", name="prevent-sbd", before="parser")
         elif parser == "stanza":
+            import stanza
+            from stanza import Pipeline as StanzaPipeline
+
             if auto_download:
                 stanza.download(model_or_lang, verbose=False)
             nlp = StanzaPipeline(
@@ -198,3 +366,47 @@ except (ImportError, AttributeError):
                 cached = self.fget(obj)
                 setattr(obj, attr, cached)
             return cached
+
+
+def add_slots(cls):
+    """Class decorator that recreates a dataclass with ``__slots__`` for its fields, so that its instances do not
+    carry a ``__dict__``. This is similar to ``dataclass(slots=True)``, which is only available from Python 3.10
+    onwards. It must be applied on top of ``@dataclass``. Fields that are already slots of a base class are not added
+    again. Note that subclasses also need to define ``__slots__`` (e.g. an empty tuple) to avoid a ``__dict__``.
+    """
+    inherited_slots = set()
+    for base in cls.__mro__[1:]:
+        base_slots = getattr(base, "__slots__", ())
+        inherited_slots.update([base_slots] if isinstance(base_slots, str) else base_slots)
+
+    field_names = tuple(f.name for f in fields(cls) if f.name not in inherited_slots)
+
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    # Default values are stored as class attributes, which would conflict with the slots. The generated __init__
+    # already contains the defaults
+    for field_name in field_names:
+        cls_dict.pop(field_name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    # The generated __init__ does not set fields with init=False and a plain default (it relies on the class
+    # attribute instead), so set those before calling the original __init__ (and therefore __post_init__)
+    init_defaults = tuple((f.name, f.default) for f in fields(cls) if not f.init and f.default is not MISSING)
+    if init_defaults:
+        # This runs for every instance, so (like dataclasses itself) generate a function with one assignment per field
+        # rather than looping over the fields. Simple defaults are inlined as literals
+        namespace = {"original_init": cls_dict["__init__"]}
+        lines = ["def __init__(self, *args, **kwargs):"]
+        for idx, (field_name, default) in enumerate(init_defaults):
+            if default is None or isinstance(default, (bool, int, str)):
+                lines.append(f"    self.{field_name} = {default!r}")
+            else:
+                namespace[f"default_{idx}"] = default
+                lines.append(f"    self.{field_name} = default_{idx}")
+        lines.append("    original_init(self, *args, **kwargs)")
+        exec("\n".join(lines), namespace)
+
+        cls_dict["__init__"] = update_wrapper(namespace["__init__"], namespace["original_init"])
+
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .utils import prefix_sums
+
+
+def _sparse_table(values: List[int], func: Callable[[int, int], int]) -> List[List[int]]:
+    """Build a sparse table so that the minimum or maximum (``func``) of any range of ``values`` can be retrieved in
+    constant time. Level k of the table contains the result for all ranges of length 2**k.
+    """
+    table = [list(values)]
+    width = 1
+    while 2 * width <= len(values):
+        prev = table[-1]
+        table.append([func(prev[idx], prev[idx + width]) for idx in range(len(values) - 2 * width + 1)])
+        width *= 2
+
+    return table
+
+
+class SequenceWindows:
+    """Precomputed tables over a list of (src_id, tgt_id) alignments, sorted by source and target index, to find
+    sequence groups. A sequence group is a contiguous window of alignments for which (i) the source and target
+    indices are consecutive; (ii) none of the involved words are aligned with words outside of the group; (iii)
+    there are no internal crosses, unless the group is a multi-word group (MWG) and MWGs are allowed. A MWG is a
+    group of more than one source and target word in which all source words are aligned with all target words.
+
+    Every window can be checked in constant time by means of prefix sums and range min/max tables over source and
+    target positions, rather than by building sets of indices for each window. Alignments with NULL (index 0) can
+    never be part of a window.
+    """
+
+    def __init__(self, idx_pairs: Sequence[Tuple[int, int]], allow_mwg: bool = True):
+        """
+        :param idx_pairs: a list of (src_id, tgt_id) tuples, sorted by source and target index. For every word that
+        occurs in this list, all of its alignments must be part of the list
+        :param allow_mwg: whether groups with internal crosses are allowed when they are multi-word groups
+        """
+        self.allow_mwg = allow_mwg
+        self.src = src = [pair[0] for pair in idx_pairs]
+        self.tgt = tgt = [pair[1] for pair in idx_pairs]
+        self.n_pairs = n_pairs = len(idx_pairs)
+        self.is_null = [s == 0 or t == 0 for s, t in zip(src, tgt)]
+
+        # Alignments are sorted by source index, so all alignments of a source word form a block
+        self.is_block_start = [idx == 0 or src[idx] != src[idx - 1] for idx in range(n_pairs)]
+        self.is_block_end = [idx == n_pairs - 1 or src[idx] != src[idx + 1] for idx in range(n_pairs)]
+        self.n_blocks = prefix_sums(self.is_block_start)
+
+        # For every alignment, the first and last position of all alignments of its target word
+        first_pos: Dict[int, int] = {}
+        last_pos: Dict[int, int] = {}
+        for idx, tgt_id in enumerate(tgt):
+            first_pos.setdefault(tgt_id, idx)
+            last_pos[tgt_id] = idx
+        self.n_tgt_first = prefix_sums([first_pos[tgt_id] == idx for idx, tgt_id in enumerate(tgt)])
+        self.tgt_first_min = _sparse_table([first_pos[tgt_id] for tgt_id in tgt], min)
+        self.tgt_last_max = _sparse_table([last_pos[tgt_id] for tgt_id in tgt], max)
+        self.tgt_min = _sparse_table(tgt, min)
+        self.tgt_max = _sparse_table(tgt, max)
+
+        # A descent at idx means that the next target index is smaller, i.e. that those two alignments cross
+        descents = [tgt[idx + 1] < tgt[idx] for idx in range(n_pairs - 1)]
+        self.n_descents = prefix_sums(descents)
+        # Duplicate alignments do not count towards the number of distinct alignments in an MWG
+        self.n_duplicates = prefix_sums(
+            [idx > 0 and src[idx] == src[idx - 1] and tgt[idx] == tgt[idx - 1] for idx in range(n_pairs)]
+        )
+
+        # Number of alignments, starting at a position, without a descent (i.e. without internal crosses)
+        self.run_length = [1] * n_pairs
+        for idx in range(n_pairs - 2, -1, -1):
+            if not descents[idx]:
+                self.run_length[idx] = self.run_length[idx + 1] + 1
+
+        # A valid window with internal crosses must be an MWG, so all of its source words must be aligned with the
+        # same target words. For every block start, find the end of the run of blocks that share target words
+        self.mwg_ends: Dict[int, int] = {}
+        blocks = [idx for idx in range(n_pairs) if self.is_block_start[idx]]
+        block_tgts = [tuple(dict.fromkeys(tgt[start : self._block_end(start) + 1])) for start in blocks]
+        end = None
+        for block_idx in range(len(blocks) - 1, -1, -1):
+            start = blocks[block_idx]
+            if (
+                block_idx == len(blocks) - 1
+                or block_tgts[block_idx] != block_tgts[block_idx + 1]
+                or src[blocks[block_idx + 1]] != src[start] + 1
+            ):
+                end = self._block_end(start) + 1
+            self.mwg_ends[start] = end
+
+    def _block_end(self, start: int) -> int:
+        idx = start
+        while not self.is_block_end[idx]:
+            idx += 1
+        return idx
+
+    @staticmethod
+    def _query(table: List[List[int]], start: int, end: int, func: Callable[[int, int], int]) -> int:
+        level = (end - start).bit_length() - 1
+        return func(table[level][start], table[level][end - (1 << level)])
+
+    def check(self, start: int, end: int) -> Tuple[bool, bool]:
+        """Check whether the window of alignments [start, end) is a valid sequence group. The window must not
+        contain any NULL alignments.
+        :param start: the (inclusive) start position of the window
+        :param end: the (exclusive) end position of the window
+        :return: a tuple of booleans indicating whether (i) the window is a valid sequence group; (ii) it is a MWG.
+        When the window is not valid, it is never reported as a MWG
+        """
+        last = end - 1
+        # All alignments of the first and last source word must be part of the window
+        if not (self.is_block_start[start] and self.is_block_end[last]):
+            return False, False
+
+        has_internal_cross = self.n_descents[last] - self.n_descents[start] > 0
+        if has_internal_cross and not self.allow_mwg:
+            return False, False
+
+        # All alignments of the target words must be part of the window
+        if (
+            self._query(self.tgt_first_min, start, end, min) < start
+            or self._query(self.tgt_last_max, start, end, max) > last
+        ):
+            return False, False
+
+        # Source and target indices must be consecutive
+        n_src = self.n_blocks[end] - self.n_blocks[start]
+        if self.src[last] - self.src[start] + 1 != n_src:
+            return False, False
+
+        n_tgt = self.n_tgt_first[end] - self.n_tgt_first[start]
+        if self._query(self.tgt_max, start, end, max) - self._query(self.tgt_min, start, end, min) + 1 != n_tgt:
+            return False, False
+
+        n_distinct = (end - start) - (self.n_duplicates[end] - self.n_duplicates[start + 1])
+        is_mwg = n_src > 1 and n_tgt > 1 and n_distinct == n_src * n_tgt
+
+        if has_internal_cross and not is_mwg:
+            return False, False
+
+        return True, is_mwg
+
+    def id_ranges(self, start: int, end: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Get the smallest and largest source and target index in the window of alignments [start, end). For valid
+        windows, these are the boundaries of the consecutive source and target indices.
+        :param start: the (inclusive) start position of the window
+        :param end: the (exclusive) end position of the window
+        :return: a tuple of (first, last) source indices and a tuple of (first, last) target indices
+        """
+        return (
+            (self.src[start], self.src[end - 1]),
+            (self._query(self.tgt_min, start, end, min), self._query(self.tgt_max, start, end, max)),
+        )
+
+    def select(
+        self, accept: Optional[Callable[[int, int, bool], bool]] = None, min_length: int = 2
+    ) -> List[Tuple[int, int, bool]]:
+        """Greedily select non-overlapping valid windows, starting with the largest ones and from left to right
+        for windows of the same size. This is the same order as :func:`utils.pair_combs`. Rather than checking all
+        windows, only windows without internal crosses and potential MWGs are considered, and only in the parts of
+        the list that are not yet covered by a selected window.
+        :param accept: an optional function that is called with (start, end, is_mwg) for every valid window and
+        that returns whether that window should be selected
+        :param min_length: the minimal number of alignments in a window
+        :return: a list of (start, end, is_mwg) tuples of the selected windows, in order of selection
+        """
+        # Free segments are the maximal parts of the list that do not contain any NULL alignments
+        segments = []
+        seg_start = None
+        for idx in range(self.n_pairs + 1):
+            if idx < self.n_pairs and not self.is_null[idx]:
+                seg_start = idx if seg_start is None else seg_start
+            elif seg_start is not None:
+                segments.append((seg_start, idx))
+                seg_start = None
+
+        starts_by_run_length = defaultdict(list)
+        for start, run_length in enumerate(self.run_length):
+            starts_by_run_length[min(run_length, self.n_pairs)].append(start)
+
+        mwg_starts_by_length = defaultdict(list)
+        if self.allow_mwg:
+            for start, end in self.mwg_ends.items():
+                if end - start > self.run_length[start]:
+                    mwg_starts_by_length[end - start].append(start)
+
+        selected = []
+        # Starts of windows without internal crosses of at least the current length
+        active = []
+        max_length = max([seg_end - seg_start for seg_start, seg_end in segments], default=0)
+        for length in range(self.n_pairs, min_length - 1, -1):
+            for start in starts_by_run_length.get(length, []):
+                insort(active, start)
+
+            if length > max_length:
+                continue
+
+            starts = active
+            if length in mwg_starts_by_length:
+                starts = sorted(set(active).union(mwg_starts_by_length[length]))
+
+            new_segments = []
+            for seg_start, seg_end in segments:
+                idx = bisect_left(starts, seg_start)
+                while idx < len(starts) and starts[idx] + length <= seg_end:
+                    start = starts[idx]
+                    end = start + length
+                    is_valid, is_mwg = self.check(start, end)
+                    if is_valid and (accept is None or accept(start, end, is_mwg)):
+                        selected.append((start, end, is_mwg))
+                        new_segments.append((seg_start, start))
+                        seg_start = end
+                        idx = bisect_left(starts, seg_start)
+                    else:
+                        idx += 1
+                new_segments.append((seg_start, seg_end))
+
+            segments = [
+                (seg_start, seg_end) for seg_start, seg_end in new_segments if seg_end - seg_start >= min_length
+            ]
+            max_length = max([seg_end - seg_start for seg_start, seg_end in segments], default=0)
+            if not segments:
+                break
+
+        return selected
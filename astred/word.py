@@ -1,23 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
 
 from .base import Crossable
-from .utils import SPACY_AVAILABLE, STANZA_AVAILABLE
+from .utils import add_slots
 
 
 if TYPE_CHECKING:
+    from spacy.tokens.token import Token as SpacyToken
+    from stanza.models.common.doc import Word as StanzaWord
+
     from .span import Span, SpanPair
     from .tree import Tree
 
-    if SPACY_AVAILABLE:
-        from spacy.tokens.token import Token as SpacyToken
-
-    if STANZA_AVAILABLE:
-        from stanza.models.common.doc import Word as StanzaWord
-
 
+@add_slots
 @dataclass(repr=False)
 class Word(Crossable):
     text: str = field(repr=False, default=None)
@@ -35,8 +33,7 @@ class Word(Crossable):
     id_in_sacr_group: int = field(default=None, init=False, compare=False, repr=False)
 
     tree: Tree = field(default=None, init=False, compare=False, repr=False)
-    connected: List[Word] = field(default_factory=list, init=False, repr=False)
-    connected_repr: str = field(default=None, init=False, repr=False)
+    connected_group: ConnectedGroup = field(default=None, init=False, compare=False, repr=False)
 
     _word: Any = field(default=None, repr=False)
 
@@ -48,6 +45,19 @@ class Word(Crossable):
     def is_root_in_sacr_group(self) -> bool:
         return self.sacr_group.root is self
 
+    @property
+    def connected(self) -> List[Word]:
+        """All words that this word is connected with through word alignments, directly or indirectly, excluding
+        the word itself. Derived from the shared :class:`ConnectedGroup` rather than stored per word."""
+        if self.connected_group is None:
+            return []
+
+        return [word for word in self.connected_group.words if word is not self]
+
+    @property
+    def connected_repr(self) -> Optional[str]:
+        return self.connected_group.connected_repr if self.connected_group is not None else None
+
     def __post_init__(self):
         super(Word, self).__post_init__()
         if self.is_null and not isinstance(self, Null):
@@ -55,6 +65,55 @@ class Word(Crossable):
         elif not self.is_null and isinstance(self, Null):
             raise ValueError(f"{Null.__name__} words must be set to is_null=True")
 
+    @classmethod
+    def _from_valid_fields(
+        cls, id: int, text: str, lemma: str, head: int, deprel: str, upos: str, xpos: str, feats: str
+    ) -> Word:
+        """Create a word like ``__init__`` does, but without validating it, for words with a positive ``id`` that are
+        created in bulk (see :func:`astred.io.read_conllu`). This skips the overhead of the generated ``__init__`` and
+        ``__post_init__``, which dominates the time to create the words of many sentences. All fields must be set
+        here, because the instance is created without ``__init__``.
+        """
+        word = cls.__new__(cls)
+        word.id = id
+        word.doc = None
+        word.aligned = []
+        word.aligned_cross = {}
+        word.is_null = False
+        word.text = text
+        word.lemma = lemma
+        word.head = head
+        word.deprel = deprel
+        word.upos = upos
+        word.xpos = xpos
+        word.feats = feats
+        word.seq_group = None
+        word.id_in_seq_group = None
+        word.sacr_group = None
+        word.id_in_sacr_group = None
+        word.tree = None
+        word.connected_group = None
+        word._word = None
+
+        return word
+
+    def clone(self) -> Word:
+        """Create a copy of this word without its alignments, groups and tree. The token data is shared rather than
+        copied, including the parser object in ``_word``.
+        :return: the copy
+        """
+        return self.__class__(
+            id=self.id,
+            text=self.text,
+            lemma=self.lemma,
+            head=self.head,
+            deprel=self.deprel,
+            upos=self.upos,
+            xpos=self.xpos,
+            feats=self.feats,
+            _word=self._word,
+        )
+
     def changes(self, attr: str = "deprel") -> Dict[int, bool]:
         attr_val = getattr(self, attr)
         return (
@@ -104,9 +163,14 @@ class Word(Crossable):
 
 
 class Null(Word):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(id=0, text="[[NULL]]", is_null=True)
 
+    def clone(self) -> Null:
+        return self.__class__()
+
     def changes(self, attr: str = "deprel") -> None:
         return None
 
@@ -117,6 +181,17 @@ class Null(Word):
         return None
 
 
+@add_slots
+@dataclass(eq=False)
+class ConnectedGroup:
+    """A group of source and target words that are connected with each other through word alignments, directly or
+    indirectly. All words of the group refer to the same object (``Word.connected_group``).
+    """
+
+    words: List[Word] = field(default_factory=list, repr=False)
+    connected_repr: str = field(default=None)
+
+
 WordPair = NamedTuple("WordPair", [("src", Word), ("tgt", Word)])
 
 
@@ -0,0 +1,53 @@
+"""Measure how long it takes to import astred in a fresh interpreter, and check that this stays within a budget and
+that none of the heavy optional dependencies are imported on the way.
+
+Usage:
+    python benchmarks/import_time.py --budget 0.5 --repeats 5
+"""
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+
+
+# Optional dependencies that should only be imported when they are actually used
+HEAVY_MODULES = ("torch", "awesome_align", "stanza", "spacy", "nltk", "tkinter")
+
+SNIPPET = f"""
+import json, sys, time
+start = time.perf_counter()
+import astred
+duration = time.perf_counter() - start
+print(json.dumps({{"duration": duration, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    """Import astred in a new Python process.
+    :return: a dictionary containing the import duration in seconds and the heavy modules that were imported
+    """
+    output = subprocess.run([sys.executable, "-c", SNIPPET], check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    cparser = ArgumentParser(description=__doc__.splitlines()[0])
+    cparser.add_argument("--budget", type=float, default=0.5, help="maximal median import time in seconds")
+    cparser.add_argument("--repeats", type=int, default=5, help="number of fresh interpreters to measure")
+    args = cparser.parse_args()
+
+    results = [measure_import() for _ in range(args.repeats)]
+    duration = median([result["duration"] for result in results])
+    heavy = sorted(set(module for result in results for module in result["heavy"]))
+
+    print(f"import astred: {duration:.3f}s (median of {args.repeats}, budget {args.budget:.3f}s)")
+    if heavy:
+        print(f"heavy modules imported: {', '.join(heavy)}")
+
+    if duration > args.budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Time every stage of AlignedSentences on synthetic sentence pairs of increasing length, and fit how each stage
+scales with the sentence length: the exponent k in time ~ length ** k. Stages are measured with astred.profiling.
+Results are written to JSON so that releases can be compared.
+
+Usage:
+    python benchmarks/scaling.py --output scaling.json
+    python benchmarks/scaling.py --output new.json --compare old.json
+"""
+import json
+import math
+import platform
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Dict, List, Optional
+
+
+# Benchmark the code in this repository rather than an installed version. The generator lives next to this script
+sys.path[:0] = [str(Path(__file__).resolve().parents[1]), str(Path(__file__).resolve().parent)]
+
+import astred  # noqa: E402
+from astred import AlignedSentences  # noqa: E402
+from astred.profiling import Profiler  # noqa: E402
+from synthetic import SHAPES, make_pair  # noqa: E402
+
+
+STAGES = ("copy", "word_aligns", "seq_spans", "sacr_spans", "connected", "ted")
+
+
+def fit_exponent(lengths: List[int], seconds: List[float]) -> Optional[float]:
+    """Fit the exponent k in seconds ~ length ** k with least squares on a log-log scale.
+    :param lengths: the sentence lengths
+    :param seconds: the time for every length
+    :return: the fitted exponent, or None if there are not enough (non-zero) measurements
+    """
+    points = [(math.log(length), math.log(secs)) for length, secs in zip(lengths, seconds) if secs > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def time_pair(length: int, shape: str, repeats: int, **pair_kwargs) -> Dict[str, float]:
+    """Time the stages of a synthetic pair.
+    :param length: number of words in both sentences
+    :param shape: the shape of both trees
+    :param repeats: number of measurements
+    :param pair_kwargs: other arguments for :func:`synthetic.make_pair`
+    :return: the median time of every stage in seconds
+    """
+    profiler = Profiler()
+    runs = []
+    # AlignedSentences does not modify its sentences, so one pair can be reused and only AlignedSentences is timed
+    src, tgt, aligns = make_pair(length, shape, **pair_kwargs)
+    for _ in range(repeats):
+        start = perf_counter()
+        AlignedSentences(src, tgt, aligns, profiler=profiler)
+        total = perf_counter() - start
+        runs.append({**{stage: record.seconds for stage, record in profiler.last_pair.items()}, "total": total})
+
+    return {stage: median(run[stage] for run in runs) for stage in STAGES + ("total",)}
+
+
+def run(lengths: List[int], shapes: List[str], repeats: int, **pair_kwargs) -> Dict:
+    results = {}
+    for shape in shapes:
+        timings = [time_pair(length, shape, repeats, **pair_kwargs) for length in lengths]
+        results[shape] = {
+            stage: {
+                "seconds": [timing[stage] for timing in timings],
+                "exponent": fit_exponent(lengths, [timing[stage] for timing in timings]),
+            }
+            for stage in STAGES + ("total",)
+        }
+
+    return {
+        "meta": {
+            "astred_version": astred.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "lengths": lengths,
+            "repeats": repeats,
+            **pair_kwargs,
+        },
+        "results": results,
+    }
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None):
+    lengths = report["meta"]["lengths"]
+    for shape, stages in report["results"].items():
+        print(f"{shape} (lengths {lengths[0]}-{lengths[-1]})")
+        for stage, result in stages.items():
+            exponent = result["exponent"]
+            line = f"  {stage:<12} {result['seconds'][-1] * 1000:10.2f} ms"
+            line += f"  exponent {exponent:5.2f}" if exponent is not None else "  exponent   n/a"
+
+            if baseline is not None:
+                try:
+                    base = baseline["results"][shape][stage]
+                    line += f"  | {result['seconds'][-1] / base['seconds'][-1]:5.2f}x baseline"
+                    if exponent is not None and base["exponent"] is not None:
+                        line += f" (exponent {exponent - base['exponent']:+.2f})"
+                except (KeyError, ZeroDivisionError):
+                    pass
+            print(line)
+
+
+def main():
+    cparser = ArgumentParser(description=__doc__.splitlines()[0])
+    cparser.add_argument("--lengths", default="5,10,20,50,100,200,500", help="comma-separated sentence lengths")
+    cparser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated tree shapes")
+    cparser.add_argument("--density", type=float, default=1.0, help="fraction of one-to-one links that is kept")
+    cparser.add_argument("--crossing", type=float, default=0.1, help="probability of swapping adjacent targets")
+    cparser.add_argument("--mwg", type=float, default=0.05, help="probability of a many-to-many block")
+    cparser.add_argument("--seed", type=int, default=0, help="seed of the alignment generator")
+    cparser.add_argument("--repeats", type=int, default=3, help="number of measurements per length")
+    cparser.add_argument("--output", help="JSON file to write the results to")
+    cparser.add_argument("--compare", help="JSON file with earlier results to compare with")
+    args = cparser.parse_args()
+
+    report = run(
+        [int(length) for length in args.lengths.split(",")],
+        args.shapes.split(","),
+        args.repeats,
+        density=args.density,
+        crossing=args.crossing,
+        mwg=args.mwg,
+        seed=args.seed,
+    )
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    print_report(report, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
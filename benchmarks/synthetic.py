@@ -0,0 +1,103 @@
+"""Deterministic generator of synthetic sentence pairs, so that benchmarks measure the same inputs on every run and
+every machine. The length, tree shape, alignment density, crossing rate and the number of many-to-many (MWG) blocks
+can be controlled.
+"""
+from random import Random
+from typing import List, Tuple
+
+from astred import Sentence, Word
+
+
+SHAPES = ("chain", "flat", "balanced")
+
+
+def make_heads(length: int, shape: str = "balanced") -> List[int]:
+    """Create the heads of a dependency tree with a given shape. Word IDs start at 1 and 0 is the head of the root.
+    :param length: number of words
+    :param shape: "chain" (every word is the head of the next one), "flat" (the first word is the head of all others)
+    or "balanced" (a complete binary tree)
+    :return: the head of every word
+    """
+    if shape == "chain":
+        return [idx - 1 for idx in range(1, length + 1)]
+    elif shape == "flat":
+        return [0] + [1] * (length - 1)
+    elif shape == "balanced":
+        return [idx // 2 for idx in range(1, length + 1)]
+    else:
+        raise ValueError(f"'shape' must be one of {', '.join(SHAPES)} ({shape} given)")
+
+
+def make_sentence(length: int, shape: str = "balanced", prefix: str = "w") -> Sentence:
+    """Create a sentence with a dependency tree of a given shape.
+    :param length: number of words
+    :param shape: the shape of the tree, see :func:`make_heads`
+    :param prefix: prefix of the text of every word
+    :return: the created sentence
+    """
+    return Sentence(
+        [
+            Word(id=idx, text=f"{prefix}{idx}", head=head, deprel="root" if head == 0 else f"dep{idx % 4}", upos="X")
+            for idx, head in enumerate(make_heads(length, shape), 1)
+        ]
+    )
+
+
+def make_aligns(
+    length: int, density: float = 1.0, crossing: float = 0.1, mwg: float = 0.0, seed: int = 0
+) -> List[Tuple[int, int]]:
+    """Create zero-based word alignments between two sentences of the same length. Starting from a monotone one-to-one
+    alignment, adjacent target positions are swapped to introduce crossings, two-by-two blocks are fully aligned to
+    create many-to-many groups and finally links are dropped to reach the alignment density.
+    :param length: number of words in both sentences
+    :param density: fraction of one-to-one links that is kept
+    :param crossing: probability that a target position is swapped with the next one
+    :param mwg: probability that a position starts a fully aligned two-by-two block
+    :param seed: seed of the random generator
+    :return: sorted (src, tgt) alignments
+    """
+    rng = Random(seed)
+    tgt_idxs = list(range(length))
+    for idx in range(length - 1):
+        if rng.random() < crossing:
+            tgt_idxs[idx], tgt_idxs[idx + 1] = tgt_idxs[idx + 1], tgt_idxs[idx]
+
+    aligns = {(src, tgt) for src, tgt in enumerate(tgt_idxs) if rng.random() < density}
+
+    idx = 0
+    while idx < length - 1:
+        if rng.random() < mwg:
+            aligns.update((src, tgt_idxs[tgt]) for src in (idx, idx + 1) for tgt in (idx, idx + 1))
+            idx += 2
+        else:
+            idx += 1
+
+    if not aligns:
+        # AlignedSentences would align sentences without alignments automatically
+        aligns.add((0, tgt_idxs[0]))
+
+    return sorted(aligns)
+
+
+def make_pair(
+    length: int,
+    shape: str = "balanced",
+    density: float = 1.0,
+    crossing: float = 0.1,
+    mwg: float = 0.0,
+    seed: int = 0,
+) -> Tuple[Sentence, Sentence, List[Tuple[int, int]]]:
+    """Create a synthetic sentence pair of the same length and tree shape, with alignments between them.
+    :param length: number of words in both sentences
+    :param shape: the shape of both trees, see :func:`make_heads`
+    :param density: fraction of one-to-one links that is kept, see :func:`make_aligns`
+    :param crossing: probability that a target position is swapped with the next one, see :func:`make_aligns`
+    :param mwg: probability that a position starts a many-to-many block, see :func:`make_aligns`
+    :param seed: seed of the random generator
+    :return: a tuple of the source sentence, the target sentence and the alignments
+    """
+    return (
+        make_sentence(length, shape, prefix="s"),
+        make_sentence(length, shape, prefix="t"),
+        make_aligns(length, density=density, crossing=crossing, mwg=mwg, seed=seed),
+    )
@@ -4,10 +4,12 @@ from setuptools import setup
 from astred import __version__
 
 extras = {"stanza": ["stanza"],
-          "spacy": ["spacy>=3.0"]}
+          "spacy": ["spacy>=3.0"],
+          "numpy": ["numpy"],
+          "parquet": ["pyarrow"]}
 
 extras["parsers"] = extras["stanza"] + extras["spacy"]
-extras["all"] = extras["stanza"] + extras["spacy"]
+extras["all"] = extras["stanza"] + extras["spacy"] + extras["numpy"] + extras["parquet"]
 extras["dev"] = extras["all"] + ["isort>=5.5.4", "black", "flake8", "pytest", "pytest_cases", "pygments"]
 
 setup(
@@ -1,6 +1,7 @@
+import pytest
 from pytest_cases import parametrize_with_cases
 
-from astred import Null
+from astred import AlignedSentences, Null
 from astred.enum import SpanType
 
 from .conftest import TestAlignedSents
@@ -35,3 +36,43 @@ def test_aligned_sents__seq_spans_are_seq(aligned):
         for span in pair
         if not isinstance(span, bool)
     )
+
+
+def test_aligned_sents__inputs_not_modified(sent1_4_words, sent2_4_words, sent3_6_words):
+    attrs = dict(vars(sent1_4_words))
+    # One source sentence can be aligned with multiple targets
+    aligned1 = AlignedSentences(sent1_4_words, sent2_4_words, "0-0 1-2 2-1 3-3")
+    aligned2 = AlignedSentences(sent1_4_words, sent3_6_words, "0-5 1-1 2-2 3-3")
+    assert (aligned1.word_cross, aligned2.word_cross) == (1, 3)
+
+    # Not a single attribute of the given sentence is replaced
+    assert vars(sent1_4_words).keys() == attrs.keys()
+    assert all(getattr(sent1_4_words, name) is value for name, value in attrs.items())
+
+    assert len(sent1_4_words) == 4 and not any(w.is_null for w in sent1_4_words)
+    assert all(not w.aligned and w.seq_group is None for w in sent1_4_words)
+    assert aligned1.src is not aligned2.src
+    assert aligned1.src[1] is not sent1_4_words[0] and aligned1.src[1].text is sent1_4_words[0].text
+
+    # The given sentences keep their defaults: results are only set on the aligned copies
+    assert sent1_4_words.word_cross is None and sent1_4_words.aligned_sentences is None
+    assert sent1_4_words[0].connected == []
+
+    # An aligned sentence (which contains NULL) can be aligned again
+    aligned3 = AlignedSentences(aligned1.src, aligned1.tgt, "0-0 1-2 2-1 3-3")
+    assert len([w for w in aligned3.src if isinstance(w, Null)]) == 1
+    assert aligned3.word_cross == 1
+
+
+def test_aligned_sents__make_copies_deprecated(sent1_4_words, sent2_4_words):
+    with pytest.warns(DeprecationWarning, match="no effect"):
+        aligned = AlignedSentences(sent1_4_words, sent2_4_words, "0-0 1-2 2-1 3-3", make_copies=True)
+
+    assert aligned.src is not sent1_4_words and not any(w.is_null for w in sent1_4_words)
+
+    # The old default still aligns the given sentences in place, so that their results can be read from them
+    with pytest.warns(DeprecationWarning, match="in place"):
+        aligned = AlignedSentences(sent1_4_words, sent2_4_words, "0-0 1-2 2-1 3-3", make_copies=False)
+
+    assert aligned.src is sent1_4_words and sent1_4_words[0].is_null
+    assert sent1_4_words.word_cross == 1 and sent1_4_words[1].aligned == [sent2_4_words[1]]
@@ -0,0 +1,20 @@
+import pytest
+
+from astred import Aligner
+
+
+def test_aligner__make_batches():
+    lengths = [3, 10, 5, 8, 1]
+
+    assert Aligner.make_batches(lengths, batch_size=2) == [[1, 3], [2, 0], [4]]
+    assert Aligner.make_batches(lengths, batch_size=10) == [[1, 3, 2, 0, 4]]
+    # Batches are padded to their longest (first) item: 2 * 10 > 16, 3 * 8 > 16 and 2 * 3 <= 16
+    assert Aligner.make_batches(lengths, batch_size=10, max_tokens=16) == [[1], [3, 2], [0, 4]]
+    # Items that are longer than max_tokens get their own batch
+    assert Aligner.make_batches(lengths, batch_size=10, max_tokens=4) == [[1], [3], [2], [0], [4]]
+    assert Aligner.make_batches([], batch_size=2) == []
+
+
+def test_aligner__make_batches_invalid():
+    with pytest.raises(ValueError):
+        Aligner.make_batches([1, 2], batch_size=0)
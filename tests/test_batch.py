@@ -0,0 +1,55 @@
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.batch import align_corpus, pack_sentence, unpack_sentence
+
+
+def create_sentence(heads):
+    return Sentence(
+        [Word(id=i, text=f"w{i}", head=head, deprel="root" if head == 0 else "dep") for i, head in enumerate(heads, 1)]
+    )
+
+
+def create_pairs():
+    return [
+        (create_sentence([0, 1, 1, 3]), create_sentence([2, 0, 2, 2]), "0-0 1-2 2-1 3-3"),
+        (create_sentence([2, 0, 2]), create_sentence([0, 1, 1]), [(0, 1), (1, 0), (2, 2)]),
+        (create_sentence([0, 1, 2, 3, 4]), create_sentence([3, 3, 0, 3]), "0-0 1-0 2-1 3-2 4-3"),
+        (create_sentence([0, 1]), create_sentence([0, 1, 1]), "0-2 1-0"),
+    ]
+
+
+def test_batch__pack_roundtrip():
+    sent = create_sentence([0, 1, 1, 3])
+    unpacked = unpack_sentence(pack_sentence(sent))
+
+    assert [(w.id, w.text, w.head, w.deprel) for w in unpacked] == [(w.id, w.text, w.head, w.deprel) for w in sent]
+    assert unpacked.tree is not None
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch__same_as_single(jobs):
+    expected = [AlignedSentences(*pair) for pair in create_pairs()]
+    records = list(align_corpus(create_pairs(), jobs=jobs, chunksize=1, max_pending=1))
+
+    assert len(records) == len(expected)
+    for record, aligned in zip(records, expected):
+        assert record.word_cross == aligned.word_cross
+        assert record.seq_cross == aligned.seq_cross
+        assert record.sacr_cross == aligned.sacr_cross
+        assert record.ted == aligned.ted
+        assert record.giza_word_aligns == aligned.giza_word_aligns
+        assert list(record.seq_aligns) == aligned.seq_aligns
+        assert list(record.sacr_aligns) == aligned.sacr_aligns
+
+
+def test_batch__kwargs_passed():
+    records = list(align_corpus(create_pairs(), jobs=2, chunksize=3, allow_mwg=False))
+    expected = [AlignedSentences(*pair, allow_mwg=False) for pair in create_pairs()]
+
+    assert [r.seq_cross for r in records] == [a.seq_cross for a in expected]
+
+
+def test_batch__invalid_pair():
+    with pytest.raises(ValueError):
+        list(align_corpus([(create_sentence([0]),)]))
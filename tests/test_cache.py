@@ -0,0 +1,163 @@
+import pytest
+
+from astred import Aligner, Sentence, Word
+from astred.cache import AlignmentCache, ParseCache, SqliteCache
+from astred.utils import resolve_parser_name
+
+
+def test_cache__get_set(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.db")
+    cache.set("a", "1")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert "a" in cache and "b" not in cache
+    assert cache.stats == {"hits": 1, "misses": 1, "hit_rate": 0.5, "evictions": 0, "size": 1}
+
+
+def test_cache__lru_eviction(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.db", max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    # Using "a" makes "b" the least recently used entry
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert len(cache) == 2
+    assert "b" not in cache
+    assert cache.get_many(["a", "c"]) == ["1", "3"]
+    assert cache.stats["evictions"] == 1
+
+
+def test_cache__persistent(tmp_path):
+    with SqliteCache(tmp_path / "cache.db", max_entries=2) as cache:
+        cache.set_many([("a", "1"), ("b", "2")])
+        cache.get("a")
+
+    with SqliteCache(tmp_path / "cache.db", max_entries=2) as cache:
+        assert len(cache) == 2
+        # The order in which entries were used is retained
+        cache.set("c", "3")
+        assert "a" in cache and "b" not in cache
+
+
+def test_cache__shared_file(tmp_path):
+    # Two connections that write to the same file see each other's entries and use order
+    with SqliteCache(tmp_path / "cache.db", max_entries=3) as cache1, SqliteCache(
+        tmp_path / "cache.db", max_entries=3
+    ) as cache2:
+        cache1.set_many([("a", "1"), ("b", "2")])
+        cache2.set("c", "3")
+        cache1.get("a")
+        assert len(cache1) == len(cache2) == 3
+
+        # "b" is the least recently used entry across both connections
+        cache2.set("d", "4")
+        assert len(cache1) == 3 and cache1.stats["size"] == 3
+        assert "b" not in cache1 and all(key in cache2 for key in "acd")
+
+        last_used = [row[0] for row in cache1._conn.execute("SELECT last_used FROM cache")]
+        assert len(set(last_used)) == len(last_used)
+
+
+def test_cache__invalid_max_entries():
+    with pytest.raises(ValueError):
+        SqliteCache(max_entries=0)
+
+
+def test_cache__alignment_keys():
+    key = AlignmentCache.make_aligns_key("a  b", "c d", "bert", "softmax", 0.001)
+
+    assert key == AlignmentCache.make_aligns_key("a b", "c d", "bert", "softmax", 0.001)
+    assert key != AlignmentCache.make_aligns_key("a b", "c d", "bert", "argmax", 0.001)
+    assert key != AlignmentCache.make_aligns_key("a b", "c d", "bert", "softmax", 0.01)
+    assert key != AlignmentCache.make_aligns_key("a b", "c d", "mbert", "softmax", 0.001)
+
+
+def test_cache__alignments():
+    cache = AlignmentCache()
+    cache.set_aligns([("x", [(0, 0), (1, 2)]), ("y", [])])
+
+    assert cache.get_aligns(["x", "y", "z"]) == [[(0, 0), (1, 2)], [], None]
+
+
+class CountingAligner(Aligner):
+    """Aligner that aligns every word with the word at the same position, without loading a model, to test how
+    the cache is used."""
+
+    def __post_init__(self):
+        self.cache = AlignmentCache(self.cache) if isinstance(self.cache, str) else self.cache
+        self.n_aligned = 0
+
+    def _align_batch(self, src_sentences, tgt_sentences, batch_size=32, max_tokens=None):
+        self.n_aligned += len(src_sentences)
+        return [[(idx, idx) for idx in range(len(src.split()))] for src in src_sentences]
+
+
+def test_cache__aligner():
+    aligner = CountingAligner(cache=AlignmentCache())
+    aligns = aligner.align_batch(["a b", "c"], ["d e", "f"])
+    assert aligns == [[(0, 0), (1, 1)], [(0, 0)]]
+    assert aligner.n_aligned == 2
+
+    assert aligner.align_batch(["c", "a b", "g h i"], ["f", "d e", "j k l"]) == [
+        [(0, 0)],
+        [(0, 0), (1, 1)],
+        [(0, 0), (1, 1), (2, 2)],
+    ]
+    # Only the new pair needed to be aligned
+    assert aligner.n_aligned == 3
+    assert aligner.cache.stats["hits"] == 2
+
+
+def create_parsed_sentence():
+    return Sentence(
+        [
+            Word(id=1, text="I", lemma="I", head=2, deprel="nsubj", upos="PRON", xpos="PRP", feats="Case=Nom"),
+            Word(id=2, text="like", lemma="like", head=0, deprel="root", upos="VERB", xpos="VBP", feats="_"),
+            Word(id=3, text="cookies", lemma="cookie", head=2, deprel="obj", upos="NOUN", xpos="NNS", feats="_"),
+        ]
+    )
+
+
+def test_cache__parse_keys():
+    key = ParseCache.make_parse_key("I like cookies", "stanza", "en", False, True)
+
+    assert key == ParseCache.make_parse_key("I like cookies", "stanza", "en", False, True)
+    assert key != ParseCache.make_parse_key("I like cookies", "spacy", "en", False, True)
+    assert key != ParseCache.make_parse_key("I like cookies", "stanza", "en", True, True)
+    assert key != ParseCache.make_parse_key("I like cookies", "stanza", "en", False, False)
+    assert key != ParseCache.make_parse_key("I like cookies", "stanza", "en", False, True, package="gum")
+
+
+def test_cache__sentences(tmp_path):
+    sent = create_parsed_sentence()
+    with ParseCache(tmp_path / "cache.db") as cache:
+        cache.set_sentences([("a", sent)])
+
+    with ParseCache(tmp_path / "cache.db") as cache:
+        cached, missing = cache.get_sentences(["a", "b"])
+
+    assert missing is None
+    assert cached is not sent
+    attrs = ("id", "text", "lemma", "head", "deprel", "upos", "xpos", "feats")
+    assert [[getattr(w, attr) for attr in attrs] for w in cached] == [[getattr(w, attr) for attr in attrs] for w in sent]
+    assert cached.tree is not None
+
+
+def test_cache__from_text_without_parser():
+    # A full hit never loads the parser (neither stanza nor spaCy is needed here)
+    cache = ParseCache()
+    text = "I like cookies"
+    key = cache.make_parse_key(text, resolve_parser_name(None), "en", False, True)
+    cache.set_sentences([(key, create_parsed_sentence())])
+
+    sent = Sentence.from_text(text, "en", cache=cache)
+    assert sent.text == text
+    assert [sent.text for sent in Sentence.from_texts([text, text], "en", cache=cache)] == [text, text]
+    assert cache.stats["hits"] == 3
+
+
+def test_cache__from_texts_requires_model_name():
+    with pytest.raises(ValueError):
+        list(Sentence.from_texts(["I like cookies"], object(), cache=ParseCache()))
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.utils import connected_components
+
+
+def create_sentence(n_words):
+    return Sentence(
+        [
+            Word(id=idx, text=str(idx), head=idx - 1, deprel="root" if idx == 1 else "dep")
+            for idx in range(1, n_words + 1)
+        ]
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_connected__components_same_as_search(seed):
+    rng = random.Random(seed)
+    n_items = rng.randint(1, 30)
+    edges = [(rng.randrange(n_items), rng.randrange(n_items)) for _ in range(rng.randint(0, 20))]
+    roots = connected_components(n_items, edges)
+
+    neighbours = {item: set() for item in range(n_items)}
+    for item1, item2 in edges:
+        neighbours[item1].add(item2)
+        neighbours[item2].add(item1)
+
+    for item in range(n_items):
+        reachable, todo = {item}, [item]
+        while todo:
+            for other in neighbours[todo.pop()] - reachable:
+                reachable.add(other)
+                todo.append(other)
+        assert {other for other in range(n_items) if roots[other] == roots[item]} == reachable
+
+
+def test_connected__shared_group():
+    aligned = AlignedSentences(create_sentence(4), create_sentence(3), "0-0 0-1 1-1 3-2")
+    src, tgt = aligned.src, aligned.tgt
+
+    group = src[1].connected_group
+    assert group is src[2].connected_group is tgt[1].connected_group is tgt[2].connected_group
+    # Sorted by id, source before target
+    assert group.words == [src[1], tgt[1], src[2], tgt[2]]
+    assert group.connected_repr == "1.root:1.root,2.dep|2.dep:2.dep"
+    assert src[1].connected == [tgt[1], src[2], tgt[2]]
+    assert src[1].connected_repr == tgt[2].connected_repr == group.connected_repr
+
+    # The unaligned source word is connected with NULL
+    assert src[3].connected_group is src[0].connected_group is tgt[0].connected_group
+    assert src[3].connected_repr == "3.dep:"
+
+
+def test_connected__large_group():
+    # A chain of alignments that connects all words, which is deeper than the recursion limit
+    n_words = 2000
+    aligns = [(idx, idx) for idx in range(n_words)] + [(idx + 1, idx) for idx in range(n_words - 1)]
+    aligned = AlignedSentences(create_sentence(n_words), create_sentence(n_words), aligns, metrics={"connected"})
+
+    group = aligned.src[1].connected_group
+    assert len(group.words) == 2 * n_words
+    assert all(word.connected_group is group for word in aligned.src.no_null_words + aligned.tgt.no_null_words)
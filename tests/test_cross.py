@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from pytest_cases import parametrize_with_cases
+
+from astred import AlignedSentences, Sentence, Word
+from astred.utils import count_inversions, count_inversions_naive
+
+from .conftest import TestAlignedSents
+
+
+def create_random_sentence(rng, n_words):
+    heads = [0] + [rng.randint(1, idx - 1) for idx in range(2, n_words + 1)]
+    return Sentence([Word(id=idx, text=str(idx), head=heads[idx - 1], deprel="dep") for idx in range(1, n_words + 1)])
+
+
+def check_cross_same_as_reference(aligned):
+    for pairs, attr in (
+        (aligned.aligned_words, "word_cross"),
+        (aligned.aligned_seq_spans, "seq_cross"),
+        (aligned.aligned_sacr_spans, "sacr_cross"),
+    ):
+        items = [item for pair in pairs for item in pair[:2]]
+        expected_total = getattr(aligned, attr)
+        expected_cross = [dict(item.aligned_cross) for item in items]
+
+        for item in items:
+            for key in item.aligned_cross:
+                item.aligned_cross[key] = 0
+        setattr(aligned, attr, 0)
+
+        aligned.set_cross(pairs, attr, reference=True)
+
+        assert getattr(aligned, attr) == expected_total
+        assert [item.aligned_cross for item in items] == expected_cross
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cross__inversions_same_as_naive(seed):
+    rng = random.Random(seed)
+    # Include duplicate values because a word can be aligned with multiple words
+    values = [rng.randint(0, 15) for _ in range(rng.randint(0, 40))]
+
+    assert count_inversions(values) == count_inversions_naive(values)
+
+
+def test_cross__inversions_no_cross():
+    assert count_inversions([1, 2, 2, 3]) == (0, [0, 0, 0, 0])
+    assert count_inversions([]) == (0, [])
+
+
+@parametrize_with_cases("aligned", cases=TestAlignedSents)
+def test_cross__same_as_reference(aligned):
+    check_cross_same_as_reference(aligned)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cross__same_as_reference_with_trees(seed):
+    # With trees, so that there are SACr groups whose crosses are counted too
+    rng = random.Random(seed)
+    n_src, n_tgt = rng.randint(2, 12), rng.randint(2, 12)
+    aligns = {(rng.randrange(n_src), rng.randrange(n_tgt)) for _ in range(rng.randint(1, 15))}
+    aligned = AlignedSentences(create_random_sentence(rng, n_src), create_random_sentence(rng, n_tgt), sorted(aligns))
+
+    check_cross_same_as_reference(aligned)
@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ("torch", "awesome_align", "stanza", "spacy", "nltk", "tkinter")
+
+
+def test_imports__no_heavy_modules():
+    snippet = f"import sys, astred; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", snippet], check=True, capture_output=True, text=True).stdout
+
+    assert output.strip() == ""
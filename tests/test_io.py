@@ -0,0 +1,272 @@
+import gzip
+from dataclasses import fields
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.io import MetricsWriter, read_conllu, read_pharaoh
+
+
+CONLLU = """# sent_id = 1
+# text = Vámonos al mar.
+1-2	Vámonos	_	_	_	_	_	_	_	_
+1	Vamos	ir	VERB	_	_	0	root	_	_
+2	nos	nosotros	PRON	_	Case=Acc	1	obj	_	_
+3-4	al	_	_	_	_	_	_	_	_
+3	a	a	ADP	_	_	5	case	_	_
+4	el	el	DET	_	_	5	det	_	_
+5	mar	mar	NOUN	_	_	1	obl:arg	_	SpaceAfter=No
+6	.	.	PUNCT	_	_	1	punct	_	_
+
+# sent_id = 2
+1	Sue	Sue	PROPN	NNP	Number=Sing	2	nsubj	_	_
+2	likes	like	VERB	VBZ	_	0	root	_	_
+3	coffee	coffee	NOUN	NN	_	2	obj	_	_
+4	and	and	CCONJ	CC	_	6	cc	_	_
+5	Bill	Bill	PROPN	NNP	_	6	nsubj	_	_
+5.1	likes	like	VERB	VBZ	_	_	_	3:conj	_
+6	tea	tea	NOUN	NN	_	3	conj	_	_
+"""
+
+
+@pytest.fixture(params=[False, True], ids=["plain", "gzip"])
+def conllu_file(request, tmp_path):
+    if request.param:
+        path = tmp_path / "corpus.conllu.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as fhout:
+            fhout.write(CONLLU)
+    else:
+        path = tmp_path / "corpus.conllu"
+        path.write_text(CONLLU, encoding="utf-8")
+
+    return path
+
+
+def create_sentence(heads):
+    return Sentence(
+        [
+            Word(id=idx, text=f"w{idx}", head=head, deprel="root" if head == 0 else "dep", upos=f"P{idx % 2}")
+            for idx, head in enumerate(heads, 1)
+        ]
+    )
+
+
+def test_io__read_conllu(conllu_file):
+    sents = list(read_conllu(conllu_file))
+
+    assert len(sents) == 2
+    # Multiword tokens and empty nodes are skipped
+    assert sents[0].text == "Vamos nos a el mar ."
+    assert sents[1].text == "Sue likes coffee and Bill tea"
+    assert [w.id for w in sents[1]] == [1, 2, 3, 4, 5, 6]
+
+    first = sents[0].words[1]
+    assert (first.text, first.lemma, first.upos, first.xpos, first.feats, first.head, first.deprel) == (
+        "nos",
+        "nosotros",
+        "PRON",
+        "_",
+        "Case=Acc",
+        1,
+        "obj",
+    )
+    assert sents[0].tree.node.text == "Vamos"
+    assert sents[0].words[4].deprel == "obl"
+
+
+def test_io__read_conllu_same_as_init(conllu_file):
+    # Words are created without __init__, so all of their fields must still be set as __init__ would set them
+    for sent in read_conllu(conllu_file):
+        for word in sent:
+            expected = Word(
+                id=word.id,
+                text=word.text,
+                lemma=word.lemma,
+                head=word.head,
+                deprel=word.deprel,
+                upos=word.upos,
+                xpos=word.xpos,
+                feats=word.feats,
+            )
+            expected.doc, expected.tree = word.doc, word.tree
+            assert all(getattr(word, f.name) == getattr(expected, f.name) for f in fields(Word))
+
+
+def test_io__read_conllu_subtypes(conllu_file):
+    sent = next(read_conllu(conllu_file, include_subtypes=True))
+
+    assert sent.words[4].deprel == "obl:arg"
+
+
+def test_io__read_conllu_malformed(tmp_path):
+    path = tmp_path / "corpus.conllu"
+    path.write_text("# sent_id = 1\n1\tHi\thi\tINTJ\t_\t_\t0\troot\t_\t_\n\n1\tHi\thi\n", encoding="utf-8")
+
+    sents = read_conllu(path)
+    assert next(sents).text == "Hi"
+    with pytest.raises(ValueError, match="line 4"):
+        next(sents)
+
+    path.write_text("0\tHi\thi\tINTJ\t_\t_\t0\troot\t_\t_\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 1: word IDs must be positive"):
+        next(read_conllu(path))
+
+
+def test_io__read_pharaoh_malformed(tmp_path):
+    path = tmp_path / "aligns.txt"
+    path.write_text("0-0 1-1\n\n0-0 1:1\n", encoding="utf-8")
+
+    aligns = read_pharaoh(path)
+    assert next(aligns) == [(0, 0), (1, 1)]
+    assert next(aligns) == []
+    with pytest.raises(ValueError, match="line 3"):
+        next(aligns)
+
+
+@pytest.mark.parametrize("block_size", [1, 16, 1 << 20])
+@pytest.mark.parametrize("compress", [False, True])
+def test_io__read_pharaoh_arrays(tmp_path, block_size, compress):
+    np = pytest.importorskip("numpy")
+    text = "0-0 1-1\n\n  12-3\t4-56 \r\n7-8"
+    path = tmp_path / "aligns.txt"
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8") as fhout:
+            fhout.write(text)
+    else:
+        path.write_text(text, encoding="utf-8")
+
+    aligns = list(read_pharaoh(path, as_arrays=True, block_size=block_size))
+    assert all(array.dtype == np.int32 and array.shape[1:] == (2,) for array in aligns)
+    assert [array.tolist() for array in aligns] == [[list(pair) for pair in pairs] for pairs in read_pharaoh(path)]
+
+
+@pytest.mark.parametrize("line", ["1:1", "1-", "-1-1", "1-2-3", "12", "1-12345678901"])
+def test_io__read_pharaoh_arrays_malformed(tmp_path, line):
+    pytest.importorskip("numpy")
+    path = tmp_path / "aligns.txt"
+    path.write_text(f"0-0 1-1\n\n0-0 {line}\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="line 3"):
+        list(read_pharaoh(path, as_arrays=True, block_size=4))
+
+
+def test_io__aligned_sentences_from_arrays(tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "aligns.txt"
+    path.write_text("0-0 1-1 1-2 2-3\n0-0 1-1 2-2\n", encoding="utf-8")
+
+    for aligns in read_pharaoh(path, as_arrays=True):
+        src, tgt = create_sentence([2, 0, 2]), create_sentence([2, 0, 2, 2])
+        aligned = AlignedSentences(src, tgt, aligns)
+        assert aligned.word_aligns == AlignedSentences(src, tgt, aligns.tolist()).word_aligns
+
+        aligned.set_alignments(aligns[:1])
+        assert aligned.get_alignments() == [tuple(aligns[0].tolist())]
+
+
+@pytest.fixture
+def records():
+    records = [
+        AlignedSentences(create_sentence([2, 0, 2]), create_sentence([2, 0, 2, 2]), "0-0 1-1 1-2 2-3").to_record(),
+        AlignedSentences(create_sentence([2, 3, 0]), create_sentence([2, 3, 0]), "0-0 1-1 2-2").to_record(),
+    ]
+    # Missing numbers of changes must be supported as well
+    records.append(records[0]._replace(pos_changes=None))
+
+    return records
+
+
+@pytest.mark.parametrize("batch_size", [1, 10])
+def test_io__write_npz(records, tmp_path, batch_size):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "metrics.npz"
+
+    with MetricsWriter(path, file_format="npz", batch_size=batch_size) as writer:
+        writer.write_many(records)
+
+    assert writer.n_rows == 3
+    with np.load(path) as data:
+        assert data["word_cross"].tolist() == [r.word_cross for r in records]
+        assert data["ted"].tolist() == [r.ted for r in records]
+        assert data["dep_changes"].tolist() == [r.dep_changes for r in records]
+        # Missing numbers of changes are -1
+        assert data["pos_changes"].tolist() == [records[0].pos_changes, records[1].pos_changes, -1]
+        assert data["giza_word_aligns"].tolist() == [r.giza_word_aligns for r in records]
+
+        offsets = data["seq_aligns_offsets"]
+        seq_aligns = [data["seq_aligns"][offsets[i] : offsets[i + 1]].tolist() for i in range(len(records))]
+        assert seq_aligns == [[list(pair) for pair in r.seq_aligns] for r in records]
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_io__write_arrow(records, tmp_path, file_format):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"metrics.{file_format}"
+
+    with MetricsWriter(path, file_format=file_format, batch_size=1) as writer:
+        writer.write_many(records)
+
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        assert pq.ParquetFile(path).num_row_groups == 3
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+
+    assert table.column("sacr_cross").to_pylist() == [r.sacr_cross for r in records]
+    assert table.column("pos_changes").to_pylist() == [records[0].pos_changes, records[1].pos_changes, None]
+    assert table.column("seq_aligns").to_pylist()[0] == [pair._asdict() for pair in records[0].seq_aligns]
+
+
+@pytest.mark.parametrize("file_format", ["npz", "parquet", "arrow"])
+def test_io__writer_close_twice(records, tmp_path, file_format):
+    pytest.importorskip("numpy" if file_format == "npz" else "pyarrow")
+    path = tmp_path / f"metrics.{file_format}"
+
+    # __exit__ closes the writer again, which must not overwrite the file
+    with MetricsWriter(path, file_format=file_format, batch_size=2) as writer:
+        writer.write_many(records)
+        writer.close()
+    writer.close()
+
+    if file_format == "npz":
+        import numpy as np
+
+        with np.load(path) as data:
+            word_cross = data["word_cross"].tolist()
+    elif file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        word_cross = pq.read_table(path).column("word_cross").to_pylist()
+    else:
+        import pyarrow as pa
+
+        word_cross = pa.ipc.open_file(path).read_all().column("word_cross").to_pylist()
+
+    assert word_cross == [r.word_cross for r in records]
+    with pytest.raises(ValueError, match="closed"):
+        writer.write(records[0])
+
+
+def test_io__missing_dependencies(tmp_path, monkeypatch):
+    monkeypatch.setattr("astred.io._is_installed", lambda module_name: False)
+    path = tmp_path / "aligns.txt"
+    path.write_text("0-0 1-1\n", encoding="utf-8")
+
+    # Reported when reading starts, rather than when the first alignments are read
+    with pytest.raises(ImportError, match=r"astred\[numpy\]"):
+        read_pharaoh(path, as_arrays=True)
+    assert list(read_pharaoh(path)) == [[(0, 0), (1, 1)]]
+
+    with pytest.raises(ImportError, match="pyarrow .* or NumPy"):
+        MetricsWriter(tmp_path / "metrics")
+    with pytest.raises(ImportError, match=r"astred\[numpy\]"):
+        MetricsWriter(tmp_path / "metrics.npz", file_format="npz")
+    with pytest.raises(ImportError, match=r"astred\[parquet\]"):
+        MetricsWriter(tmp_path / "metrics.parquet", file_format="parquet")
+
+
+def test_io__writer_invalid_format(tmp_path):
+    with pytest.raises(ValueError):
+        MetricsWriter(tmp_path / "metrics.csv", file_format="csv")
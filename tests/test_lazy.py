@@ -0,0 +1,56 @@
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+
+
+def create_pair():
+    def create_sentence(heads):
+        return Sentence(
+            [Word(id=i, text=f"w{i}", head=head, deprel="root" if head == 0 else "dep") for i, head in enumerate(heads, 1)]
+        )
+
+    return create_sentence([0, 1, 1, 3]), create_sentence([2, 0, 2, 2]), "0-0 1-2 2-1 3-3"
+
+
+def get_metrics(aligned):
+    return (
+        aligned.word_cross,
+        aligned.seq_cross,
+        aligned.sacr_cross,
+        aligned.ted,
+        aligned.seq_aligns,
+        aligned.sacr_aligns,
+        [w.connected_repr for w in aligned.src.no_null_words],
+    )
+
+
+def test_lazy__computes_on_access():
+    aligned = AlignedSentences(*create_pair(), lazy=True)
+    assert aligned.pending_stages == ["seq_spans", "sacr_spans", "connected", "ted"]
+
+    eager = AlignedSentences(*create_pair())
+    assert aligned.sacr_cross == eager.sacr_cross
+    # SACr spans depend on sequence spans
+    assert aligned.pending_stages == ["connected", "ted"]
+
+    assert aligned.ted == eager.ted
+    assert aligned.pending_stages == []
+    assert get_metrics(aligned) == get_metrics(eager)
+
+
+def test_lazy__metrics_subset():
+    aligned = AlignedSentences(*create_pair(), metrics={"word_cross", "seq_cross"})
+    assert aligned.pending_stages == ["sacr_spans", "connected", "ted"]
+    assert "ted" not in aligned.__dict__
+
+    aligned.compute()
+    assert aligned.pending_stages == []
+    assert get_metrics(aligned) == get_metrics(AlignedSentences(*create_pair()))
+
+
+def test_lazy__unknown_metric():
+    with pytest.raises(ValueError):
+        AlignedSentences(*create_pair(), metrics={"cross"})
+
+    with pytest.raises(AttributeError):
+        AlignedSentences(*create_pair(), lazy=True).nonexistent
@@ -0,0 +1,82 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.matrix import AlignmentMatrix
+
+
+def create_sentence(n_words):
+    return Sentence([Word(id=idx, text=str(idx)) for idx in range(1, n_words + 1)])
+
+
+def check_mwg_and_external_align(pairs, src_ids, tgt_ids):
+    # Reference implementation of AlignmentMatrix.check_group that builds sets of aligned ids for every word pair
+    is_mwg = len(src_ids) > 1 and len(tgt_ids) > 1
+    has_external_align = False
+    for pair in pairs:
+        aligned_to_src = {w.id for w in pair.src.aligned}
+        aligned_to_tgt = {w.id for w in pair.tgt.aligned}
+        if aligned_to_src != tgt_ids or aligned_to_tgt != src_ids:
+            is_mwg = False
+        if not aligned_to_src.issubset(tgt_ids) or not aligned_to_tgt.issubset(src_ids):
+            has_external_align = True
+
+    return is_mwg, has_external_align
+
+
+def test_matrix__rows_and_columns():
+    # Unsorted, with a duplicate and an unaligned source and target word
+    matrix = AlignmentMatrix([(3, 1), (1, 2), (1, 1), (3, 1), (2, 2)], n_src=5, n_tgt=4)
+
+    assert len(matrix) == 5
+    assert matrix.pairs() == [(1, 1), (1, 2), (2, 2), (3, 1), (3, 1)]
+    assert [matrix.src_aligned(idx) for idx in range(5)] == [[], [1, 2], [2], [1, 1], []]
+    assert [matrix.tgt_aligned(idx) for idx in range(4)] == [[], [1, 3, 3], [1, 2], []]
+    assert matrix.src_unaligned() == [0, 4]
+    assert matrix.tgt_unaligned() == [0, 3]
+    assert matrix.pairs(*matrix.src_range(2, 3)) == [(2, 2), (3, 1), (3, 1)]
+    # CSC positions refer to the (src, tgt) order of the CSR arrays
+    assert [matrix.pairs()[pos] for pos in matrix.csc_pos] == [(1, 1), (3, 1), (3, 1), (1, 2), (2, 2)]
+
+
+def test_matrix__out_of_range():
+    with pytest.raises(ValueError):
+        AlignmentMatrix([(1, 4)], n_src=2, n_tgt=4)
+
+
+def test_matrix__check_group():
+    matrix = AlignmentMatrix([(1, 1), (1, 2), (2, 1), (2, 2), (3, 3), (4, 3), (4, 4)], n_src=5, n_tgt=5)
+
+    assert matrix.check_group({1, 2}, {1, 2}) == (True, False)
+    assert matrix.check_group({1}, {1, 2}) == (False, True)
+    assert matrix.check_group({3, 4}, {3, 4}) == (False, False)
+    assert matrix.check_group({3}, {3}) == (False, True)
+
+
+def test_matrix__check_group_same_as_word_pairs():
+    rng = random.Random(3)
+    for _ in range(50):
+        n_src, n_tgt = rng.randint(2, 7), rng.randint(2, 7)
+        aligns = {(rng.randrange(n_src), rng.randrange(n_tgt)) for _ in range(rng.randint(1, 12))}
+        aligned = AlignedSentences(create_sentence(n_src), create_sentence(n_tgt), sorted(aligns))
+
+        for length in range(1, 4):
+            for pairs in combinations(aligned.no_null_word_pairs, length):
+                src_ids, tgt_ids = {p.src.id for p in pairs}, {p.tgt.id for p in pairs}
+                assert aligned.alignment_matrix.check_group(src_ids, tgt_ids) == (
+                    check_mwg_and_external_align(pairs, src_ids, tgt_ids)
+                )
+
+
+def test_matrix__aligned_sentences():
+    aligned = AlignedSentences(create_sentence(3), create_sentence(3), "0-0 0-1 2-1")
+
+    # Positions in the matrix are positions in aligned_words, including the NULL alignments
+    assert aligned.alignment_matrix.pairs() == aligned.word_aligns
+    assert [(p.src.id, p.tgt.id) for p in aligned.aligned_words] == aligned.word_aligns
+    assert aligned.alignment_matrix.src_aligned(0) == [0, 3]
+
+    aligned.set_alignments("0-0 1-1 2-2")
+    assert aligned.alignment_matrix.pairs() == [(0, 0), (1, 1), (2, 2), (3, 3)]
@@ -0,0 +1,103 @@
+import sys
+from types import ModuleType
+
+import pytest
+
+from astred import Sentence
+from astred.cache import ParseCache
+from astred.parsers import ParserRegistry
+
+
+class Loader:
+    def __init__(self):
+        self.loaded = []
+
+    def __call__(self, model_or_lang, parser=None, is_tokenized=True, **kwargs):
+        self.loaded.append((model_or_lang, parser, is_tokenized, kwargs))
+        return object()
+
+
+def test_parsers__reuse():
+    loader = Loader()
+    registry = ParserRegistry(loader=loader)
+
+    nlp = registry.get("en", "stanza", use_gpu=False)
+    assert registry.get("en", "stanza", use_gpu=False) is nlp
+    assert registry.get("en", "stanza", use_gpu=True) is not nlp
+    assert registry.get("en", "stanza", is_tokenized=False, use_gpu=False) is not nlp
+    # Unhashable arguments are supported as well
+    registry = ParserRegistry(loader=loader, max_models=None)
+    assert registry.get("en", processors={"tokenize": "default"}) is registry.get(
+        "en", processors={"tokenize": "default"}
+    )
+
+    assert len(loader.loaded) == 4
+
+
+def test_parsers__lru_eviction():
+    loader = Loader()
+    registry = ParserRegistry(max_models=2, loader=loader)
+    registry.warmup("en", "nl")
+    registry.get("en")
+    registry.get("fr")
+
+    assert [key[0] for key in registry.keys] == ["en", "fr"]
+    registry.get("nl")
+    assert [model for model, *_ in loader.loaded] == ["en", "nl", "fr", "nl"]
+
+
+def test_parsers__release():
+    registry = ParserRegistry(max_models=None, loader=Loader())
+    registry.warmup("en", "nl", parser="stanza")
+    registry.warmup("en", parser="spacy")
+
+    assert registry.release("en", parser="spacy") == 1
+    assert registry.release("en") == 1
+    assert [key[:2] for key in registry.keys] == [("nl", "stanza")]
+    assert registry.release() == 1
+    assert len(registry) == 0
+
+
+def test_parsers__invalid_max_models():
+    with pytest.raises(ValueError):
+        ParserRegistry(max_models=0)
+
+
+class ParsingStopped(Exception):
+    pass
+
+
+def test_parsers__default_parser_shares_key(monkeypatch):
+    # A fake spaCy Language that is loaded for every parser name, but never parses anything
+    spacy_language = ModuleType("spacy.language")
+
+    class Language:
+        def __call__(self, text):
+            raise ParsingStopped
+
+        def pipe(self, texts, **kwargs):
+            raise ParsingStopped
+
+    spacy_language.Language = Language
+    monkeypatch.setitem(sys.modules, "spacy.language", spacy_language)
+    # Pretend that stanza is installed, so that it is the default parser
+    monkeypatch.setattr("astred.utils.STANZA_AVAILABLE", True)
+
+    class LanguageLoader(Loader):
+        def __call__(self, *args, **kwargs):
+            super().__call__(*args, **kwargs)
+            return Language()
+
+    loader = LanguageLoader()
+    registry = ParserRegistry(loader=loader)
+    monkeypatch.setattr("astred.parsers.parser_registry", registry)
+
+    # Without a cache the parser is not resolved before it is loaded, with a cache it is
+    with pytest.raises(ParsingStopped):
+        Sentence.from_text("I like cookies", "en")
+    with pytest.raises(ParsingStopped):
+        list(Sentence.from_texts(["I like cookies"], "en", cache=ParseCache()))
+
+    assert registry.keys == [("en", "stanza", True, ())]
+    assert len(loader.loaded) == 1
+    assert registry.release(parser="stanza") == 1
@@ -0,0 +1,76 @@
+import gzip
+
+import pytest
+
+from astred import AlignedSentences
+from astred.io import read_conllu, read_pharaoh
+from astred.pipeline import iter_parallel, stream_metrics
+
+
+SRC_CONLLU = """1	I	I	PRON	_	_	2	nsubj	_	_
+2	like	like	VERB	_	_	0	root	_	_
+3	cookies	cookie	NOUN	_	_	2	obj	_	_
+
+1	The	the	DET	_	_	2	det	_	_
+2	cat	cat	NOUN	_	_	3	nsubj	_	_
+3	sleeps	sleep	VERB	_	_	0	root	_	_
+"""
+
+TGT_CONLLU = """1	Ik	ik	PRON	_	_	2	nsubj	_	_
+2	eet	eten	VERB	_	_	0	root	_	_
+3	graag	graag	ADV	_	_	2	advmod	_	_
+4	koekjes	koekje	NOUN	_	_	2	obj	_	_
+
+1	De	de	DET	_	_	2	det	_	_
+2	kat	kat	NOUN	_	_	3	nsubj	_	_
+3	slaapt	slapen	VERB	_	_	0	root	_	_
+"""
+
+ALIGNS = "0-0 1-1 1-2 2-3\n0-0 1-1 2-2\n"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    src_path = tmp_path / "src.conllu"
+    tgt_path = tmp_path / "tgt.conllu.gz"
+    aligns_path = tmp_path / "aligns.txt"
+    src_path.write_text(SRC_CONLLU, encoding="utf-8")
+    with gzip.open(tgt_path, "wt", encoding="utf-8") as fhout:
+        fhout.write(TGT_CONLLU)
+    aligns_path.write_text(ALIGNS, encoding="utf-8")
+
+    return src_path, tgt_path, aligns_path
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pipeline__stream_metrics(corpus, jobs):
+    expected = [
+        AlignedSentences(src, tgt, aligns)
+        for src, tgt, aligns in zip(read_conllu(corpus[0]), read_conllu(corpus[1]), read_pharaoh(corpus[2]))
+    ]
+    records = list(stream_metrics(*corpus, jobs=jobs, chunksize=1, max_pending=1))
+
+    assert len(records) == 2
+    for record, aligned in zip(records, expected):
+        assert record.word_cross == aligned.word_cross
+        assert record.seq_cross == aligned.seq_cross
+        assert record.sacr_cross == aligned.sacr_cross
+        assert record.ted == aligned.ted
+        assert record.giza_word_aligns == aligned.giza_word_aligns
+
+
+def test_pipeline__unequal_lengths(corpus, tmp_path):
+    aligns_path = tmp_path / "short_aligns.txt"
+    aligns_path.write_text(ALIGNS.splitlines()[0] + "\n", encoding="utf-8")
+
+    records = stream_metrics(corpus[0], corpus[1], aligns_path)
+    next(records)
+    with pytest.raises(ValueError, match="aligns_file ended after 1 items"):
+        next(records)
+
+
+def test_pipeline__iter_parallel():
+    assert list(iter_parallel(a=[1, 2], b="xy")) == [(1, "x"), (2, "y")]
+
+    with pytest.raises(ValueError, match="a ended after 1 items while b did not"):
+        list(iter_parallel(a=[1], b="xy"))
@@ -0,0 +1,113 @@
+import tracemalloc
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.profiling import Profiler, get_active_profiler, profile
+
+
+# Cloning the given sentences is measured as "copy"
+STAGES = {"copy", "word_aligns", "seq_spans", "sacr_spans", "connected", "ted"}
+
+
+def create_pair():
+    def create_sentence(heads):
+        return Sentence(
+            [Word(id=i, text=f"w{i}", head=head, deprel="root" if head == 0 else "dep") for i, head in enumerate(heads, 1)]
+        )
+
+    return create_sentence([0, 1, 1, 3]), create_sentence([2, 0, 2, 2]), "0-0 1-2 2-1 3-3"
+
+
+def test_profiling__profiler_argument():
+    records = []
+    profiler = Profiler(callback=records.append)
+    AlignedSentences(*create_pair(), profiler=profiler)
+    AlignedSentences(*create_pair(), profiler=profiler)
+
+    assert profiler.n_pairs == 2
+    assert set(profiler.stats) == STAGES
+    assert all(stats.calls == 2 for stats in profiler.stats.values())
+    assert len(records) == 2 and set(records[0]) == STAGES
+    assert all(record.seconds >= 0 and record.allocated is None for record in records[0].values())
+    assert profiler.report().startswith("2 pairs")
+
+
+def test_profiling__context_manager():
+    with profile() as profiler:
+        assert get_active_profiler() is profiler
+        AlignedSentences(*create_pair())
+
+    assert get_active_profiler() is None
+    assert set(profiler.summary()) == STAGES
+
+    # Pairs outside of the block are not profiled
+    AlignedSentences(*create_pair())
+    assert profiler.n_pairs == 1
+
+
+def test_profiling__track_memory():
+    with profile(track_memory=True) as profiler:
+        AlignedSentences(*create_pair())
+        assert tracemalloc.is_tracing()
+
+    assert not tracemalloc.is_tracing()
+    assert all(record.allocated is not None for record in profiler.last_pair.values())
+    assert profiler.stats["word_aligns"].allocated is not None
+
+
+def test_profiling__track_memory_without_block():
+    # A profiler that is passed directly stops the tracing that it started after every pair
+    profiler = Profiler(track_memory=True)
+    AlignedSentences(*create_pair(), profiler=profiler)
+    assert not tracemalloc.is_tracing()
+    assert profiler.stats["word_aligns"].allocated is not None
+
+    with Profiler(track_memory=True) as profiler:
+        AlignedSentences(*create_pair(), profiler=profiler)
+        assert tracemalloc.is_tracing()
+
+    assert not tracemalloc.is_tracing()
+    assert profiler.n_pairs == 1
+
+
+def test_profiling__lazy_stages():
+    records = []
+    with profile(callback=records.append) as profiler:
+        aligned = AlignedSentences(*create_pair(), lazy=True)
+        assert set(records[-1]) == {"copy", "word_aligns"}
+        assert aligned.ted is not None
+
+    # Stages that are computed later are measured for the same pair
+    assert profiler.n_pairs == 1
+    assert set(records[-1]) == {"connected", "ted"}
+    assert profiler.stats["ted"].calls == 1
+
+    # Stages that run outside of the block are not measured
+    aligned.set_alignments("0-0 1-1")
+    assert len(records) == 2
+
+
+def test_profiling__set_alignments():
+    profiler = Profiler()
+    aligned = AlignedSentences(*create_pair(), profiler=profiler)
+    aligned.set_alignments("0-0 1-1")
+
+    assert profiler.n_pairs == 1
+    assert {"word_aligns", "seq_spans", "sacr_spans", "connected", "ted"} <= set(profiler.last_pair)
+    assert profiler.stats["word_aligns"].calls == 2
+
+
+def test_profiling__stage_error(monkeypatch):
+    def fail(self):
+        raise RuntimeError("TED failed")
+
+    monkeypatch.setattr(AlignedSentences, "set_ted", fail)
+    profiler = Profiler(track_memory=True)
+    with pytest.raises(RuntimeError):
+        AlignedSentences(*create_pair(), profiler=profiler)
+
+    # The pair is still finished, so that tracing is stopped
+    assert not tracemalloc.is_tracing()
+    assert profiler.n_pairs == 1
+    assert "ted" in profiler.last_pair
@@ -1,4 +1,6 @@
-from astred import Null
+import pytest
+
+from astred import AlignedSentences, Null, Sentence, Word
 
 
 def test_sentence__len(sent1_4_words):
@@ -17,3 +19,28 @@ def test_sentence__is_attached(sent1_4_words):
 def test_sentence__no_dummy(sent1_4_words):
     # Null tokens are only added to Sentences in AlignedSentences, not in regular Sentences
     assert all(not isinstance(w, Null) for w in sent1_4_words)
+
+
+def test_sentence__from_texts_unsupported_parser():
+    texts = ["A B C D", "E F"]
+    with pytest.raises(ValueError):
+        list(Sentence.from_texts(texts, object()))
+
+
+def test_sentence__clone():
+    parsed = object()
+    sentence = Sentence(
+        [Word(id=1, text="a", head=2, deprel="nsubj", _word=parsed), Word(id=2, text="b", head=0, deprel="root")],
+        _sentence=parsed,
+    )
+    aligned = AlignedSentences(sentence, sentence.clone(), "0-0 1-1")
+
+    for original in (sentence, aligned.src):
+        clone = original.clone()
+        assert len(clone) == 2 and not any(w.is_null for w in clone)
+        assert all(w.doc is clone and not w.aligned and w.seq_group is None for w in clone)
+        # Parser objects are shared, words and trees are not
+        assert clone._sentence is parsed and clone[0]._word is parsed
+        assert clone[0] is not sentence[0] and clone.tree is not sentence.tree
+        assert clone.tree.node is clone.root is clone[1] and clone.tree.children[0].node is clone[0]
+        assert all(subtree.astred_op is None for subtree in clone.tree.subtrees())
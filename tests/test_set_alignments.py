@@ -0,0 +1,93 @@
+from random import Random
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.tree import AstredConfig
+
+
+def create_sentence(heads):
+    return Sentence(
+        [
+            Word(id=i, text=f"w{i}", head=head, deprel="root" if head == 0 else f"dep{i % 3}")
+            for i, head in enumerate(heads, 1)
+        ]
+    )
+
+
+SRC_HEADS = [0, 1, 1, 3, 3, 5]
+TGT_HEADS = [2, 0, 2, 2, 6, 4]
+
+
+def create_pair(aligns, **kwargs):
+    return AlignedSentences(create_sentence(SRC_HEADS), create_sentence(TGT_HEADS), aligns, **kwargs)
+
+
+def get_metrics(aligned):
+    return (
+        aligned.get_alignments(),
+        aligned.giza_word_aligns,
+        aligned.word_cross,
+        aligned.seq_cross,
+        aligned.sacr_cross,
+        aligned.ted,
+        aligned.seq_aligns,
+        aligned.sacr_aligns,
+        [
+            (w.cross, w.seq_group.id, w.sacr_group.id, w.connected_repr, sorted(c.id for c in w.connected))
+            for w in aligned.src.words + aligned.tgt.words
+        ],
+        [w.tree.astred_op for w in aligned.src.no_null_words + aligned.tgt.no_null_words],
+    )
+
+
+def test_set_alignments__equals_new_pair():
+    rng = Random(0)
+    aligned = create_pair("0-0 1-1 2-2")
+    src_tree = aligned.src.tree
+    for _ in range(30):
+        aligns = sorted({(rng.randrange(6), rng.randrange(6)) for _ in range(rng.randint(1, 8))})
+        aligned.set_alignments(aligns)
+        assert get_metrics(aligned) == get_metrics(create_pair(aligns))
+
+    # Sentences and their trees are reused, and NULL is not added again
+    assert aligned.src.tree is src_tree
+    assert sum(w.is_null for w in aligned.src) == 1
+
+
+def test_set_alignments__add_and_remove():
+    aligned = create_pair("0-0 1-1 2-2 3-3 4-4 5-5")
+    aligned.add_alignment(2, 3)
+    assert get_metrics(aligned) == get_metrics(create_pair("0-0 1-1 2-2 2-3 3-3 4-4 5-5"))
+
+    aligned.remove_alignment(2, 2)
+    assert get_metrics(aligned) == get_metrics(create_pair("0-0 1-1 2-3 3-3 4-4 5-5"))
+
+    with pytest.raises(ValueError):
+        aligned.add_alignment(2, 3)
+    with pytest.raises(ValueError):
+        aligned.remove_alignment(2, 2)
+    with pytest.raises(ValueError):
+        aligned.add_alignment(6, 0)
+
+
+def test_set_alignments__empty():
+    aligned = create_pair("0-0 1-1")
+    aligned.set_alignments("")
+    assert aligned.get_alignments() == []
+    assert all(w.aligned[0].is_null for w in aligned.src.no_null_words)
+
+
+def test_set_alignments__reuses_ted():
+    # TED on dependency labels does not depend on the alignments
+    aligned = create_pair("0-0 1-1 2-2", ted_config=AstredConfig(attr="deprel"))
+    ted_ops = aligned.ted_ops
+    aligned.set_alignments("0-1 1-0 2-2")
+    assert aligned.ted_ops is ted_ops
+
+
+def test_set_alignments__lazy():
+    aligned = create_pair("0-0 1-1 2-2", lazy=True)
+    aligned.set_alignments("0-1 1-0 2-2")
+    assert aligned.pending_stages == ["seq_spans", "sacr_spans", "connected", "ted"]
+    assert get_metrics(aligned) == get_metrics(create_pair("0-1 1-0 2-2"))
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.enum import Direction
+from astred.utils import add_slots
+
+
+@add_slots
+@dataclass
+class Point:
+    x: int
+    y: int = 0
+    label: str = field(default="point", init=False)
+    history: list = field(default_factory=list, init=False)
+
+
+def test_slots__add_slots():
+    point = Point(1)
+
+    assert not hasattr(point, "__dict__")
+    assert (point.x, point.y, point.label, point.history) == (1, 0, "point", [])
+    assert point == Point(1, 0)
+    with pytest.raises(AttributeError):
+        point.z = 3
+
+
+def test_slots__no_instance_dicts():
+    src = Sentence([Word(id=1, text="a", head=2), Word(id=2, text="b", head=0)])
+    tgt = Sentence([Word(id=1, text="b", head=0), Word(id=2, text="a", head=1)])
+    aligned = AlignedSentences(src, tgt, [(0, 1), (1, 0)])
+    src = aligned.src
+
+    items = list(src) + src.seq_spans + src.sacr_spans + src.tree.subtrees()
+    # Includes Null and NullSpan
+    assert {type(item).__name__ for item in items} == {"Null", "Word", "NullSpan", "Span", "Tree"}
+    assert not any(hasattr(item, "__dict__") for item in items)
+
+    assert src[1].aligned_directions == {2: Direction.FORWARD}
+    assert src[2].aligned_directions == {1: Direction.BACKWARD}
+    assert src.sacr_spans[2].root is src[2] and src.sacr_spans[2].is_valid_subtree
+    assert src.sacr_spans[0].root is None and src.sacr_spans[0].is_valid_subtree is None
+    assert aligned.word_cross == 1
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.enum import EditOperation
+from astred.ted import tree_to_arrays
+from astred.tree import AstredConfig
+
+
+def create_random_sentence(rng, n_words, labels):
+    root = rng.randint(1, n_words)
+    heads = {root: 0}
+    placed = [root]
+    others = [idx for idx in range(1, n_words + 1) if idx != root]
+    rng.shuffle(others)
+    for idx in others:
+        heads[idx] = rng.choice(placed)
+        placed.append(idx)
+
+    return Sentence(
+        [Word(id=idx, text=str(idx), head=heads[idx], deprel=rng.choice(labels)) for idx in range(1, n_words + 1)]
+    )
+
+
+def node_ids(mapping):
+    return [(src.node.id if src else None, tgt.node.id if tgt else None) for src, tgt in mapping]
+
+
+def test_ted__arrays():
+    # 1 <- 2 -> 3, 3 -> 4
+    sent = Sentence([Word(id=1, head=2), Word(id=2, head=0), Word(id=3, head=2), Word(id=4, head=3)])
+    arrays = tree_to_arrays(sent.tree, "id", {})
+
+    assert [n.node.id for n in arrays.nodes[1:]] == [1, 4, 3, 2]
+    assert arrays.lld[1:] == [0, 1, 1, 0]
+    assert arrays.keyroots == [3, 4]
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_ted__same_as_reference(seed):
+    rng = random.Random(seed)
+    labels = ["a", "b", "c"][: rng.randint(1, 3)]
+    src = create_random_sentence(rng, rng.randint(1, 15), labels)
+    tgt = create_random_sentence(rng, rng.randint(1, 15), labels)
+    costs = {
+        EditOperation.DELETION: rng.randint(1, 3),
+        EditOperation.INSERTION: rng.randint(1, 3),
+        EditOperation.RENAME: rng.randint(1, 3),
+    }
+
+    for config in (AstredConfig("deprel"), AstredConfig("deprel", costs)):
+        dist, mapping = src.tree.get_distance(tgt.tree, config=config)
+        ref_dist, ref_mapping = src.tree.get_distance(tgt.tree, config=config, reference=True)
+
+        assert dist == ref_dist
+        assert node_ids(mapping) == node_ids(ref_mapping)
+
+
+def test_ted__edit_operations_on_copies():
+    rng = random.Random(0)
+    src, tgt = create_random_sentence(rng, 4, ["a", "b"]), create_random_sentence(rng, 4, ["a", "b"])
+    aligned = AlignedSentences(src, tgt, "0-0 1-1 2-2 3-3")
+
+    assert aligned.src.tree.astred_cost is not None
+    # The given sentences are not aligned themselves
+    assert src.tree.astred_cost is None
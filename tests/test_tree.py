@@ -0,0 +1,60 @@
+import sys
+
+from astred import Sentence, Word
+
+
+def create_chain(n_words):
+    return Sentence(
+        [Word(id=idx, text=f"w{idx}", head=idx - 1, deprel="root" if idx == 1 else "dep") for idx in range(1, n_words + 1)]
+    )
+
+
+def test_tree__structure():
+    # 1 <- 2 -> 3, 3 -> 4
+    sent = Sentence(
+        [
+            Word(id=1, text="a", head=2),
+            Word(id=2, text="b", head=0),
+            Word(id=3, text="c", head=2),
+            Word(id=4, text="d", head=3),
+        ]
+    )
+    tree = sent.tree
+
+    assert [t.node.id for t in tree.subtrees()] == [2, 1, 3, 4]
+    assert [t.node.id for t in tree.subtrees(include_self=False)] == [1, 3, 4]
+    assert [t.level for t in tree.subtrees()] == [0, 1, 1, 2]
+    assert (tree.depth, tree.size) == (3, 4)
+    assert (tree.children[1].depth, tree.children[1].size) == (2, 2)
+    assert tree.to_string() == "(b (a ) (c (d )))"
+    assert tree.to_string(pretty=True, end_on_newline=True) == "(b \n\t(a ) \n\t(c \n\t\t(d )\n\t)\n)"
+
+    assert all(subtree.root is tree and subtree.node.tree is subtree for subtree in tree.subtrees(include_self=False))
+    assert tree.children[1].children[0].parent is tree.children[1]
+
+    root, children = tree.as_embedded_tuples()
+    assert root.id == 2
+    assert [(child.id, [grandchild.id for grandchild, _ in grandchildren]) for child, grandchildren in children] == [
+        (1, []),
+        (3, [4]),
+    ]
+
+
+def test_tree__long_chain():
+    n_words = 2 * sys.getrecursionlimit()
+    tree = create_chain(n_words).tree
+
+    assert tree.depth == tree.size == n_words
+    assert len(tree.subtrees()) == n_words
+    assert tree.subtrees()[-1].level == n_words - 1
+    assert tree.to_string().count("(") == n_words
+    assert len(tree.as_embedded_tuples()) == 2
+
+
+def test_tree__unsorted_words():
+    words = [Word(id=3, text="c", head=2), Word(id=1, text="a", head=2), Word(id=2, text="b", head=0)]
+    tree = Sentence(words).tree
+
+    # Children are ordered by ID
+    assert [t.node.id for t in tree.subtrees()] == [2, 1, 3]
+    assert tree.to_string() == "(b (a ) (c ))"
@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from astred import AlignedSentences, Sentence, Word
+from astred.windows import SequenceWindows
+
+
+def create_sentence(n_words, rng=None):
+    if rng is None:
+        return Sentence([Word(id=idx, text=str(idx)) for idx in range(1, n_words + 1)])
+
+    # Random tree: every word is attached to a word that is already part of the tree
+    order = list(range(1, n_words + 1))
+    rng.shuffle(order)
+    heads = {order[0]: 0}
+    for idx, word_id in enumerate(order[1:], 1):
+        heads[word_id] = rng.choice(order[:idx])
+
+    return Sentence(
+        [
+            Word(id=idx, text=str(idx), head=heads[idx], deprel="root" if heads[idx] == 0 else "dep")
+            for idx in range(1, n_words + 1)
+        ]
+    )
+
+
+def create_random_aligns(rng, n_src, n_tgt):
+    aligns = []
+    for src_idx in range(n_src):
+        if rng.random() < 0.1:
+            continue
+        tgt_idx = min(n_tgt - 1, max(0, int(src_idx * n_tgt / n_src) + rng.randint(-1, 1)))
+        aligns.append((src_idx, tgt_idx))
+        if rng.random() < 0.3:
+            aligns.append((src_idx, min(n_tgt - 1, tgt_idx + rng.randint(1, 2))))
+
+    # Add a block where all source words are aligned with all target words (MWG)
+    src_start, tgt_start = rng.randint(0, n_src - 2), rng.randint(0, n_tgt - 2)
+    aligns = [p for p in aligns if not (src_start <= p[0] < src_start + 2 or tgt_start <= p[1] < tgt_start + 2)]
+    aligns.extend((src_start + i, tgt_start + j) for i in range(2) for j in range(2))
+
+    return aligns
+
+
+def get_sacr_groups(aligned):
+    return (
+        list(aligned.sacr_aligns),
+        [pair.is_mwg for pair in aligned.aligned_sacr_spans],
+        [span.word_idxs for span in aligned.src.sacr_spans],
+        [span.word_idxs for span in aligned.tgt.sacr_spans],
+    )
+
+
+def get_seq_groups(aligned):
+    return (
+        list(aligned.seq_aligns),
+        [pair.is_mwg for pair in aligned.aligned_seq_spans],
+        [span.word_idxs for span in aligned.src.seq_spans],
+        [span.word_idxs for span in aligned.tgt.seq_spans],
+    )
+
+
+def test_windows__check():
+    # (1, 1) (2, 2) (2, 3) (3, 2) (3, 3): a single pair followed by an MWG of two by two words
+    windows = SequenceWindows([(1, 1), (2, 2), (2, 3), (3, 2), (3, 3)], allow_mwg=True)
+
+    # Contains internal crosses but is not a MWG as a whole
+    assert windows.check(0, 5) == (False, False)
+    assert windows.check(1, 5) == (True, True)
+    assert windows.select() == [(1, 5, True)]
+    # Splits the alignments of source word 2
+    assert windows.check(0, 2) == (False, False)
+    # Target words 2 and 3 are also aligned with source word 3
+    assert windows.check(1, 3) == (False, False)
+
+    windows = SequenceWindows([(1, 1), (2, 2), (2, 3), (3, 2), (3, 3)], allow_mwg=False)
+    assert windows.check(1, 5) == (False, False)
+    assert windows.select() == []
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("allow_mwg", [True, False])
+def test_windows__same_as_reference(seed, allow_mwg):
+    rng = random.Random(seed)
+    n_src, n_tgt = rng.randint(2, 20), rng.randint(2, 20)
+    aligned = AlignedSentences(
+        create_sentence(n_src), create_sentence(n_tgt), create_random_aligns(rng, n_src, n_tgt), allow_mwg=allow_mwg
+    )
+    expected = get_seq_groups(aligned)
+
+    aligned.create_seq_spans(reference=True)
+
+    assert get_seq_groups(aligned) == expected
+
+
+def test_windows__valid_subtree_range():
+    # 1 <- 2 -> 3, 3 -> 4, 5 (root) -> 2
+    heads = [0, 2, 5, 2, 3, 0]
+    no_missing_trees = [0] * 7
+
+    assert AlignedSentences.is_valid_subtree_range(heads, no_missing_trees, 1, 4)
+    assert AlignedSentences.is_valid_subtree_range(heads, no_missing_trees, 3, 4)
+    assert AlignedSentences.is_valid_subtree_range(heads, no_missing_trees, 1, 5)
+    # Both 1 and 3 are attached to 2, which is not part of the group
+    assert not AlignedSentences.is_valid_subtree_range(heads, no_missing_trees, 3, 5)
+    assert not AlignedSentences.is_valid_subtree_range(heads, [0, 0, 0, 1, 1, 1, 1], 1, 4)
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("allow_mwg", [True, False])
+def test_windows__sacr_same_as_reference(seed, allow_mwg):
+    rng = random.Random(seed)
+    n_words = rng.randint(2, 20)
+    # Monotonic alignments with a MWG, so that there are large sequence groups that may need to be split
+    aligns = [(idx, idx) for idx in range(n_words) if rng.random() > 0.1]
+    mwg_start = rng.randint(0, n_words - 2)
+    aligns = [pair for pair in aligns if not mwg_start <= pair[0] < mwg_start + 2]
+    aligns.extend((mwg_start + i, mwg_start + j) for i in range(2) for j in range(2))
+    aligned = AlignedSentences(
+        create_sentence(n_words, rng), create_sentence(n_words, rng), sorted(aligns), allow_mwg=allow_mwg
+    )
+    expected = get_sacr_groups(aligned)
+
+    aligned.create_sacr_spans(reference=True)
+
+    assert get_sacr_groups(aligned) == expected